@@ -0,0 +1,156 @@
+"""
+adg_tracker.py
+Online ADG tracking: running least-squares sums updated per weighing in O(1)
+(retracting the latest weighing is O(log days) amortized).
+"""
+import heapq
+import numbers
+from datetime import date, datetime
+from math import inf
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from metrics import estimate_days_to_target, estimate_days_to_target_batch, regression_from_sums
+
+
+def to_day(value) -> float:
+    """Absolute day value for one reading: numeric days as-is, dates as days since epoch."""
+    if isinstance(value, numbers.Real) and not isinstance(value, bool):     # numpy scalars too
+        return float(value)
+    if not isinstance(value, (date, datetime, pd.Timestamp)):
+        value = pd.Timestamp(value)
+    return (pd.Timestamp(value) - pd.Timestamp(0)).total_seconds() / (24 * 3600)
+
+
+class AdgTracker:
+    """
+    Running regression of weight on day for a single animal.
+
+    Holds n, Σx, Σy, Σxy, Σx², Σy² with x measured from a pivot (the first
+    day ever added) so add_weighing / remove_weighing are exact inverses and
+    the slope is available without re-fitting the history. The readings
+    themselves are kept per day, with a max-heap of days, so retracting the
+    latest one restores the previous latest weight in O(log days) amortized.
+    """
+
+    __slots__ = ("animal_id", "pivot", "n", "sx", "sy", "sxy", "sxx", "syy", "last_day", "last_wt", "readings",
+                 "_days")
+
+    def __init__(self, animal_id=None):
+        self.animal_id = animal_id
+        self.pivot = None
+        self.n = 0
+        self.sx = self.sy = self.sxy = self.sxx = self.syy = 0.0
+        self.last_day = None
+        self.last_wt = None
+        self.readings: Dict[float, List[float]] = {}    # day -> weights in the order added
+        self._days: List[float] = []                     # max-heap (negated) of days; stale entries skipped
+
+    def _accumulate(self, day: float, weight: float, sign: int) -> None:
+        x = day - self.pivot
+        self.n += sign
+        self.sx += sign * x
+        self.sy += sign * weight
+        self.sxy += sign * x * weight
+        self.sxx += sign * x * x
+        self.syy += sign * weight * weight
+
+    def add_weighing(self, when, weight: float) -> None:
+        day = to_day(when)
+        if self.pivot is None:
+            self.pivot = day
+        self._accumulate(day, float(weight), +1)
+        if day not in self.readings:
+            self.readings[day] = []
+            heapq.heappush(self._days, -day)
+        self.readings[day].append(float(weight))
+        if self.last_day is None or day >= self.last_day:
+            self.last_day, self.last_wt = day, float(weight)
+
+    def remove_weighing(self, when, weight: float) -> None:
+        """Retract a previously added (when, weight) reading, e.g. a mis-read."""
+        day, weight = to_day(when), float(weight)
+        weights = self.readings.get(day)
+        if not weights or weight not in weights:
+            raise ValueError(f"no weighing of {weight} on day {day} to remove")
+        # drop the most recently added match, so the latest reading is recomputed correctly
+        del weights[len(weights) - 1 - weights[::-1].index(weight)]
+        if not weights:
+            del self.readings[day]
+        self._accumulate(day, weight, -1)
+        if self.n == 0:
+            self.sx = self.sy = self.sxy = self.sxx = self.syy = 0.0
+            self.last_day = self.last_wt = None
+        elif day == self.last_day:
+            while -self._days[0] not in self.readings:      # drop days with no readings left
+                heapq.heappop(self._days)
+            self.last_day = -self._days[0]
+            self.last_wt = self.readings[self.last_day][-1]
+
+    @property
+    def slope(self) -> Optional[float]:
+        """Current ADG (kg/day), or None with fewer than two distinct days."""
+        # scalar form of metrics.regression_from_sums, kept numpy-free for per-reading calls;
+        # the distinct-day count is exact, unlike cxx after removals leave float residue
+        if self.n < 2 or len(self.readings) < 2:
+            return None
+        cxx = self.sxx - self.sx * self.sx / self.n
+        if cxx <= 0:
+            return None
+        return (self.sxy - self.sx * self.sy / self.n) / cxx
+
+    adg = slope
+
+    def days_to_target(self, target_wt: float, current_wt: Optional[float] = None) -> float:
+        """
+        estimate_days_to_target with the current slope. current_wt defaults
+        to the latest remaining reading.
+        """
+        if current_wt is None:
+            current_wt = self.last_wt
+        if current_wt is None:
+            return inf
+        return estimate_days_to_target(current_wt, target_wt, self.slope)
+
+
+class HerdAdgTracker:
+    """AdgTracker per animal id, fed continuously by crush-scale readings."""
+
+    def __init__(self):
+        self.trackers: Dict[object, AdgTracker] = {}
+
+    def __len__(self):
+        return len(self.trackers)
+
+    def __getitem__(self, animal_id) -> AdgTracker:
+        return self.trackers[animal_id]
+
+    def add_weighing(self, animal_id, when, weight: float) -> AdgTracker:
+        tracker = self.trackers.get(animal_id)
+        if tracker is None:
+            tracker = self.trackers[animal_id] = AdgTracker(animal_id)
+        tracker.add_weighing(when, weight)
+        return tracker
+
+    def remove_weighing(self, animal_id, when, weight: float) -> AdgTracker:
+        tracker = self.trackers[animal_id]
+        tracker.remove_weighing(when, weight)
+        return tracker
+
+    def snapshot(self, target_wt=None) -> pd.DataFrame:
+        """
+        Current ADG for every animal (columns 'adg', 'n_points', 'current_wt'
+        and, with target_wt, 'days_to_target'), computed in one vectorized pass.
+        """
+        ts = list(self.trackers.values())
+        state = pd.DataFrame(
+            [(t.n, t.sx, t.sy, t.sxy, t.sxx, t.syy, t.last_wt) for t in ts],
+            columns=["n", "sx", "sy", "sxy", "sxx", "syy", "current_wt"],
+            index=pd.Index([t.animal_id for t in ts], name="animal_id"),
+        )
+        fit = regression_from_sums(state["n"], state["sx"], state["sy"], state["sxy"], state["sxx"], state["syy"])
+        out = pd.DataFrame({"adg": fit["slope"], "n_points": state["n"], "current_wt": state["current_wt"]})
+        if target_wt is not None:
+            out["days_to_target"] = estimate_days_to_target_batch(out["current_wt"], target_wt, out["adg"])
+        return out
@@ -0,0 +1,16 @@
+"""
+app_pages
+app.py menu pages, one module per Control Panel entry, imported on first selection.
+"""
+from page_registry import PageRegistry
+
+PAGES = (PageRegistry(__name__)
+         .add("📊 Tactical Dashboard", "dashboard")
+         .add("🧬 Genetic Scorecard", "scorecard")
+         .add("🧪 Advanced Feed Lab", "feed_lab")
+         .add("♻️ Environmental Hub", "environment")
+         .add("📸 Visual AI Triage", "visual_triage")
+         .add("🌦️ Climate Sentinel", "climate")
+         .add("📅 Vax Sentinel", "vax")
+         .add("📚 Field Manual", "field_manual")
+         .add("⚙️ System Settings", "settings"))
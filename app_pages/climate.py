@@ -0,0 +1,64 @@
+import pandas as pd
+import streamlit as st
+
+from app_pages.common import AegisEngine, get_weather_client
+from heat_stress import SPECIES_THI_THRESHOLDS, HeatStressAccumulator, stream_station_log, thi
+from knowledge_base import SPECIES_METRICS
+
+
+def render():
+    st.title("Meteorological Risk Intelligence")
+    api_key = st.text_input("OpenWeatherMap API Key", type="password")
+    city = st.text_input("Farm Location", "Nakuru")
+    
+    if api_key:
+        w_data = AegisEngine.get_weather(api_key, city)
+        if w_data:
+            st.success(f"Live Feed: {city}")
+            temp = w_data['main']['temp']
+            hum = w_data['main']['humidity']
+            c1, c2 = st.columns(2)
+            c1.metric("Current Temp", f"{temp}°C")
+            c2.metric("Humidity", f"{hum}%")
+            
+            if "rain" in w_data['weather'][0]['description'].lower():
+                st.error("⛈️ Heavy Rain Alert: Increase risk of CCPP (Goats) and Rift Valley Fever.")
+            if temp > 32:
+                st.warning("🔥 Heat Stress: Ensure maximum ventilation and hydration.")
+            
+            thi_now = float(thi(temp, hum))
+            stressed = [sp for sp in SPECIES_METRICS if thi_now > SPECIES_THI_THRESHOLDS[sp]]
+            st.metric("Temperature-Humidity Index (THI)", f"{thi_now:.1f}")
+            if stressed:
+                st.warning(f"🌡️ THI above heat-stress onset for: {', '.join(stressed)}")
+        else:
+            st.error("API Key pending or invalid location.")
+        
+        farms = st.text_area("Additional Farm Locations (one per line)", "")
+        sites = [f.strip() for f in farms.splitlines() if f.strip()]
+        if sites:
+            readings = get_weather_client().get_many(sites, api_key=api_key)
+            st.dataframe(pd.DataFrame([
+                {"Location": site, "Temp (°C)": w['main']['temp'] if w else None,
+                 "Humidity (%)": w['main']['humidity'] if w else None,
+                 "Conditions": w['weather'][0]['description'] if w else "unavailable"}
+                for site, w in readings.items()
+            ]), use_container_width=True, hide_index=True)
+    else:
+        st.info("Enter API Key to enable real-time risk modeling.")
+    
+    st.markdown("### 📈 Station Heat-Load Analysis")
+    log_file = st.file_uploader("Hourly Station Log (CSV: station, timestamp, temp, humidity)", type=["csv"])
+    if log_file:
+        hs_species = st.selectbox("Herd Species", list(SPECIES_METRICS.keys()))
+        acc = HeatStressAccumulator(threshold=SPECIES_THI_THRESHOLDS[hs_species])
+        try:
+            for block in stream_station_log(log_file):
+                acc.update(*block)
+        except (KeyError, ValueError) as e:
+            st.error(f"Station log rejected: {e}")
+        else:
+            summary = acc.summary()
+            st.dataframe(summary.style.format(precision=1), use_container_width=True)
+            st.caption(f"Heat load = THI-degree-hours above {SPECIES_THI_THRESHOLDS[hs_species]:.0f} over 24h; "
+                       "a night recovers with ≥6 cool hours between 21:00 and 05:00.")
@@ -0,0 +1,72 @@
+"""
+app_pages/common.py
+Process-wide resources and helpers shared by app.py and its pages.
+"""
+import os
+
+import streamlit as st
+
+from frame_cache import FrameCache
+from herd_store import HerdStore
+from instrumentation import span, timed
+from knowledge_base import MARKET_PRICES, SPECIES_METRICS
+
+METRICS_PATH = os.environ.get("AEGIS_METRICS_PATH", "aegis_metrics.prom")
+
+# Professional UI Branding
+CSS = """
+    <style>
+    .main { background-color: #f8f9fa; }
+    .stMetric { border-radius: 12px; border: 1px solid #d1d5db; background-color: white; box-shadow: 0 2px 4px rgba(0,0,0,0.05); }
+    .sidebar-text { font-size: 14px; color: #9ca3af; }
+    h1, h2, h3 { color: #1f2937; font-family: 'Inter', sans-serif; }
+    </style>
+    """
+
+
+class AegisEngine:
+    @staticmethod
+    @timed("AegisEngine.calculate_biogas")
+    def calculate_biogas(manure_kg, species):
+        return manure_kg * SPECIES_METRICS[species]["biogas_yield"]
+
+    @staticmethod
+    @timed("AegisEngine.calculate_roi")
+    def calculate_roi(current_wt, start_wt, feed_kg, species):
+        revenue = current_wt * MARKET_PRICES[species]
+        cost = feed_kg * SPECIES_METRICS[species]["feed_cost"]
+        return revenue - cost
+
+    @staticmethod
+    @timed("AegisEngine.get_weather")
+    def get_weather(api_key, city="Nakuru"):
+        # TTL-cached, pooled client: reruns reuse the last reading instead of re-hitting the API
+        return get_weather_client().get(city, api_key=api_key)
+
+
+@st.cache_resource
+def get_store():
+    # One durable store per process; survives restarts and is shared by sessions
+    return HerdStore(os.environ.get("AEGIS_DB_PATH", "aegis_herd.db"))
+
+
+@st.cache_resource
+def get_frame_cache():
+    return FrameCache(maxsize=64)
+
+
+@st.cache_resource
+def get_weather_client():
+    # one pool and session per process; the API key typed into the UI goes with each request
+    from weather import WeatherClient    # requests loads with the Climate Sentinel, not at startup
+    return WeatherClient(ttl=600, stale_ttl=3600, error_ttl=60)
+
+
+def cached_frame(name, compute, *params):
+    # Memoized per herd data version; store writes (log, restore, purge) bump the version
+    with span(f"frame.{name}"):
+        return get_frame_cache().get_or_compute(name, get_store().version, compute, *params)
+
+
+def herd_size():
+    return cached_frame("herd_size", get_store().count)
@@ -0,0 +1,100 @@
+import altair as alt
+import streamlit as st
+
+from app_pages.common import cached_frame, get_store, herd_size
+from chart_data import histogram
+from instrumentation import span
+from table_view import Filter, PagedTable, TableQuery, style_page
+
+TOP_SIRES = 30
+PAGE_SIZES = (25, 50, 100)
+
+
+def render():
+    st.title("Strategic Herd Overview")
+    if herd_size():
+        kpi = cached_frame("dashboard_kpis", lambda: get_store().aggregate({
+            "roi": "SUM(Profit)", "adg": "AVG(ADG)", "fcr": "AVG(FCR)", "head": "COUNT(*)"
+        }).iloc[0])
+
+        col_m1, col_m2, col_m3, col_m4 = st.columns(4)
+        col_m1.metric("Cumulative ROI", f"KES {kpi['roi']:,.0f}")
+        col_m2.metric("Mean ADG", f"{kpi['adg']:.3f} kg/d")
+        col_m3.metric("FCR (Efficiency)", f"{kpi['fcr']:.2f}")
+        col_m4.metric("Active Herd", f"{int(kpi['head']):,} Head")
+
+        st.subheader("Growth Distribution by Genetic Line")
+        # binned and summarized server-side: the spec carries bins and sires, not one row per animal
+        adg_bins = cached_frame("adg_histogram", adg_histogram)
+        sires = cached_frame("sire_adg_summary", sire_summary)
+        with span("dashboard.altair_chart"):
+            growth_chart = alt.Chart(adg_bins).mark_bar().encode(
+                x=alt.X('bin_start:Q', bin='binned', title='ADG (kg/d)'), x2='bin_end:Q',
+                y=alt.Y('count:Q', title='Animals'), color=alt.Color('group:N', title='Species'),
+                tooltip=['group', 'bin_start', 'bin_end', 'count']
+            ).properties(height=400)
+            st.altair_chart(growth_chart, use_container_width=True)
+            sire_chart = alt.Chart(sires).mark_bar().encode(
+                x=alt.X('Sire:N', sort='-y'), y=alt.Y('mean:Q', title='Mean ADG (kg/d)'),
+                tooltip=['Sire', 'count', 'mean', 'min', 'max']
+            ).properties(height=300, title=f"Top {len(sires)} sires by mean offspring ADG")
+            st.altair_chart(sire_chart, use_container_width=True)
+        
+        with st.expander("Detailed Log Analysis"):
+            log_table()
+    else:
+        st.info("System awaiting initial data ingestion. Use sidebar form to start.")
+
+
+def adg_histogram():
+    df = get_store().fetch(["ADG", "Species"])
+    return histogram(df['ADG'], by=df['Species'])
+
+
+def sire_summary():
+    # grouped in SQLite, so only one row per sire leaves the store
+    summary = get_store().aggregate(
+        {"count": "COUNT(ADG)", "mean": "AVG(ADG)", "min": "MIN(ADG)", "max": "MAX(ADG)"},
+        group_by=["Sire"], where='"Sire" IS NOT NULL')
+    return summary.sort_values("mean", ascending=False).head(TOP_SIRES).reset_index(drop=True)
+
+
+def log_table():
+    # filtered, sorted and paged in SQLite; only the visible page is styled and sent to the browser
+    table = PagedTable(get_store())
+    columns = list(table.store.schema)
+    c1, c2, c3 = st.columns([3, 2, 1])
+    shown = c1.multiselect("Columns", columns, default=columns, key="log_columns") or columns
+    sort = c2.selectbox("Sort by", columns, index=columns.index("Date"), key="log_sort")
+    descending = c3.toggle("Descending", value=True, key="log_desc")
+    f1, f2, f3, f4 = st.columns([3, 1, 2, 1])
+    species = f1.multiselect("Species", cached_frame("log_species", lambda: table.options("Species")),
+                             key="log_species")
+    field = f2.selectbox("Search", ["ID", "Sire"], key="log_search_field")
+    search = f3.text_input(f"{field} contains", key="log_search").strip()
+    per_page = f4.selectbox("Rows", PAGE_SIZES, index=1, key="log_per_page")
+
+    filters = []
+    if species:
+        filters.append(Filter("Species", "in", tuple(species)))
+    if search:
+        filters.append(Filter(field, "contains", search))
+    filters = tuple(filters)
+
+    total = cached_frame("log_count", lambda: table.count(filters), filters)
+    pages = max(1, -(-total // per_page))
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key="log_page")
+    query = TableQuery(columns=tuple(shown), filters=filters, sort=sort, descending=descending,
+                       page=int(page) - 1, per_page=per_page)
+    with span("dashboard.gradient_table"):
+        rows, total = table.page(query, total)
+        gradient = tuple(table.numeric_columns(shown))
+        # colour scale spans every matching row, so shades are comparable across pages
+        ranges = cached_frame("log_ranges", lambda: table.ranges(gradient, filters), gradient, filters)
+        st.dataframe(style_page(rows, ranges), use_container_width=True, hide_index=True)
+    start = query.page * per_page
+    if total:
+        st.caption(f"Rows {start + 1:,}–{min(start + per_page, total):,} of {total:,} matching "
+                   f"({herd_size():,} logged)")
+    else:
+        st.caption(f"No rows match the filters ({herd_size():,} logged)")
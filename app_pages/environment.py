@@ -0,0 +1,29 @@
+import altair as alt
+import streamlit as st
+
+from app_pages.common import cached_frame, get_store, herd_size
+from chart_data import daily_series
+
+
+def render():
+    st.title("Circular Economy & Carbon Tracking")
+    if herd_size():
+        store = get_store()
+        # summed in SQL; the herd is only read (three columns) when the CH4 series is rebuilt
+        t_biogas = cached_frame("biogas_total", lambda: store.aggregate({"biogas": "SUM(Biogas)"}).iloc[0]["biogas"])
+        t_biogas = float(t_biogas) if t_biogas is not None else 0.0
+        
+        st.metric("Total Biogas Potential", f"{t_biogas:,.2f} m³")
+        st.markdown(f"**Impact:** This energy can replace approximately **{t_biogas * 1.5:.1f} kg of LPG** or power a lamp for **{t_biogas * 5:.0f} hours**.")
+        
+        
+        
+        st.subheader("Methane (CH4) Emission Trends")
+        # daily mean per species, LTTB-downsampled to at most MAX_POINTS points
+        ch4 = cached_frame("ch4_daily", lambda: daily_series(store.fetch(["Date", "CH4", "Species"]),
+                                                             "Date", "CH4", by="Species"))
+        ch4_chart = alt.Chart(ch4).mark_line(point=True).encode(
+            x='Date:T', y=alt.Y('CH4:Q', title='Mean CH4'), color='Species:N', tooltip=['Species', 'Date', 'CH4'])
+        st.altair_chart(ch4_chart, use_container_width=True)
+    else:
+        st.warning("Input required for environmental analysis.")
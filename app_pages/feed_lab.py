@@ -0,0 +1,30 @@
+import streamlit as st
+
+
+def render():
+    st.title("Nutritional Optimization Lab")
+    
+    st.markdown("### Pearson Square Multi-Mix Optimization")
+    
+    f1, f2 = st.columns(2)
+    target_cp = f1.slider("Required Crude Protein (CP %)", 10.0, 35.0, 16.0)
+    total_mix = f1.number_input("Desired Batch Weight (kg)", 10, 10000, 100)
+    
+    en_name = f2.text_input("Energy Component", "Maize Bran")
+    en_cp = f2.number_input(f"{en_name} CP%", 1.0, 15.0, 8.5)
+    
+    pr_name = f2.text_input("Protein Component", "Soya Meal")
+    pr_cp = f2.number_input(f"{pr_name} CP%", 20.0, 60.0, 44.0)
+    
+    if pr_cp > target_cp > en_cp:
+        part_en = abs(pr_cp - target_cp)
+        part_pr = abs(en_cp - target_cp)
+        t_parts = part_en + part_pr
+        
+        res_en = (part_en/t_parts) * total_mix
+        res_pr = (part_pr/t_parts) * total_mix
+        
+        st.success(f"Optimized Formulation for {total_mix}kg at {target_cp}% CP")
+        st.info(f"⚖️ **{en_name}**: {res_en:.2f} kg  |  ⚖️ **{pr_name}**: {res_pr:.2f} kg")
+    else:
+        st.error("Invalid Constraint: Target CP must sit between Energy and Protein CP levels.")
@@ -0,0 +1,33 @@
+import streamlit as st
+
+from diagnostics import DiagnosticIndex
+from knowledge_base import CLINICAL_MASTER_DB, SYMPTOM_MATRIX
+
+
+@st.cache_resource
+def get_diagnostic_index():
+    # inverted sign index over both knowledge bases, built once per process
+    return DiagnosticIndex.from_knowledge_bases(CLINICAL_MASTER_DB, SYMPTOM_MATRIX)
+
+
+def render():
+    st.title("Veterinary Clinical Protocols")
+    tab_cl, tab_sym = st.tabs(["Clinical SOPs", "Symptom Logic"])
+    
+    with tab_cl:
+        st.markdown("""
+        ### Physical Examination Standards
+        1. **Rumen Motility:** Fist on left paralumbar fossa. Norm: 2-3 contractions / 2 mins.
+        2. **Hydration:** Skin tenting on neck. >3 seconds indicates clinical dehydration.
+        3. **CRT (Capillary Refill):** Press gums; color must return in < 2 seconds.
+        """)
+        
+    
+    with tab_sym:
+        st.subheader("Diagnostic Matrix")
+        dx_index = get_diagnostic_index()
+        presenting = st.multiselect("Presenting Signs", dx_index.sign_vocabulary())
+        if presenting:
+            st.dataframe(dx_index.search_frame(presenting, top=10), use_container_width=True, hide_index=True)
+        with st.expander("Raw Symptom Matrix"):
+            st.json(SYMPTOM_MATRIX)
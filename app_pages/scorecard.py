@@ -0,0 +1,43 @@
+import altair as alt
+import streamlit as st
+
+from app_pages.common import cached_frame, get_store, herd_size
+from sire_eval import SireEvaluation
+
+
+@st.cache_resource
+def get_sire_engine():
+    # Keeps the last MME solution so re-evaluation after new records is warm-started
+    return SireEvaluation(h2=0.3)
+
+
+def sire_ranking():
+    # Sire model: species x date contemporary groups fixed, sire random; solved iteratively
+    store = get_store()
+    herd = store.fetch(["Sire", "Species", "Date", "ADG"])
+    sire_eval = get_sire_engine().evaluate(herd, trait="ADG", group_cols=("Species", "Date"))
+    profit = store.aggregate({"Profit": "SUM(Profit)"}, group_by=["Sire"]).set_index("Sire")["Profit"]
+    sire_eval["Profit"] = sire_eval["Sire"].map(profit)
+    return sire_eval
+
+
+def render():
+    st.title("Genetic Ranking Engine")
+    if herd_size():
+        sire_eval = cached_frame("sire_ranking", sire_ranking)
+        sire_engine = get_sire_engine()
+        
+        st.subheader("Sire Performance Ranking (Estimated Breeding Value, ADG)")
+        st.write("Sire-model BLUP: offspring ADG corrected for species/date contemporary groups, "
+                 "shrunk toward zero for sires with few progeny.")
+        st.table(sire_eval.style.highlight_max(subset=['EBV'], color='#d1fae5'))
+        st.caption(f"h² = {sire_engine.h2} | solver iterations: {sire_engine.iterations} | "
+                   f"converged: {sire_engine.converged}")
+        
+        c_sire = alt.Chart(sire_eval).mark_bar().encode(
+            x=alt.X('Sire:N', sort='-y'), y='EBV:Q', tooltip=['Sire', 'EBV', 'Accuracy', 'Progeny_Count'],
+            color=alt.condition(alt.datum.EBV > 0, alt.value('green'), alt.value('red'))
+        )
+        st.altair_chart(c_sire, use_container_width=True)
+    else:
+        st.warning("No genetic data available. Link entries to Sire IDs.")
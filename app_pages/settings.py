@@ -0,0 +1,100 @@
+import base64
+import io
+import json
+from datetime import datetime
+
+import streamlit as st
+
+from app_pages.common import METRICS_PATH, get_frame_cache, get_store
+from instrumentation import INSTRUMENTS
+from snapshot import SnapshotError, restore_snapshot, write_snapshot
+
+
+def backup_snapshot(base=None):
+    # Full snapshot, or a delta of records added since `base` (a previous snapshot header)
+    buf = io.BytesIO()
+    header = write_snapshot(get_store(), buf, base=base)
+    name = f"aegis_{header['kind']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.aegis"
+    return (name, buf.getvalue()), header
+
+
+def restore_data(code):
+    # Legacy base64/JSON restore hashes from v13.0 and earlier
+    try:
+        data = json.loads(base64.b64decode(code.encode()).decode())
+        get_store().replace_all(data)
+        return True
+    except: return False
+
+
+def render():
+    store, frames = get_store(), get_frame_cache()
+    st.title("System Maintenance")
+    
+    st.subheader("Cloud Data Persistence")
+    b1, b2 = st.columns(2)
+    if b1.button("Generate Secure Backup Snapshot"):
+        st.session_state.snapshot_file, st.session_state.snapshot_base = backup_snapshot()
+    if b2.button("Generate Delta Snapshot", disabled='snapshot_base' not in st.session_state):
+        st.session_state.snapshot_file, st.session_state.snapshot_base = backup_snapshot(st.session_state.snapshot_base)
+    if 'snapshot_file' in st.session_state:
+        snap_name, snap_bytes = st.session_state.snapshot_file
+        st.download_button(f"⬇️ Download {snap_name} ({len(snap_bytes) / 1024:,.0f} KB)", snap_bytes,
+                           file_name=snap_name, mime="application/octet-stream")
+        st.caption("Store snapshots in a secure location. Restore a delta on top of its base snapshot.")
+    
+    snap_up = st.file_uploader("Restore Snapshot (.aegis)", type=["aegis"])
+    if snap_up and st.button("Initialize Restoration"):
+        try:
+            restore_snapshot(store, snap_up)
+            st.success("System Restored Successfully"); st.rerun()
+        except SnapshotError as e:
+            st.error(f"Snapshot Integrity Failed: {e}")
+    
+    with st.expander("Legacy Restore Hash"):
+        restore_code = st.text_input("Inject Restore Hash")
+        if st.button("Restore from Hash"):
+            if restore_data(restore_code): st.success("System Restored Successfully"); st.rerun()
+            else: st.error("Hash Integrity Failed.")
+        
+    st.divider()
+    st.subheader("Frame Cache")
+    c_stats = frames.stats()
+    k1, k2, k3, k4 = st.columns(4)
+    k1.metric("Cache Hits", f"{c_stats['hits']:,}")
+    k2.metric("Cache Misses", f"{c_stats['misses']:,}")
+    k3.metric("Hit Rate", f"{c_stats['hit_rate']:.0%}")
+    k4.metric("Cached Frames", c_stats['entries'])
+    st.caption(f"Herd data version {store.version} | {c_stats['evictions']:,} evictions")
+    if st.button("Flush Frame Cache"):
+        frames.clear(); st.rerun()
+    
+    st.divider()
+    st.subheader("Render Timing")
+    INSTRUMENTS.enabled = st.toggle("Instrumentation", INSTRUMENTS.enabled,
+                                    help="Off: spans become no-ops and timed calls pass straight through.")
+    timings = INSTRUMENTS.snapshot()
+    if len(timings):
+        st.dataframe(timings.round(3), use_container_width=True, hide_index=True)
+        st.caption(f"Rolling percentiles over the last {INSTRUMENTS.window} calls per span | "
+                   f"Prometheus export: {METRICS_PATH}")
+        t1, t2 = st.columns(2)
+        t1.download_button("⬇️ Prometheus Metrics", INSTRUMENTS.to_prometheus(), file_name="aegis_metrics.prom",
+                           mime="text/plain")
+        if t2.button("Reset Timings"):
+            INSTRUMENTS.reset(); st.rerun()
+    else:
+        st.info("No spans recorded yet.")
+    
+    st.divider()
+    st.subheader("Disaster Recovery")
+    if not st.session_state.confirm_wipe:
+        if st.button("🚨 NUCLEAR FACTORY RESET"):
+            st.session_state.confirm_wipe = True; st.rerun()
+    else:
+        st.error("ARE YOU SURE? This action is irreversible.")
+        if st.button("✅ CONFIRM PURGE"):
+            store.clear()
+            st.session_state.confirm_wipe = False; st.rerun()
+        if st.button("❌ ABORT"):
+            st.session_state.confirm_wipe = False; st.rerun()
@@ -0,0 +1,30 @@
+import streamlit as st
+
+from app_pages.common import cached_frame, get_store, herd_size
+from knowledge_base import SPECIES_METRICS
+from vax_schedule import VaxSchedule
+
+
+def vaccination_schedule():
+    # Species x protocol join, indexed by due date for window queries
+    return VaxSchedule.from_animals(get_store().fetch(["ID", "Species", "Date"]), SPECIES_METRICS)
+
+
+def render():
+    st.title("Proactive Immunization Sentinel")
+    if herd_size():
+        schedule = cached_frame("vax_schedule", vaccination_schedule)
+        v1, v2 = st.columns([1, 2])
+        view = v1.radio("Window", ["Due Soon", "Overdue"], horizontal=True)
+        horizon = v2.slider("Days", 1, 365, 30)
+        if view == "Due Soon":
+            window = schedule.due_within(horizon)
+        else:
+            window = schedule.overdue(lookback_days=horizon)
+        st.metric(f"{view} ({horizon} days)", f"{len(window):,} doses", help=f"{len(schedule):,} doses scheduled in total")
+        if len(window):
+            st.table(window.assign(**{"Date Due": window["Date Due"].dt.strftime("%Y-%m-%d")}))
+        else:
+            st.success("No doses in this window.")
+    else:
+        st.info("Registry empty.")
@@ -0,0 +1,223 @@
+"""
+audit_log.py
+Bounded, persistent audit trail behind new_app.py's log_action.
+
+Entries are structured (sequence number, timestamp, level, message,
+optional asset id). The most recent `capacity` entries live in a fixed-size
+ring buffer; every entry is also appended as one JSON line to an on-disk log
+that rotates by size (audit.jsonl -> audit.jsonl.1 -> ... -> .N). Reads are
+paginated newest-first; level and asset filters walk small per-key indexes
+of sequence numbers, so a page with one filter costs O(page size) however
+long the process has been running. With both filters the smaller index is
+walked and each seq looked up in the other to count the matches, so that
+page costs O(smaller index · log), still bounded by capacity. Index keys are
+dropped as their last entry leaves the ring, so memory stays bounded by
+capacity however many distinct assets are logged.
+"""
+import json
+import os
+import threading
+from bisect import bisect_left
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_CAPACITY = 10_000
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUPS = 3
+
+
+@dataclass
+class AuditEntry:
+    seq: int
+    ts: str
+    level: str
+    message: str
+    asset: Optional[str] = None
+
+    def format(self) -> str:
+        """The legacy one-line form: '[YYYY-mm-dd HH:MM:SS] [LEVEL] message'."""
+        return f"[{self.ts.replace('T', ' ')}] [{self.level}] {self.message}"
+
+
+class _SeqIndex:
+    """Ascending sequence numbers for one filter key; old ones are trimmed from the front."""
+
+    def __init__(self):
+        self.seqs: List[int] = []
+        self.lo = 0
+
+    def append(self, seq: int) -> None:
+        self.seqs.append(seq)
+
+    def trim(self, oldest: int) -> None:
+        while self.lo < len(self.seqs) and self.seqs[self.lo] < oldest:
+            self.lo += 1
+        if self.lo > 1024 and self.lo * 2 > len(self.seqs):
+            del self.seqs[:self.lo]
+            self.lo = 0
+
+    def __len__(self):
+        return len(self.seqs) - self.lo
+
+    def __contains__(self, seq: int) -> bool:
+        i = bisect_left(self.seqs, seq, self.lo)
+        return i < len(self.seqs) and self.seqs[i] == seq
+
+    def newest(self, offset: int, count: int) -> List[int]:
+        """count seqs starting `offset` back from the newest, newest first."""
+        hi = len(self.seqs) - offset
+        lo = max(self.lo, hi - count)
+        return self.seqs[lo:hi][::-1] if hi > lo else []
+
+
+class AuditLog:
+    """
+    Thread-safe audit trail. With path=None entries are kept in memory only.
+    On open, the tail of an existing log (current file and rotations) is
+    reloaded so the ring survives restarts.
+    """
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 capacity: int = DEFAULT_CAPACITY,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 backups: int = DEFAULT_BACKUPS):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.path = path
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        self._ring: List[Optional[AuditEntry]] = [None] * capacity
+        self._next_seq = 0
+        self._by_level: Dict[str, _SeqIndex] = {}
+        self._by_asset: Dict[str, _SeqIndex] = {}
+        self._file = None
+        if path:
+            self._reload()
+            self._file = open(path, "a", encoding="utf-8")
+
+    # -- writing -------------------------------------------------------------
+
+    def log(self, message: str, level: str = "INFO", asset: Optional[str] = None) -> AuditEntry:
+        with self._lock:
+            entry = AuditEntry(self._next_seq, datetime.now().isoformat(timespec="seconds"),
+                               level, message, None if asset is None else str(asset))
+            self._remember(entry)
+            if self._file is not None:
+                line = json.dumps(asdict(entry), ensure_ascii=False) + "\n"
+                if self._file.tell() + len(line.encode("utf-8")) > self.max_bytes and self._file.tell() > 0:
+                    self._rotate()
+                self._file.write(line)
+                self._file.flush()
+            return entry
+
+    def _remember(self, entry: AuditEntry) -> None:
+        slot = entry.seq % self.capacity
+        evicted = self._ring[slot]
+        self._ring[slot] = entry
+        self._next_seq = entry.seq + 1
+        oldest = self._next_seq - self.capacity
+        if evicted is not None:
+            # trim the evicted entry's keys too, so keys never logged again are dropped
+            for index, key in ((self._by_level, evicted.level), (self._by_asset, evicted.asset)):
+                if key in index:
+                    index[key].trim(oldest)
+                    if not len(index[key]):
+                        del index[key]
+        for index, key in ((self._by_level, entry.level), (self._by_asset, entry.asset)):
+            if key is None:
+                continue
+            if key not in index:
+                index[key] = _SeqIndex()
+            index[key].append(entry.seq)
+            index[key].trim(oldest)
+
+    def _rotate(self) -> None:
+        self._file.close()
+        if self.backups > 0:
+            for i in range(self.backups - 1, 0, -1):
+                src = f"{self.path}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+            self._file = open(self.path, "a", encoding="utf-8")
+        else:
+            self._file = open(self.path, "w", encoding="utf-8")
+
+    def _reload(self) -> None:
+        files = [f"{self.path}.{i}" for i in range(self.backups, 0, -1)] + [self.path]
+        for name in files:
+            if not os.path.exists(name):
+                continue
+            with open(name, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = AuditEntry(**json.loads(line))
+                    except (ValueError, TypeError):
+                        continue          # torn last line after a crash
+                    if entry.seq >= self._next_seq:
+                        self._remember(entry)
+
+    # -- reading -------------------------------------------------------------
+
+    def __len__(self):
+        with self._lock:
+            return min(self._next_seq, self.capacity)
+
+    def _oldest(self) -> int:
+        return max(0, self._next_seq - self.capacity)
+
+    def page(self,
+             page: int = 0,
+             per_page: int = 50,
+             level: Optional[str] = None,
+             asset: Optional[str] = None) -> Tuple[List[AuditEntry], int]:
+        """
+        Newest-first page of retained entries, optionally filtered to one
+        level and/or asset. Returns (entries, total matching entries).
+        """
+        offset = max(page, 0) * per_page
+        with self._lock:
+            oldest = self._oldest()
+            if level is None and asset is None:
+                total = self._next_seq - oldest
+                hi = self._next_seq - 1 - offset
+                seqs = range(hi, max(hi - per_page, oldest - 1), -1)
+                return [self._ring[s % self.capacity] for s in seqs], total
+            filters = [(ix, key) for ix, key in ((self._by_level, level), (self._by_asset, asset)) if key is not None]
+            if any(key not in ix for ix, key in filters):
+                return [], 0
+            indexes = sorted((ix[key] for ix, key in filters), key=len)
+            for ix in indexes:
+                ix.trim(oldest)
+            primary = indexes[0]
+            if len(indexes) == 1:
+                seqs = primary.newest(offset, per_page)
+                return [self._ring[s % self.capacity] for s in seqs], len(primary)
+            # intersect: walk the smaller index newest-first, binary-search each seq in the
+            # other; every match is counted for the total but only the page's are kept
+            other = indexes[1]
+            seqs, total = [], 0
+            for i in range(len(primary.seqs) - 1, primary.lo - 1, -1):
+                s = primary.seqs[i]
+                if s in other:
+                    if offset <= total < offset + per_page:
+                        seqs.append(s)
+                    total += 1
+            return [self._ring[s % self.capacity] for s in seqs], total
+
+    def levels(self) -> List[str]:
+        with self._lock:
+            oldest = self._oldest()
+            for ix in self._by_level.values():
+                ix.trim(oldest)
+            return sorted(k for k, ix in self._by_level.items() if len(ix))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,262 @@
+"""
+batch.py
+Headless nightly analytics over a directory of per-farm weigh-in exports.
+
+    python -m batch exports/ --out results/ --workers 8 --as-of 2025-06-30
+
+Each CSV (animal_id, date, weight[, feed][, species]) is one farm and one
+unit of work. Farms are sharded across a process pool, largest file first,
+and each worker streams its file through ingest.WeighInAccumulator: ADG
+regressions and compute_metrics_batch KPIs per animal, plus the vaccination
+doses falling around --as-of (from each animal's first weighing). Results
+are merged in farm-name order, so the output files are byte-identical
+whatever the worker count or completion order:
+
+    kpis.csv          one row per (farm, animal)
+    vaccinations.csv  doses overdue within --lookback days or due within --horizon
+    farms.csv         per-farm totals and any error (timings go to stderr)
+
+Species labels are matched case-insensitively. Animals whose species has no
+market price or feed cost (and no override) are counted in farms.csv's
+unpriced_animals; their revenue and profit are blank and left out of
+total_profit.
+
+The exit status is 1 when any farm failed; the others are still written.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from dates import is_numeric_days
+from ingest import WeighInAccumulator, stream_weigh_ins
+from knowledge_base import MARKET_PRICES, SPECIES_METRICS
+from vax_schedule import VaxSchedule
+
+DOSE_COLUMNS = ["farm", "Animal ID", "Species", "Vaccine", "Date Due", "Status"]
+
+
+@dataclass(frozen=True)
+class BatchOptions:
+    as_of: str
+    horizon_days: int = 30
+    lookback_days: int = 30
+    default_species: str = "Beef"
+    price_per_kg: Optional[float] = None     # None: MARKET_PRICES by species
+    feed_cost: Optional[float] = None        # None: SPECIES_METRICS feed_cost by species
+    chunksize: int = 250_000
+    id_col: str = "animal_id"
+    date_col: str = "date"
+    weight_col: str = "weight"
+    feed_col: str = "feed"
+    species_col: str = "species"
+
+
+@dataclass
+class FarmResult:
+    farm: str
+    path: str
+    rows: int = 0
+    unpriced: int = 0
+    seconds: float = 0.0
+    kpis: pd.DataFrame = field(default_factory=pd.DataFrame)
+    doses: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=DOSE_COLUMNS))
+    error: Optional[str] = None
+
+    def summary(self) -> dict:
+        k = self.kpis
+        status = self.doses["Status"] if len(self.doses) else pd.Series(dtype=object)
+        return {
+            "farm": self.farm, "file": os.path.basename(self.path), "rows": self.rows, "animals": len(k),
+            "unpriced_animals": self.unpriced,
+            "mean_adg": k["adg"].mean() if len(k) else np.nan,
+            "total_profit": k["profit_now"].sum() if len(k) else 0.0,
+            "doses_overdue": int((status == "overdue").sum()), "doses_due": int((status == "due").sum()),
+            "error": self.error or "",
+        }
+
+
+@dataclass
+class BatchResult:
+    farms: List[FarmResult]
+    seconds: float
+
+    @property
+    def rows(self) -> int:
+        return sum(f.rows for f in self.farms)
+
+    @property
+    def failed(self) -> List[FarmResult]:
+        return [f for f in self.farms if f.error]
+
+    def kpis(self) -> pd.DataFrame:
+        parts = [f.kpis for f in self.farms if len(f.kpis)]
+        return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+    def doses(self) -> pd.DataFrame:
+        parts = [f.doses for f in self.farms if len(f.doses)]
+        return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=DOSE_COLUMNS)
+
+    def summary(self) -> pd.DataFrame:
+        return pd.DataFrame([f.summary() for f in self.farms])
+
+
+_SPECIES = {name.lower(): name for name in (*MARKET_PRICES, *SPECIES_METRICS)}
+
+
+def _canonical_species(species: pd.Series) -> pd.Series:
+    """'beef ' -> 'Beef'; labels matching no known species are kept (stripped)."""
+    labels = species.astype(str).str.strip()
+    return labels.str.lower().map(_SPECIES).fillna(labels)
+
+
+def _per_species(species: pd.Series, table: dict, override: Optional[float]) -> pd.Series:
+    if override is not None:
+        return pd.Series(float(override), index=species.index)
+    return species.map(table).astype(float)
+
+
+def analyze_farm(path: str, options: BatchOptions) -> FarmResult:
+    """KPIs and vaccination doses for one farm export; errors are captured, not raised."""
+    farm = Path(path).stem
+    result = FarmResult(farm=farm, path=str(path))
+    start = time.perf_counter()
+    try:
+        acc = WeighInAccumulator()
+        species_parts = []
+        chunks = stream_weigh_ins(path, chunksize=options.chunksize, id_col=options.id_col,
+                                  date_col=options.date_col, weight_col=options.weight_col,
+                                  feed_col=options.feed_col, extra_cols=[options.species_col])
+        for chunk in chunks:
+            acc.update(chunk["animal_id"], chunk["day"], chunk["weight"], chunk["feed"])
+            if options.species_col in chunk:
+                species_parts.append(chunk[["animal_id", options.species_col]].drop_duplicates("animal_id"))
+            result.rows += len(chunk)
+
+        state = acc.state
+        species = pd.Series(options.default_species, index=state.index, name="species")
+        if species_parts:
+            seen = pd.concat(species_parts).drop_duplicates("animal_id").set_index("animal_id")
+            species = seen[options.species_col].reindex(state.index).fillna(options.default_species)
+            species = _canonical_species(species).rename("species")
+
+        price = _per_species(species, MARKET_PRICES, options.price_per_kg)
+        feed_cost = _per_species(species, {s: m["feed_cost"] for s, m in SPECIES_METRICS.items()},
+                                 options.feed_cost)
+        result.unpriced = int((price.isna() | feed_cost.isna()).sum())
+        kpis = acc.results(price, feed_cost)
+        kpis.insert(0, "species", species)
+        kpis.insert(0, "farm", farm)
+        result.kpis = kpis.reset_index()
+
+        # doses are anchored on calendar dates; numeric-day exports have none
+        sample = pd.read_csv(path, usecols=[options.date_col], nrows=1_000)[options.date_col]
+        if len(state) and not is_numeric_days(sample):
+            result.doses = _doses(farm, state, species, options)
+    except Exception as exc:    # one bad export must not sink the nightly run
+        result.error = f"{type(exc).__name__}: {exc}"
+        result.kpis = pd.DataFrame()
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _doses(farm: str, state: pd.DataFrame, species: pd.Series, options: BatchOptions) -> pd.DataFrame:
+    first = pd.Timestamp(0) + pd.to_timedelta(state["first_day"].to_numpy(), unit="D")
+    animals = pd.DataFrame({"ID": state.index, "Species": species.to_numpy(), "Date": first.normalize()})
+    schedule = VaxSchedule.from_animals(animals, SPECIES_METRICS, date_format=None)
+    overdue = schedule.overdue(options.as_of, lookback_days=options.lookback_days).assign(Status="overdue")
+    due = schedule.due_within(options.horizon_days, options.as_of).assign(Status="due")
+    doses = pd.concat([overdue, due], ignore_index=True).assign(farm=farm)
+    return doses.sort_values(["Date Due", "Animal ID", "Vaccine"], kind="stable", ignore_index=True)[DOSE_COLUMNS]
+
+
+def find_exports(input_dir, pattern: str = "*.csv") -> List[str]:
+    return sorted(str(p) for p in Path(input_dir).glob(pattern) if p.is_file())
+
+
+def run_batch(paths: Sequence[str],
+              options: BatchOptions,
+              workers: Optional[int] = None,
+              progress: Optional[Callable[[int, int, FarmResult], None]] = None) -> BatchResult:
+    """
+    Analyze every export, `workers` processes at a time (1 runs in-process).
+    progress, if given, is called as (done, total, farm_result) as farms
+    finish, in completion order; the returned farms are in sorted path order.
+    """
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    results = {}
+    # largest files first so the slowest shard is not the one started last
+    order = sorted(paths, key=lambda p: (-os.path.getsize(p), p))
+    if workers == 1 or len(order) <= 1:
+        for path in order:
+            results[path] = analyze_farm(path, options)
+            if progress:
+                progress(len(results), len(order), results[path])
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(order))) as pool:
+            futures = {pool.submit(analyze_farm, path, options): path for path in order}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                if progress:
+                    progress(len(results), len(order), results[futures[future]])
+    farms = [results[p] for p in sorted(paths)]
+    return BatchResult(farms=farms, seconds=time.perf_counter() - start)
+
+
+def write_outputs(result: BatchResult, out_dir) -> List[str]:
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    written = []
+    for name, frame in (("kpis.csv", result.kpis()), ("vaccinations.csv", result.doses()),
+                        ("farms.csv", result.summary())):
+        frame.to_csv(out / name, index=False)
+        written.append(str(out / name))
+    return written
+
+
+def _print_progress(done: int, total: int, farm: FarmResult) -> None:
+    status = f"FAILED {farm.error}" if farm.error else f"{farm.rows:>10,} rows {len(farm.kpis):>8,} animals"
+    print(f"[{done:>{len(str(total))}}/{total}] {farm.farm:<24} {status}  {farm.seconds:.2f}s", file=sys.stderr)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("input_dir")
+    parser.add_argument("--out", required=True, help="directory for kpis.csv, vaccinations.csv, farms.csv")
+    parser.add_argument("--pattern", default="*.csv")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    parser.add_argument("--as-of", default=pd.Timestamp.today().strftime("%Y-%m-%d"),
+                        help="reference date for due/overdue doses (default: today)")
+    parser.add_argument("--horizon", type=int, default=30, help="days ahead for due doses")
+    parser.add_argument("--lookback", type=int, default=30, help="days back for overdue doses")
+    parser.add_argument("--default-species", default="Beef", choices=sorted(SPECIES_METRICS))
+    parser.add_argument("--price-per-kg", type=float, help="override MARKET_PRICES for every animal")
+    parser.add_argument("--feed-cost", type=float, help="override the species feed cost for every animal")
+    parser.add_argument("--chunksize", type=int, default=250_000)
+    parser.add_argument("--quiet", action="store_true", help="no per-farm progress lines")
+    args = parser.parse_args(argv)
+
+    paths = find_exports(args.input_dir, args.pattern)
+    if not paths:
+        parser.error(f"no files matching {args.pattern!r} in {args.input_dir}")
+    options = BatchOptions(as_of=args.as_of, horizon_days=args.horizon, lookback_days=args.lookback,
+                           default_species=args.default_species, price_per_kg=args.price_per_kg,
+                           feed_cost=args.feed_cost, chunksize=args.chunksize)
+    result = run_batch(paths, options, workers=args.workers, progress=None if args.quiet else _print_progress)
+    write_outputs(result, args.out)
+    rate = result.rows / result.seconds if result.seconds else 0.0
+    print(f"{len(paths)} farms, {result.rows:,} rows in {result.seconds:.2f}s ({rate:,.0f} rows/s); "
+          f"{len(result.failed)} failed; results in {args.out}", file=sys.stderr)
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Throughput of the batch CLI pipeline against worker count.
+
+    python -m benchmarks.bench_batch --farms 16 --animals 20000 --workers 1 2 4 8
+
+Writes --farms synthetic weigh-in exports (sizes varying 1x-2x) to a temp
+dir, runs batch.run_batch at each worker count, and reports rows/s, the
+speedup over one worker and whether the merged outputs are identical to the
+single-worker run. Worker counts above the machine's CPU count still run
+(to check the output) but cannot speed up and are flagged.
+"""
+import argparse
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from batch import BatchOptions, find_exports, run_batch, write_outputs
+from benchmarks.synthetic import SPECIES, synthetic_weigh_ins
+
+
+def write_farms(directory: str, farms: int, animals: int, per_animal: int = 6, seed: int = 42) -> None:
+    for i in range(farms):
+        n = int(animals * (1 + i / max(farms - 1, 1)))
+        w = synthetic_weigh_ins(n, per_animal, seed + i)
+        species = SPECIES[np.random.default_rng(seed + i).integers(0, len(SPECIES), n)][w["animal_id"]]
+        pd.DataFrame({
+            "animal_id": f"F{i:03d}-" + w["animal_id"].astype(str),
+            "date": (pd.Timestamp("2025-01-01") + pd.to_timedelta(w["day"], unit="D")).dt.strftime("%Y-%m-%d"),
+            "weight": w["weight"].round(2), "feed": w["feed"].round(2), "species": species,
+        }).to_csv(os.path.join(directory, f"farm_{i:03d}.csv"), index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--farms", type=int, default=16)
+    parser.add_argument("--animals", type=int, default=20_000, help="animals in the smallest farm")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        exports = os.path.join(tmp, "exports")
+        os.mkdir(exports)
+        write_farms(exports, args.farms, args.animals)
+        paths = find_exports(exports)
+        options = BatchOptions(as_of="2025-06-30")
+        print(f"{len(paths)} farms, {sum(os.path.getsize(p) for p in paths) / 1e6:.0f} MB, {cpus} CPUs")
+        print(f"{'workers':>8}{'seconds':>10}{'rows/s':>14}{'speedup':>10}  output")
+        base_time, base_files = None, None
+        for workers in args.workers:
+            result = run_batch(paths, options, workers=workers)
+            files = write_outputs(result, os.path.join(tmp, f"out{workers}"))
+            contents = [open(f, "rb").read() for f in files]
+            if base_time is None:
+                base_time, base_files = result.seconds, contents
+            same = "identical" if contents == base_files else "DIFFERS"
+            if workers > cpus:
+                same += f" (oversubscribed: {cpus} CPUs)"
+            print(f"{workers:>8}{result.seconds:>10.2f}{result.rows / result.seconds:>14,.0f}"
+                  f"{base_time / result.seconds:>9.2f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Vega-Lite spec size and build time: per-record charts vs chart_data summaries.
+
+    python -m benchmarks.bench_charts --sizes 1000 10000 50000 200000
+
+For each herd size this builds the Tactical Dashboard ADG chart and the
+Environmental Hub CH4 line both ways and serializes them with to_json(), the
+work (and payload) a rerun pays before the browser sees anything.
+"""
+import argparse
+
+import altair as alt
+
+from benchmarks.bench_snapshot import timed
+from benchmarks.synthetic import synthetic_herd
+from chart_data import daily_series, group_summary, histogram
+
+
+def per_record_specs(df):
+    growth = alt.Chart(df[['ID', 'Sire', 'Species', 'ADG']]).mark_bar().encode(
+        x='ID:N', y='ADG:Q', color='Species:N', tooltip=['ID', 'Sire', 'ADG'])
+    ch4 = alt.Chart(df[['Date', 'CH4', 'Species']]).mark_line(point=True).encode(x='Date', y='CH4', color='Species')
+    return [growth.to_json(), ch4.to_json()]
+
+
+def summarized_specs(df):
+    bins = histogram(df['ADG'], by=df['Species'])
+    sires = group_summary(df, "Sire", "ADG", top=30)
+    ch4 = daily_series(df, "Date", "CH4", by="Species")
+    return [
+        alt.Chart(bins).mark_bar().encode(x=alt.X('bin_start:Q', bin='binned'), x2='bin_end:Q', y='count:Q',
+                                          color='group:N').to_json(),
+        alt.Chart(sires).mark_bar().encode(x='Sire:N', y='mean:Q').to_json(),
+        alt.Chart(ch4).mark_line(point=True).encode(x='Date:T', y='CH4:Q', color='Species:N').to_json(),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000, 200_000])
+    args = parser.parse_args()
+    alt.data_transformers.disable_max_rows()    # the per-record path would otherwise refuse >5000 rows
+
+    print(f"{'herd':>10}{'per-record (MB)':>18}{'build (s)':>12}{'summarized (KB)':>18}{'build (s)':>12}")
+    for n in args.sizes:
+        df = synthetic_herd(n)
+        raw, t_raw = timed(lambda: per_record_specs(df))
+        agg, t_agg = timed(lambda: summarized_specs(df))
+        raw_size = sum(len(s) for s in raw)
+        agg_size = sum(len(s) for s in agg)
+        print(f"{n:>10,}{raw_size / 1e6:>18.2f}{t_raw:>12.3f}{agg_size / 1e3:>18.1f}{t_agg:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
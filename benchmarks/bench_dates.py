@@ -0,0 +1,65 @@
+"""
+Date-column parsing: the old parse_date_column vs dates.normalize_dates.
+
+    python -m benchmarks.bench_dates --rows 10000000
+
+Columns mimic weigh-in exports: ISO and day-first dates drawn from a few
+hundred distinct days, numeric days stored as text, and a near-unique
+timestamp column (the worst case for unique-value parsing). "pandas" is the
+plain call that parses the column correctly given its format. The old path
+gives up on the day-first and numeric-text columns after a failed
+pd.to_datetime and returns the strings unchanged ("unparsed").
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_snapshot import timed
+from dates import normalize_dates
+
+
+def legacy_parse_date_column(series):
+    # metrics.parse_date_column before dates.py
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    try:
+        return pd.to_datetime(series)
+    except Exception:
+        return series
+
+
+def columns(n, distinct=400, seed=0):
+    """name -> (column, the plain pandas call that parses it correctly)."""
+    rng = np.random.default_rng(seed)
+    days = pd.date_range("2024-01-01", periods=distinct)
+    pick = rng.integers(0, distinct, n)
+    stamps = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365 * 86_400, n), unit="s")
+    return {
+        "ISO date": (pd.Series(days.strftime("%Y-%m-%d").to_numpy()[pick]), pd.to_datetime),
+        "day-first date": (pd.Series(days.strftime("%d/%m/%Y").to_numpy()[pick]),
+                           lambda s: pd.to_datetime(s, format="%d/%m/%Y")),
+        "numeric days (text)": (pd.Series(np.arange(distinct).astype(str)[pick]),
+                                lambda s: pd.to_numeric(s).astype(float)),
+        "timestamp (near-unique)": (pd.Series(stamps.strftime("%Y-%m-%d %H:%M:%S")), pd.to_datetime),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    print(f"rows: {args.rows:,}")
+    print(f"{'column':<26}{'old (s)':>10}{'pandas (s)':>12}{'new (s)':>10}{'vs pandas':>11}  old result")
+    for name, (col, reference) in columns(args.rows).items():
+        old, t_old = timed(lambda: legacy_parse_date_column(col))
+        expected, t_ref = timed(lambda: reference(col))
+        new, t_new = timed(lambda: normalize_dates(col))
+        assert new.equals(expected), name
+        note = "unparsed" if old.dtype == col.dtype else "same"
+        print(f"{name:<26}{t_old:>10.2f}{t_ref:>12.2f}{t_new:>10.2f}{t_ref / t_new:>10.1f}x  {note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Snapshot size and restore time: binary snapshot vs the legacy base64/JSON hash.
+
+    python -m benchmarks.bench_snapshot --rows 100000
+"""
+import argparse
+import base64
+import io
+import json
+import random
+import time
+
+from herd_store import HerdStore
+from snapshot import restore_snapshot, write_snapshot
+
+SPECIES = ["Beef", "Pig", "Goat", "Sheep"]
+
+
+def synthetic_records(n, seed=42):
+    rng = random.Random(seed)
+    for i in range(n):
+        sp = rng.choice(SPECIES)
+        yield {
+            "ID": f"AEG-{sp[:2].upper()}-{i:07d}", "Species": sp, "Sire": f"UoN-BULL-{rng.randint(1, 400):03d}",
+            "ADG": rng.uniform(0.05, 1.2), "Profit": rng.uniform(-5e3, 9e4), "Manure": rng.uniform(10, 4000),
+            "Biogas": rng.uniform(0.5, 200), "CH4": rng.uniform(0.1, 60), "FCR": rng.uniform(1.5, 9),
+            "Date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}", "Weight": rng.uniform(20, 700),
+        }
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    store = HerdStore()
+    store.insert_many(synthetic_records(args.rows))
+
+    legacy, t_legacy_write = timed(lambda: base64.b64encode(json.dumps(store.fetch().to_dict("records")).encode()).decode())
+    _, t_legacy_read = timed(lambda: store.replace_all(json.loads(base64.b64decode(legacy.encode()).decode())))
+
+    buf = io.BytesIO()
+    _, t_snap_write = timed(lambda: write_snapshot(store, buf))
+    buf.seek(0)
+    _, t_snap_read = timed(lambda: restore_snapshot(store, buf))
+
+    print(f"rows: {args.rows:,}")
+    print(f"{'format':<16}{'size (MB)':>12}{'write (s)':>12}{'restore (s)':>14}")
+    print(f"{'base64/JSON':<16}{len(legacy) / 1e6:>12.2f}{t_legacy_write:>12.3f}{t_legacy_read:>14.3f}")
+    print(f"{'snapshot v1':<16}{len(buf.getvalue()) / 1e6:>12.2f}{t_snap_write:>12.3f}{t_snap_read:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Cold start and per-rerun cost of the Streamlit apps, measured with AppTest.
+
+    python -m benchmarks.bench_startup --scripts app.py new_app.py --reruns 20
+
+Each script is measured in a fresh interpreter (after streamlit itself is
+imported, which every deployment pays regardless): the first run of the
+default page, the median of --reruns reruns of it, and the first visit to
+every other menu entry. Stores, audit and metrics files go to a temp dir.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+_PROBE = r"""
+import json, os, statistics, sys, time
+sys.path.insert(0, os.getcwd())
+from streamlit.testing.v1 import AppTest
+
+script, reruns = sys.argv[1], int(sys.argv[2])
+before = set(sys.modules)
+t0 = time.perf_counter()
+at = AppTest.from_file(script, default_timeout=120).run()
+cold = time.perf_counter() - t0
+assert not at.exception, at.exception
+loaded = sorted(m for m in set(sys.modules) - before if "." not in m)
+
+times = []
+for _ in range(reruns):
+    t0 = time.perf_counter()
+    at.run()
+    times.append(time.perf_counter() - t0)
+
+radio = at.sidebar.radio[-1] if script == "app.py" else at.sidebar.radio[0]
+label = radio.label
+first_visit = {}
+for option in radio.options[1:]:
+    radio = [r for r in at.sidebar.radio if r.label == label][0]
+    t0 = time.perf_counter()
+    radio.set_value(option).run()
+    first_visit[option] = time.perf_counter() - t0
+
+print(json.dumps({"script": script, "cold_s": cold, "rerun_median_s": statistics.median(times),
+                  "first_visit_s": first_visit, "modules_at_start": loaded}))
+"""
+
+
+def measure(script: str, reruns: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ,
+                   AEGIS_DB_PATH=os.path.join(tmp, "herd.db"),
+                   AEGIS_AUDIT_PATH=os.path.join(tmp, "audit.jsonl"),
+                   AEGIS_METRICS_PATH=os.path.join(tmp, "metrics.prom"))
+        out = subprocess.run([sys.executable, "-c", _PROBE, script, str(reruns)],
+                             env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scripts", nargs="+", default=["app.py", "new_app.py"])
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--save", help="write the measurements to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = [measure(s, args.reruns) for s in args.scripts]
+    for r in results:
+        print(f"{r['script']}: cold start {r['cold_s']:.3f}s | rerun median {r['rerun_median_s'] * 1e3:.1f}ms")
+        heavy = [m for m in ("altair", "matplotlib", "requests") if m in r["modules_at_start"]]
+        print(f"  heavy modules loaded at start: {', '.join(heavy) or 'none'}")
+        slowest = sorted(r["first_visit_s"].items(), key=lambda kv: -kv[1])[:5]
+        print("  slowest first visits: " + ", ".join(f"{k} {v:.3f}s" for k, v in slowest))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
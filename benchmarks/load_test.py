@@ -0,0 +1,165 @@
+"""
+Sustained-load test for the analytics service (service.py) on localhost.
+
+    python -m benchmarks.load_test --spawn --duration 20 --concurrency 16 --batch 100
+    python -m benchmarks.load_test --url http://127.0.0.1:8765 --endpoint metrics --batch 1000
+
+Opens --concurrency keep-alive connections, each sending requests back to
+back for --duration seconds (after a short warm-up), cycling through the
+chosen endpoints with --batch items per request. Reports client-side
+requests/s, items/s and latency percentiles, then the server's own
+/v1/stats. --spawn starts the service in a subprocess on a free port.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+
+ENDPOINTS = ("metrics", "days-to-target", "pearson-square", "thi", "diagnose", "withdrawal")
+SIGNS = ["high fever", "drooling", "lameness", "swollen lymph nodes", "coughing", "diarrhoea", "skin nodules"]
+DRUGS = ["Oxytetracycline 20%", "Ivermectin", "Albendazole", "Ceftiofur", "Amitraz (Dip)"]
+
+
+def payload(endpoint: str, batch: int, rng: np.random.Generator) -> dict:
+    u = lambda lo, hi: np.round(rng.uniform(lo, hi, batch), 2).tolist()
+    if endpoint == "metrics":
+        return {"initial_wt": u(150, 250), "current_wt": u(250, 400), "days": u(30, 200), "feed_used": u(300, 900),
+                "price_per_kg": 760, "feed_cost": 55, "target_wt": 450}
+    if endpoint == "days-to-target":
+        return {"current_wt": u(200, 400), "target_wt": 450, "adg": u(-0.1, 1.2)}
+    if endpoint == "pearson-square":
+        return {"target_cp": u(12, 20), "f1_cp": 9.0, "f2_cp": u(30, 45)}
+    if endpoint == "thi":
+        return {"temp": u(15, 40), "humidity": u(20, 95)}
+    if endpoint == "diagnose":
+        return {"signs": [", ".join(rng.choice(SIGNS, 2, replace=False)) for _ in range(batch)], "top": 3}
+    return {"drugs": rng.choice(DRUGS, batch).tolist()}
+
+
+async def _request(reader, writer, host: str, path: str, body: bytes) -> Tuple[int, bytes]:
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def _worker(url, bodies: List[Tuple[str, bytes]], batch: int, warmup_end: float, end: float,
+                  latencies: List[float], counts: Dict[str, int]) -> None:
+    reader, writer = await asyncio.open_connection(url.hostname, url.port)
+    i = 0
+    try:
+        while True:
+            path, body = bodies[i % len(bodies)]
+            i += 1
+            t0 = time.perf_counter()
+            status, _ = await _request(reader, writer, url.netloc, path, body)
+            t1 = time.perf_counter()
+            if t1 >= end:
+                break
+            if t0 >= warmup_end:
+                latencies.append(t1 - t0)
+                counts["requests"] += 1
+                counts["items"] += batch if status == 200 else 0
+                counts["errors"] += status != 200
+    finally:
+        writer.close()
+
+
+async def run_load(base_url: str, endpoints, batch: int, concurrency: int, duration: float,
+                   warmup: float = 2.0, seed: int = 0, decimals: Optional[int] = None) -> dict:
+    """Client-side results: requests, items, errors, seconds, req/s, items/s and latency percentiles (ms)."""
+    url = urlparse(base_url)
+    rng = np.random.default_rng(seed)
+    extra = {} if decimals is None else {"decimals": decimals}
+    # a few pre-encoded bodies per endpoint, so the client spends its time on I/O, not JSON
+    bodies = [(f"/v1/{e}", json.dumps({**payload(e, batch, rng), **extra}).encode())
+              for _ in range(4) for e in endpoints]
+    latencies: List[float] = []
+    counts = {"requests": 0, "items": 0, "errors": 0}
+    start = time.perf_counter()
+    warmup_end, end = start + warmup, start + warmup + duration
+    await asyncio.gather(*(_worker(url, bodies[k:] + bodies[:k], batch, warmup_end, end, latencies, counts)
+                           for k in range(concurrency)))
+    lat = np.asarray(latencies) * 1e3
+    pct = np.percentile(lat, [50, 90, 99]) if len(lat) else [np.nan] * 3
+    return {**counts, "seconds": duration, "requests_per_s": counts["requests"] / duration,
+            "items_per_s": counts["items"] / duration, "p50_ms": pct[0], "p90_ms": pct[1], "p99_ms": pct[2]}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_service(port: int) -> subprocess.Popen:
+    proc = subprocess.Popen([sys.executable, "-m", "service", "--port", str(port)],
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/healthz", timeout=1).read()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("service did not start within 30s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--spawn", action="store_true", help="start service.py on a free port for the run")
+    parser.add_argument("--endpoint", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument("--batch", type=int, default=100, help="items per request")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds (after --warmup)")
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--decimals", type=int, help="ask the service to round numeric outputs")
+    args = parser.parse_args(argv)
+
+    proc: Optional[subprocess.Popen] = None
+    url = args.url
+    if args.spawn:
+        port = _free_port()
+        proc = spawn_service(port)
+        url = f"http://127.0.0.1:{port}"
+    try:
+        r = asyncio.run(run_load(url, args.endpoint, args.batch, args.concurrency, args.duration, args.warmup,
+                                 decimals=args.decimals))
+        print(f"{', '.join(args.endpoint)} | batch {args.batch} | {args.concurrency} connections | "
+              f"{args.duration:.0f}s")
+        print(f"client: {r['requests']:,} requests ({r['errors']} errors), {r['requests_per_s']:,.0f} req/s, "
+              f"{r['items_per_s']:,.0f} items/s, latency p50 {r['p50_ms']:.2f}ms p90 {r['p90_ms']:.2f}ms "
+              f"p99 {r['p99_ms']:.2f}ms")
+        stats = json.load(urllib.request.urlopen(f"{url}/v1/stats"))
+        print(f"{'server endpoint':<18}{'requests':>10}{'req/s':>9}{'items/s':>11}{'p50 ms':>8}{'p99 ms':>8}")
+        for name, s in sorted(stats["endpoints"].items()):
+            print(f"{name:<18}{s['requests']:>10,}{s['requests_per_s']:>9,.0f}{s['items_per_s']:>11,.0f}"
+                  f"{s['p50_ms']:>8.2f}{s['p99_ms']:>8.2f}")
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""
+Timing suite for metrics.py, the shared engines and the per-page frame builds.
+
+    python -m benchmarks.suite --sizes 1000 100000 --save baseline.json
+    python -m benchmarks.suite --sizes 1000 100000 --compare baseline.json --threshold 0.2
+
+Each case is timed on a seeded synthetic herd (benchmarks.synthetic) and the
+best of --repeat runs is kept. Scalar per-animal loops are capped at
+SCALAR_CAP animals (ADG_LOOP_CAP for the per-animal ADG fit, STYLER_CAP for
+the full-table Styler) so the 1M tier finishes; the item count is stored
+next to each timing. --compare exits 1 when any case slowed by more than the
+threshold (and by more than NOISE_FLOOR seconds). Instrumentation spans are
+off while timing unless --instrumented is given.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_herd, synthetic_weigh_ins
+from bio_engines import BioEngines
+from dates import normalize_dates
+from diagnostics import DiagnosticIndex
+from herd_store import HerdStore
+from instrumentation import INSTRUMENTS, Instrumentation
+from knowledge_base import SPECIES_METRICS
+from lactation import forecast_totals
+from metrics import (compute_adg_from_timeseries, compute_adg_grouped, compute_metrics, compute_metrics_batch,
+                     estimate_days_to_target, estimate_days_to_target_batch)
+from sire_eval import SireEvaluation
+from table_view import Filter, PagedTable, TableQuery, style_page
+from vax_schedule import VaxSchedule
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+SCALAR_CAP = 20_000
+ADG_LOOP_CAP = 500          # compute_adg_from_timeseries parses dates per call
+STYLER_CAP = 5_000          # a full-table Styler costs ~0.6ms per row
+NOISE_FLOOR = 0.002
+WEIGH_INS_PER_ANIMAL = 4
+
+
+class Fixture:
+    """Lazily built inputs for one herd size, shared by every case at that size."""
+
+    def __init__(self, n: int, seed: int):
+        self.n = n
+        self.seed = seed
+        self._cache: Dict[str, object] = {}
+
+    def _get(self, key, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    @property
+    def herd(self) -> pd.DataFrame:
+        return self._get("herd", lambda: synthetic_herd(self.n, self.seed))
+
+    @property
+    def weigh_ins(self) -> pd.DataFrame:
+        return self._get("weigh_ins", lambda: synthetic_weigh_ins(self.n, WEIGH_INS_PER_ANIMAL, self.seed))
+
+    @property
+    def store(self) -> HerdStore:
+        def build():
+            store = HerdStore()
+            store.insert_frames([self.herd])
+            return store
+        return self._get("store", build)
+
+    @property
+    def inputs(self) -> dict:
+        """compute_metrics arguments per animal, derived from the weigh-ins."""
+        def build():
+            w = self.weigh_ins
+            first = w.groupby("animal_id").agg(initial=("weight", "first"), current=("weight", "last"),
+                                               d0=("day", "first"), d1=("day", "last"), feed=("feed", "sum"))
+            return {"initial_wt": first["initial"].to_numpy(), "current_wt": first["current"].to_numpy(),
+                    "days": (first["d1"] - first["d0"]).to_numpy(), "feed_used": first["feed"].to_numpy(),
+                    "price_per_kg": 420.0, "feed_cost": 45.0,
+                    "target_wt": first["current"].to_numpy() + 60.0}
+        return self._get("inputs", build)
+
+    def close(self) -> None:
+        if "store" in self._cache:
+            self._cache["store"].close()
+
+
+# name -> (setup(fixture) -> (fn, items))
+CASES: Dict[str, Callable[[Fixture], tuple]] = {}
+
+
+def case(name: str):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def _capped(fx: Fixture) -> int:
+    return min(fx.n, SCALAR_CAP)
+
+
+@case("metrics.compute_metrics[scalar]")
+def _compute_metrics_scalar(fx):
+    k = _capped(fx)
+    args = [fx.inputs[c][:k].tolist() for c in ("initial_wt", "current_wt", "days", "feed_used")]
+
+    def run():
+        return [compute_metrics(i, c, d, f, 420.0, 45.0) for i, c, d, f in zip(*args)]
+    return run, k
+
+
+@case("metrics.compute_metrics[batch]")
+def _compute_metrics_batch(fx):
+    x = fx.inputs
+    return lambda: compute_metrics_batch(x["initial_wt"], x["current_wt"], x["days"], x["feed_used"],
+                                         x["price_per_kg"], x["feed_cost"], target_wt=x["target_wt"]), fx.n
+
+
+@case("metrics.estimate_days_to_target[scalar]")
+def _days_to_target_scalar(fx):
+    k = _capped(fx)
+    x = fx.inputs
+    current, target = x["current_wt"][:k].tolist(), x["target_wt"][:k].tolist()
+    adg = (x["current_wt"][:k] - x["initial_wt"][:k]) / np.maximum(x["days"][:k], 1)
+    adg = adg.tolist()
+    return lambda: [estimate_days_to_target(c, t, a) for c, t, a in zip(current, target, adg)], k
+
+
+@case("metrics.estimate_days_to_target[batch]")
+def _days_to_target_batch(fx):
+    x = fx.inputs
+    adg = (x["current_wt"] - x["initial_wt"]) / np.maximum(x["days"], 1)
+    return lambda: estimate_days_to_target_batch(x["current_wt"], x["target_wt"], adg), fx.n
+
+
+@case("metrics.compute_adg_from_timeseries[per-animal]")
+def _adg_per_animal(fx):
+    k = min(fx.n, ADG_LOOP_CAP)
+    w = fx.weigh_ins.iloc[:k * WEIGH_INS_PER_ANIMAL]
+    dates = (pd.Timestamp("2025-01-01") + pd.to_timedelta(w["day"], unit="D")).dt.date.to_numpy()
+    per_animal = [(dates[i:i + WEIGH_INS_PER_ANIMAL], w["weight"].to_numpy()[i:i + WEIGH_INS_PER_ANIMAL])
+                  for i in range(0, len(w), WEIGH_INS_PER_ANIMAL)]
+    return lambda: [compute_adg_from_timeseries(list(d), list(y)) for d, y in per_animal], k
+
+
+@case("metrics.compute_adg_grouped")
+def _adg_grouped(fx):
+    return lambda: compute_adg_grouped(fx.weigh_ins, date_col="day"), fx.n
+
+
+@case("dates.normalize_dates[herd Date]")
+def _normalize_dates(fx):
+    dates = pd.Series(fx.herd["Date"])
+    return lambda: normalize_dates(dates), fx.n
+
+
+@case("BioEngines.wood_model[array]")
+def _wood(fx):
+    day = np.random.default_rng(fx.seed).integers(1, 305, fx.n).astype(float)
+    return lambda: BioEngines.wood_model(day), fx.n
+
+
+@case("BioEngines.thi_index[array]")
+def _thi(fx):
+    rng = np.random.default_rng(fx.seed)
+    temp, humidity = rng.uniform(10, 40, fx.n), rng.uniform(10, 100, fx.n)
+    return lambda: BioEngines.thi_index(temp, humidity), fx.n
+
+
+@case("BioEngines.pearson_square[scalar]")
+def _pearson(fx):
+    k = _capped(fx)
+    rng = np.random.default_rng(fx.seed)
+    rows = list(zip(rng.uniform(12, 20, k).tolist(), rng.uniform(8, 12, k).tolist(), rng.uniform(30, 45, k).tolist()))
+    return lambda: [BioEngines.pearson_square(t, a, b) for t, a, b in rows], k
+
+
+@case("diagnostics.search[per query]")
+def _diagnose(fx):
+    # one index of SCALAR_CAP-capped synthetic conditions (8 of 2,000 signs each), 200 four-sign queries
+    rng = np.random.default_rng(fx.seed)
+    words = [f"sign{i}" for i in range(2000)]
+    index = DiagnosticIndex([{"condition": f"C{i}", "group": "G", "signs": "", "triage": "Red", "tx": None,
+                              "vax": None, "tokens": set(rng.choice(words, 8))} for i in range(_capped(fx))])
+    queries = [" ".join(rng.choice(words, 4)) for _ in range(200)]
+    return lambda: [index.search(q) for q in queries], len(queries)
+
+
+@case("app.dashboard[kpis+fetch]")
+def _dashboard(fx):
+    store = fx.store
+
+    def run():
+        kpi = store.aggregate({"roi": "SUM(Profit)", "adg": "AVG(ADG)", "fcr": "AVG(FCR)", "head": "COUNT(*)"})
+        return kpi, store.fetch()
+    return run, fx.n
+
+
+@case("app.log_table[styled full]")
+def _log_table_full(fx):
+    # the pre-pagination table: gradient over every record (rendered to HTML as a proxy for the Styler
+    # serialization Streamlit does)
+    k = min(fx.n, STYLER_CAP)
+    herd = fx.herd.iloc[:k]
+    return lambda: herd.style.background_gradient(cmap="YlGn").to_html(), k
+
+
+@case("app.log_table[paged]")
+def _log_table_paged(fx):
+    table = PagedTable(fx.store)
+    filters = (Filter("Species", "in", ("Beef", "Goat")),)
+    numeric = table.numeric_columns()
+
+    def run():
+        rows, total = table.page(TableQuery(filters=filters, sort="ADG", descending=True, page=3, per_page=50))
+        return style_page(rows, table.ranges(numeric, filters)).to_html(), total
+    return run, fx.n
+
+
+@case("app.sire_ranking")
+def _sire_ranking(fx):
+    store = fx.store
+
+    def run():
+        herd = store.fetch(["Sire", "Species", "Date", "ADG"])
+        ranking = SireEvaluation().evaluate(herd, trait="ADG", group_cols=("Species", "Date"))
+        profit = store.aggregate({"Profit": "SUM(Profit)"}, group_by=["Sire"]).set_index("Sire")["Profit"]
+        ranking["Profit"] = ranking["Sire"].map(profit)
+        return ranking
+    return run, fx.n
+
+
+@case("app.vaccination_schedule")
+def _vax(fx):
+    store = fx.store
+    return lambda: VaxSchedule.from_animals(store.fetch(["ID", "Species", "Date"]), SPECIES_METRICS), fx.n
+
+
+@case("new_app.forecast_totals[7d]")
+def _forecast(fx):
+    rng = np.random.default_rng(fx.seed)
+    dim = rng.integers(1, 305, fx.n)
+    routes = np.array([f"AEG-TRUCK-{i:02d}" for i in range(12)])[rng.integers(0, 12, fx.n)]
+    return lambda: forecast_totals(dim, 7, routes=routes), fx.n
+
+
+@case("instrumentation.timed[disabled]")
+def _timed_disabled(fx):
+    return _timed_overhead(fx, enabled=False)
+
+
+@case("instrumentation.timed[enabled]")
+def _timed_enabled(fx):
+    return _timed_overhead(fx, enabled=True)
+
+
+def _timed_overhead(fx, enabled):
+    # wrapper cost per call on a trivial function, against a private registry
+    k = _capped(fx)
+    registry = Instrumentation(enabled=enabled)
+    fn = registry.timed("noop")(lambda x: x)
+    return lambda: [fn(i) for i in range(k)], k
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_suite(sizes=DEFAULT_SIZES, repeat: int = 3, seed: int = 42,
+              only: Optional[List[str]] = None, log=print, instrumented: bool = False) -> dict:
+    """Time every registered case (or those whose name contains one of `only`) at each size."""
+    results = {}
+    was_enabled, INSTRUMENTS.enabled = INSTRUMENTS.enabled, instrumented
+    try:
+        _run_sizes(sizes, repeat, seed, only, log, results)
+    finally:
+        INSTRUMENTS.enabled = was_enabled
+    return {
+        "meta": {"created": datetime.now().isoformat(timespec="seconds"), "seed": seed, "repeat": repeat,
+                 "instrumented": instrumented, "python": platform.python_version(), "numpy": np.__version__,
+                 "pandas": pd.__version__, "machine": platform.machine()},
+        "results": results,
+    }
+
+
+def _run_sizes(sizes, repeat, seed, only, log, results) -> None:
+    for n in sizes:
+        fx = Fixture(n, seed)
+        try:
+            for name, setup in CASES.items():
+                if only and not any(o in name for o in only):
+                    continue
+                fn, items = setup(fx)
+                seconds = best_of(fn, repeat)
+                results[f"{name}@{n}"] = {"case": name, "size": n, "items": items, "seconds": seconds}
+                log(f"{name:<48}{n:>10,}{items:>10,}{seconds:>12.4f}")
+        finally:
+            fx.close()
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.2, noise_floor: float = NOISE_FLOOR) -> pd.DataFrame:
+    """
+    Per-case ratio of current to baseline seconds for cases present in both
+    runs with the same item count. 'regression' is set where the ratio
+    exceeds 1 + threshold and the slowdown is above noise_floor seconds.
+    """
+    rows = []
+    for key, new in current["results"].items():
+        old = baseline["results"].get(key)
+        if old is None or old["items"] != new["items"]:
+            continue
+        ratio = new["seconds"] / old["seconds"] if old["seconds"] > 0 else float("inf")
+        rows.append({"benchmark": key, "baseline": old["seconds"], "current": new["seconds"], "ratio": ratio,
+                     "regression": ratio > 1 + threshold and new["seconds"] - old["seconds"] > noise_floor})
+    return pd.DataFrame(rows, columns=["benchmark", "baseline", "current", "ratio", "regression"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="*", help="run cases whose name contains any of these")
+    parser.add_argument("--instrumented", action="store_true", help="keep instrumentation spans on while timing")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 = 20%%")
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<48}{'herd':>10}{'items':>10}{'best (s)':>12}")
+    current = run_suite(args.sizes, args.repeat, args.seed, args.only, instrumented=args.instrumented)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"saved {len(current['results'])} timings to {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            report = compare(json.load(f), current, args.threshold)
+        print()
+        print(report.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+        regressed = report[report["regression"]]
+        if len(regressed):
+            print(f"\n{len(regressed)} regression(s) above {args.threshold:.0%}")
+            return 1
+        print(f"\nno regressions above {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Deterministic synthetic herds for the benchmark suite.
+
+Everything is drawn from one numpy Generator seeded by the caller, so the
+same (n, seed) always yields identical frames on any machine.
+"""
+import numpy as np
+import pandas as pd
+
+SPECIES = np.array(["Beef", "Pig", "Goat", "Sheep"])
+PREFIX = {"Beef": "BE", "Pig": "PI", "Goat": "GO", "Sheep": "SH"}
+WEIGHT_RANGE = {"Beef": (180, 650), "Pig": (20, 140), "Goat": (12, 70), "Sheep": (15, 80)}
+SIRES = 400
+BASE_DATE = np.datetime64("2025-01-01")
+
+
+def synthetic_herd(n: int, seed: int = 42) -> pd.DataFrame:
+    """n app.py herd records (RECORD_SCHEMA columns)."""
+    rng = np.random.default_rng(seed)
+    species = SPECIES[rng.integers(0, len(SPECIES), n)]
+    lo = pd.Series(species).map({s: r[0] for s, r in WEIGHT_RANGE.items()}).to_numpy(dtype=float)
+    hi = pd.Series(species).map({s: r[1] for s, r in WEIGHT_RANGE.items()}).to_numpy(dtype=float)
+    sire = rng.integers(1, SIRES + 1, n)
+    sire_effect = rng.normal(0, 0.05, SIRES + 1)[sire]
+    adg = np.clip(rng.normal(0.5, 0.2, n) + sire_effect, 0.02, None)
+    manure = rng.uniform(10, 4000, n)
+    ids = pd.Series(species).map(PREFIX).to_numpy(dtype=object) + pd.Series(np.arange(n)).map("{:07d}".format).to_numpy(dtype=object)
+    return pd.DataFrame({
+        "ID": "AEG-" + ids,
+        "Species": species,
+        "Sire": pd.Series(sire).map("UoN-BULL-{:03d}".format).to_numpy(),
+        "ADG": adg,
+        "Profit": rng.uniform(-5e3, 9e4, n),
+        "Manure": manure,
+        "Biogas": manure * rng.uniform(0.04, 0.06, n),
+        "CH4": rng.uniform(0.1, 60, n),
+        "FCR": rng.uniform(1.5, 9, n),
+        "Date": (BASE_DATE + rng.integers(0, 365, n).astype("timedelta64[D]")).astype(str),
+        "Weight": rng.uniform(lo, hi),
+    })
+
+
+def synthetic_weigh_ins(n_animals: int, per_animal: int = 4, seed: int = 42) -> pd.DataFrame:
+    """
+    per_animal weighings for each of n_animals (integer animal_id), a week
+    or more apart, with a per-animal true ADG plus scale noise; columns
+    ['animal_id', 'day', 'weight', 'feed'] with day as days since 2025-01-01.
+    """
+    rng = np.random.default_rng(seed)
+    animal = np.repeat(np.arange(n_animals), per_animal)
+    gaps = rng.integers(7, 21, (n_animals, per_animal))
+    gaps[:, 0] = rng.integers(0, 60, n_animals)
+    day = np.cumsum(gaps, axis=1).ravel().astype(float)
+    start = np.repeat(rng.uniform(20, 400, n_animals), per_animal)
+    true_adg = np.repeat(np.clip(rng.normal(0.6, 0.2, n_animals), 0.05, None), per_animal)
+    weight = start + true_adg * day + rng.normal(0, 1.5, day.shape)
+    return pd.DataFrame({
+        "animal_id": animal,
+        "day": day,
+        "weight": weight,
+        "feed": rng.uniform(2, 12, day.shape) * 7,
+    })
@@ -0,0 +1,40 @@
+"""
+bio_engines.py
+Scientific logic engines shared by new_app.py and the batch/analytics modules.
+"""
+import numpy as np
+
+from instrumentation import timed
+
+
+class BioEngines:
+    @staticmethod
+    @timed("BioEngines.pearson_square")
+    def pearson_square(target_cp, f1_cp, f2_cp):
+        if not (min(f1_cp, f2_cp) < target_cp < max(f1_cp, f2_cp)):
+            return None
+        p1 = abs(f2_cp - target_cp)
+        p2 = abs(f1_cp - target_cp)
+        return (p1/(p1+p2))*100, (p2/(p1+p2))*100
+
+    @staticmethod
+    @timed("BioEngines.pearson_square_batch")
+    def pearson_square_batch(target_cp, f1_cp, f2_cp):
+        # pearson_square over arrays: (f1 %, f2 %), NaN where the target is not strictly between the feeds
+        t, f1, f2 = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (target_cp, f1_cp, f2_cp)))
+        ok = (np.minimum(f1, f2) < t) & (t < np.maximum(f1, f2))
+        p1, p2 = np.abs(f2 - t), np.abs(f1 - t)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(ok, (p1/(p1+p2))*100, np.nan), np.where(ok, (p2/(p1+p2))*100, np.nan)
+
+    @staticmethod
+    @timed("BioEngines.wood_model")
+    def wood_model(day, a=22, b=0.2, c=0.04):
+        # Y(t) = at^b * e^-ct (Biological Lactation Curve)
+        return a * (day**b) * np.exp(-c * day)
+
+    @staticmethod
+    @timed("BioEngines.thi_index")
+    def thi_index(temp, humidity):
+        # Temperature Humidity Index for Heat Stress
+        return (0.8 * temp) + ((humidity/100) * (temp - 14.4)) + 46.4
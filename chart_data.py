@@ -0,0 +1,154 @@
+"""
+chart_data.py
+Server-side aggregation and downsampling for the apps' Altair charts.
+
+Altair embeds the chart's rows in the Vega-Lite spec shipped to the browser,
+so charts are fed summaries sized by the display, not by the herd:
+binned histograms, per-group summaries capped to the top groups, and
+time series reduced with Largest-Triangle-Three-Buckets (LTTB), which keeps
+the visual shape (peaks, troughs, endpoints) of a line at a fixed point
+budget. Every helper returns at most MAX_POINTS rows.
+"""
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from dates import parse_dates
+
+MAX_POINTS = 1000
+DEFAULT_BINS = 30
+UNKNOWN_GROUP = "Unknown"
+
+
+def histogram(values,
+              bins: int = DEFAULT_BINS,
+              by=None,
+              value_range: Optional[Sequence[float]] = None) -> pd.DataFrame:
+    """
+    Counts of `values` in equal-width bins shared by every group.
+
+    Returns ['bin_start', 'bin_end', 'count'] (plus 'group' when `by` is
+    given, one row per non-empty group x bin). NaN values are dropped;
+    values with a missing group label are counted under UNKNOWN_GROUP.
+    """
+    values = np.asarray(values, dtype=float)
+    keep = ~np.isnan(values)
+    values = values[keep]
+    if value_range is None:
+        value_range = (values.min(), values.max()) if len(values) else (0.0, 1.0)
+    lo, hi = map(float, value_range)
+    if hi <= lo:
+        hi = lo + 1.0
+    edges = np.linspace(lo, hi, bins + 1)
+    idx = np.clip(((values - lo) / (hi - lo) * bins).astype(np.int64), 0, bins - 1)
+    inside = (values >= lo) & (values <= hi)
+    idx = idx[inside]
+
+    if by is None:
+        counts = np.bincount(idx, minlength=bins)
+        return pd.DataFrame({"bin_start": edges[:-1], "bin_end": edges[1:], "count": counts})
+
+    labels = np.asarray(by, dtype=object)[keep][inside]
+    labels = np.where(pd.isna(labels), UNKNOWN_GROUP, labels)
+    codes, groups = pd.factorize(labels, sort=True)
+    counts = np.bincount(codes * bins + idx, minlength=len(groups) * bins).reshape(len(groups), bins)
+    g, b = np.nonzero(counts)
+    return pd.DataFrame({"group": groups[g], "bin_start": edges[b], "bin_end": edges[b + 1], "count": counts[g, b]})
+
+
+def group_summary(df: pd.DataFrame,
+                  by: str,
+                  value: str,
+                  top: Optional[int] = MAX_POINTS,
+                  sort_by: str = "mean") -> pd.DataFrame:
+    """
+    One row per `by` group: ['count', 'mean', 'min', 'max'] of `value`,
+    ordered by `sort_by` descending and cut to the `top` groups.
+    """
+    out = (df.groupby(by, sort=False)[value]
+           .agg(["count", "mean", "min", "max"])
+           .sort_values(sort_by, ascending=False))
+    if top is not None:
+        out = out.head(top)
+    return out.reset_index()
+
+
+def lttb(x, y, threshold: int) -> np.ndarray:
+    """
+    Indices of `threshold` points chosen by Largest-Triangle-Three-Buckets.
+    x must be sorted ascending. Returns every index when the series already
+    fits (or threshold < 3). The first and last points are always kept.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # inner buckets 0..threshold-3 split points 1..n-2; bucket i is [starts[i], starts[i+1])
+    starts = (np.floor(np.arange(threshold - 1) * ((n - 2) / (threshold - 2))) + 1).astype(np.int64)
+    starts[-1] = n - 1
+    sizes = np.diff(starts)
+    avg_x = np.add.reduceat(x[:n - 1], starts[:-1]) / sizes
+    avg_y = np.add.reduceat(y[:n - 1], starts[:-1]) / sizes
+    # the "next" average for the last inner bucket is the final point
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    out = np.empty(threshold, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        s, e = starts[i], starts[i + 1]
+        xa, ya = x[a], y[a]
+        area = np.abs((xa - next_x[i]) * (y[s:e] - ya) - (xa - x[s:e]) * (next_y[i] - ya))
+        a = s + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def downsample_series(df: pd.DataFrame,
+                      x: str,
+                      y: str,
+                      by: Optional[str] = None,
+                      max_points: int = MAX_POINTS) -> pd.DataFrame:
+    """
+    Sort by x and LTTB-reduce y to at most max_points rows in total. With
+    `by`, each group is reduced separately: it gets 3 points (so its line
+    keeps both ends) plus a share of the rest proportional to its size. Only
+    the max_points // 3 largest groups fit that budget; smaller ones are dropped.
+    """
+    frame = df[[c for c in (by, x, y) if c]].dropna()
+    if len(frame) <= max_points:
+        return frame.sort_values([c for c in (by, x) if c], kind="stable", ignore_index=True)
+    groups = [(None, frame)] if by is None else list(frame.groupby(by, sort=True))
+    if len(groups) > max_points // 3:
+        largest = sorted(range(len(groups)), key=lambda i: -len(groups[i][1]))[:max_points // 3]
+        groups = [groups[i] for i in sorted(largest)]
+    kept = sum(len(part) for _, part in groups)
+    spare = max_points - 3 * len(groups)
+    parts = []
+    for _, part in groups:
+        part = part.sort_values(x, kind="stable")
+        budget = 3 + int(spare * len(part) / kept)
+        xs = part[x]
+        xv = (xs.astype("int64") if pd.api.types.is_datetime64_any_dtype(xs) else xs).to_numpy(dtype=float)
+        parts.append(part.iloc[lttb(xv, part[y].to_numpy(dtype=float), budget)])
+    return pd.concat(parts, ignore_index=True)
+
+
+def daily_series(df: pd.DataFrame,
+                 date: str,
+                 value: str,
+                 by: Optional[str] = None,
+                 agg: str = "mean",
+                 max_points: int = MAX_POINTS) -> pd.DataFrame:
+    """
+    Per-day aggregate of `value` (optionally per `by` group), with `date`
+    parsed to datetimes and the result downsampled to max_points rows.
+    """
+    frame = df[[c for c in (by, date, value) if c]].copy()
+    frame[date] = parse_dates(frame[date], errors="coerce").dt.normalize()
+    daily = frame.groupby([c for c in (by, date) if c], sort=True)[value].agg(agg).reset_index()
+    return downsample_series(daily, date, value, by=by, max_points=max_points)
@@ -0,0 +1,207 @@
+"""
+dates.py
+Date-column normalization for weigh-in files, herd logs and chart inputs.
+
+Columns repeat the same few hundred date strings across millions of rows, so
+each column is factorized, only its unique values are parsed, and the result
+is mapped back by code. The format is detected once per column (the first
+candidate that parses every unique value) and then applied strictly, instead
+of pandas inferring per call. Numeric-day columns, including numbers stored
+as text, are recognized up front rather than by a failed datetime parse.
+"""
+import re
+import warnings
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+# tried after pandas' own guess (month-first, then day-first) for the first value
+DATE_FORMATS = (
+    "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y/%m/%d",
+    "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y", "%d.%m.%Y", "%Y%m%d",
+)
+SAMPLE_ROWS = 10_000        # strided sample used to estimate a column's cardinality
+_NUMBER = r"\s*[-+]?(\d+\.?\d*|\.\d+)\s*"
+_NUMBER_RE = re.compile(_NUMBER)
+_YYYYMMDD = r"(19|20)\d{6}"
+
+
+def _uniques(series: pd.Series):
+    codes, uniques = pd.factorize(series)
+    return codes, pd.Index(uniques)
+
+
+def _sample(series: pd.Series) -> pd.Series:
+    return series.iloc[::max(1, len(series) // SAMPLE_ROWS)]
+
+
+def _mostly_unique(series: pd.Series) -> bool:
+    # factorizing millions of distinct strings costs more than parsing them directly
+    return len(series) > 4 * SAMPLE_ROWS and _sample(series).nunique() > SAMPLE_ROWS // 2
+
+
+def _strict(format: Optional[str]) -> Optional[str]:
+    # pandas' ISO 8601 parser is faster than strptime with the equivalent format
+    return "ISO8601" if format and format.startswith("%Y-%m-%d") else format
+
+
+def _all_strings(uniques: pd.Index) -> bool:
+    return pd.api.types.is_string_dtype(uniques) and all(isinstance(v, str) for v in uniques[:100])
+
+
+def _guesses(first: str, candidates: Sequence[str]) -> List[str]:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)    # both day orders are tried on purpose
+        guesses = [guess_datetime_format(first), guess_datetime_format(first, dayfirst=True), *candidates]
+    return list(dict.fromkeys(g for g in guesses if g is not None))
+
+
+def _detect(values: pd.Index, candidates: Sequence[str]):
+    """(format, parsed values) for the first format that parses every value, else (None, None)."""
+    values = values.dropna()
+    if not len(values):
+        return None, None
+    for fmt in _guesses(str(values[0]), candidates):
+        parsed = pd.to_datetime(values, format=fmt, errors="coerce")
+        if not parsed.isna().any():
+            return fmt, parsed
+    return None, None
+
+
+def detect_format(values: Sequence[str], candidates: Sequence[str] = DATE_FORMATS) -> Optional[str]:
+    """
+    First strptime format that parses every value (None if none does).
+    pandas' guess from the first value is tried before `candidates`.
+    """
+    return _detect(pd.Index(values), candidates)[0]
+
+
+def fitting_formats(values: Sequence[str], formats: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    Every format that parses all of `values`, in order. formats defaults to
+    pandas' guesses from the first value followed by DATE_FORMATS; passing the
+    previous result back in narrows it chunk by chunk, so a day-first file
+    whose first chunk only has days <= 12 is still read day-first.
+    """
+    values = pd.Index(values).dropna()
+    if not len(values):
+        return list(formats) if formats is not None else []
+    if formats is None:
+        formats = _guesses(str(values[0]), DATE_FORMATS)
+    fitting, seen = [], set()
+    for fmt in formats:
+        if _strict(fmt) in seen:    # the ISO variants parse identically
+            continue
+        seen.add(_strict(fmt))
+        if not pd.to_datetime(values, format=_strict(fmt), errors="coerce").isna().any():
+            fitting.append(fmt)
+    return fitting
+
+
+def is_numeric_days(series: pd.Series) -> bool:
+    """True for numeric columns and for text columns holding only numbers (not YYYYMMDD dates)."""
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+        return False
+    if pd.api.types.is_numeric_dtype(series):
+        return True
+    return _numeric_uniques(_uniques(series)[1])
+
+
+def _numeric_uniques(uniques: pd.Index) -> bool:
+    if not len(uniques):
+        return False
+    # object columns of plain numbers (e.g. built from Python lists) are numeric days too
+    if pd.api.types.infer_dtype(uniques, skipna=True) in ("integer", "floating", "mixed-integer-float"):
+        return True
+    if not _all_strings(uniques) or not _NUMBER_RE.fullmatch(uniques[0]):
+        return False
+    text = pd.Series(uniques, dtype="string")
+    if not text.str.fullmatch(_NUMBER).all():
+        return False
+    # 20240315 is a date to pandas and to every export we get, not day twenty million
+    yyyymmdd = text.str.fullmatch(_YYYYMMDD).all()
+    return not (yyyymmdd and pd.to_datetime(uniques, format="%Y%m%d", errors="coerce").notna().all())
+
+
+def _parse(series: pd.Series, codes: np.ndarray, uniques: pd.Index, format: Optional[str], errors: str) -> pd.Series:
+    parsed = None
+    if format is None and _all_strings(uniques):
+        format, parsed = _detect(uniques, DATE_FORMATS)
+        format = format or "mixed"
+    if parsed is None:
+        parsed = pd.to_datetime(uniques, format=_strict(format), errors=errors)
+    return pd.Series(parsed.take(codes, allow_fill=True, fill_value=pd.NaT), index=series.index, name=series.name)
+
+
+def _parse_direct(series: pd.Series, format: Optional[str], errors: str) -> pd.Series:
+    if format is None:
+        uniques = pd.Index(_sample(series).dropna().unique())
+        format = (detect_format(uniques) if _all_strings(uniques) else None) or "mixed"
+    try:
+        return pd.to_datetime(series, format=_strict(format), errors=errors, cache=False)
+    except ValueError:
+        if format == "mixed":
+            raise
+        # a value outside the sample breaks the detected format
+        return pd.to_datetime(series, format="mixed", errors=errors, cache=False)
+
+
+def parse_dates(series: pd.Series, format: Optional[str] = None, errors: str = "raise") -> pd.Series:
+    """
+    pd.to_datetime(series) computed on the unique values only. The format is
+    detected when not given; columns no single format fits are parsed as
+    format="mixed". errors is passed to pd.to_datetime ("raise" / "coerce").
+    """
+    series = pd.Series(series)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    if _mostly_unique(series):
+        return _parse_direct(series, format, errors)
+    codes, uniques = _uniques(series)
+    return _parse(series, codes, uniques, format, errors)
+
+
+def normalize_dates(series: pd.Series) -> pd.Series:
+    """
+    Numeric days (numbers stored as text become floats) or parsed datetimes.
+    A text column that is neither is returned unchanged.
+    """
+    series = pd.Series(series)
+    if pd.api.types.is_datetime64_any_dtype(series) or \
+            (pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)):
+        return series
+    if _mostly_unique(series):
+        if _numeric_uniques(pd.Index(_sample(series).dropna().unique())):
+            try:
+                return pd.to_numeric(series).astype(float)
+            except (ValueError, TypeError):
+                pass
+        try:
+            return _parse_direct(series, None, "raise")
+        except (ValueError, TypeError):
+            return series
+    codes, uniques = _uniques(series)
+    if _numeric_uniques(uniques):
+        values = np.append(pd.to_numeric(uniques).to_numpy(dtype=float), np.nan)
+        return pd.Series(values[codes], index=series.index, name=series.name)
+    try:
+        return _parse(series, codes, uniques, None, "raise")
+    except (ValueError, TypeError):
+        return series
+
+
+def day_values(series: pd.Series) -> np.ndarray:
+    """Float days: numeric input as-is, dates as days since the Unix epoch (NaN for missing)."""
+    values = normalize_dates(series)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=float)
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        raise ValueError(f"cannot read {values.name or 'column'!r} as dates or numeric days")
+    if getattr(values.dt, "tz", None) is not None:
+        values = values.dt.tz_convert("UTC").dt.tz_localize(None)
+    ns = values.to_numpy(dtype="datetime64[ns]")
+    out = ns.astype(np.int64) / (86_400 * 10 ** 9)
+    out[np.isnat(ns)] = np.nan
+    return out
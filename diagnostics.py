@@ -0,0 +1,183 @@
+"""
+diagnostics.py
+Multi-sign diagnostic search over the clinical knowledge bases.
+
+DiagnosticIndex is an inverted index from sign tokens to conditions, built
+once from CLINICAL_MASTER_DB (signs text per condition) and SYMPTOM_MATRIX
+(presenting sign -> differentials). A query scores every condition with one
+bincount over the postings of its tokens, so lookups stay well under a
+millisecond for libraries of thousands of conditions.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+TRIAGE_RANK = {"Red": 0, "Yellow": 1, "Green": 2}
+_STOPWORDS = frozenset("a an and at for in of on or post the to with".split())
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens with stopwords dropped and a light plural stem."""
+    out = []
+    for tok in _TOKEN.findall(text.lower()):
+        if tok in _STOPWORDS or len(tok) < 2:
+            continue
+        if len(tok) > 4 and tok.endswith("s") and not tok.endswith("ss"):
+            tok = tok[:-1]
+        out.append(tok)
+    return out
+
+
+def _name_key(name: str) -> str:
+    return " ".join(tokenize(name))
+
+
+def _aliases(name: str) -> List[str]:
+    """'East Coast Fever (ECF)' -> ['east coast fever', 'ecf']."""
+    base = re.sub(r"\(.*?\)", " ", name)
+    return [k for k in [_name_key(base)] + [_name_key(p) for p in re.findall(r"\((.*?)\)", name)] if k]
+
+
+@dataclass
+class Match:
+    condition: str
+    group: str
+    score: float
+    matched: List[str] = field(default_factory=list)
+    triage: Optional[str] = None
+    tx: Optional[str] = None
+    vax: Optional[str] = None
+    signs: str = ""
+
+
+class DiagnosticIndex:
+    """
+    Conditions with their sign tokens, plus token -> condition postings.
+
+    A condition's score for a query is the IDF-weighted share of the query's
+    known tokens that appear in its signs, in [0, 1]. Ties rank by triage
+    (Red first), then name.
+    """
+
+    def __init__(self, conditions: List[dict]):
+        self.conditions = conditions
+        vocab: Dict[str, int] = {}
+        rows, cols = [], []
+        for i, cond in enumerate(conditions):
+            for tok in sorted(cond["tokens"]):
+                rows.append(vocab.setdefault(tok, len(vocab)))
+                cols.append(i)
+        self.vocab = vocab
+        term = np.asarray(rows, dtype=np.int64)
+        cond_ids = np.asarray(cols, dtype=np.int64)
+        order = np.argsort(term, kind="stable")
+        self._postings = cond_ids[order]
+        self._offsets = np.searchsorted(term[order], np.arange(len(vocab) + 1))
+        df = np.diff(self._offsets)
+        self._idf = np.log1p(len(conditions) / np.maximum(df, 1))
+        triage = np.array([TRIAGE_RANK.get(c.get("triage"), len(TRIAGE_RANK)) for c in conditions])
+        # static tie-break order: triage severity, then name
+        names = np.array([c["condition"] for c in conditions], dtype=object)
+        self._tiebreak = np.empty(len(conditions), dtype=np.int64)
+        self._tiebreak[np.lexsort((names, triage))] = np.arange(len(conditions))
+
+    def __len__(self):
+        return len(self.conditions)
+
+    @classmethod
+    def from_knowledge_bases(cls,
+                             clinical_db: Optional[Dict[str, Dict[str, dict]]] = None,
+                             symptom_matrix: Optional[Dict[str, List[str]]] = None) -> "DiagnosticIndex":
+        """
+        Merge both knowledge bases. SYMPTOM_MATRIX differentials are matched
+        to clinical conditions by name or parenthesised alias ('FMD',
+        'East Coast Fever', 'Lumpy Skin Disease'); unmatched ones become
+        conditions of their own in the 'Symptom Matrix' group.
+        """
+        conditions, by_alias = [], {}
+        for group, entries in (clinical_db or {}).items():
+            for name, info in entries.items():
+                cond = {"condition": name, "group": group, "signs": info.get("signs", ""),
+                        "triage": info.get("triage"), "tx": info.get("tx"), "vax": info.get("vax"),
+                        "tokens": set(tokenize(info.get("signs", "")))}
+                conditions.append(cond)
+                for alias in _aliases(name):
+                    by_alias.setdefault(alias, cond)
+        for sign, differentials in (symptom_matrix or {}).items():
+            for name in differentials:
+                cond = cls._resolve(_name_key(name), by_alias)
+                if cond is None:
+                    cond = {"condition": name, "group": "Symptom Matrix", "signs": "",
+                            "triage": None, "tx": None, "vax": None, "tokens": set()}
+                    conditions.append(cond)
+                    by_alias[_name_key(name)] = cond
+                cond["signs"] = ", ".join(s for s in (cond["signs"], sign) if s)
+                cond["tokens"].update(tokenize(sign))
+        return cls(conditions)
+
+    @staticmethod
+    def _resolve(key: str, by_alias: Dict[str, dict]) -> Optional[dict]:
+        if key in by_alias:
+            return by_alias[key]
+        # 'lumpy skin disease' -> alias 'lumpy skin'
+        words = key.split()
+        for n in range(len(words) - 1, 1, -1):
+            hit = by_alias.get(" ".join(words[:n]))
+            if hit is not None:
+                return hit
+        return None
+
+    def _scores(self, tokens: List[str]) -> Tuple[np.ndarray, List[str]]:
+        known = [t for t in dict.fromkeys(tokens) if t in self.vocab]
+        scores = np.zeros(len(self.conditions))
+        if not known:
+            return scores, known
+        ids = np.fromiter((self.vocab[t] for t in known), dtype=np.int64, count=len(known))
+        lo, hi = self._offsets[ids], self._offsets[ids + 1]
+        lengths = hi - lo
+        postings = np.concatenate([self._postings[a:b] for a, b in zip(lo, hi)])
+        weights = np.repeat(self._idf[ids], lengths)
+        scores = np.bincount(postings, weights, len(self.conditions)) / self._idf[ids].sum()
+        return scores, known
+
+    def search(self, signs: Union[str, Iterable[str]], top: int = 10, min_score: float = 0.0) -> List[Match]:
+        """
+        Conditions ranked by match against the observed signs (free text or
+        a list of sign phrases). Only conditions sharing at least one token
+        with the query are returned.
+        """
+        text = signs if isinstance(signs, str) else " ".join(signs)
+        tokens = tokenize(text)
+        scores, known = self._scores(tokens)
+        hits = np.flatnonzero(scores > max(min_score, 0.0))
+        if not len(hits) or top < 1:
+            return []
+        if len(hits) > top:
+            # top-k by score without sorting every hit
+            keep = np.argpartition(-scores[hits], top - 1)[:top]
+            cutoff = scores[hits][keep].min()
+            hits = hits[scores[hits] >= cutoff]
+        hits = hits[np.lexsort((self._tiebreak[hits], -scores[hits]))][:top]
+        query = set(known)
+        out = []
+        for i in hits:
+            cond = self.conditions[i]
+            out.append(Match(condition=cond["condition"], group=cond["group"], score=float(scores[i]),
+                             matched=sorted(query & cond["tokens"]), triage=cond["triage"],
+                             tx=cond["tx"], vax=cond["vax"], signs=cond["signs"]))
+        return out
+
+    def search_frame(self, signs: Union[str, Iterable[str]], top: int = 10) -> pd.DataFrame:
+        """search() as a DataFrame for display."""
+        columns = ["condition", "group", "score", "matched", "triage", "tx", "vax"]
+        return pd.DataFrame([{c: getattr(m, c) for c in columns} for m in self.search(signs, top)],
+                            columns=columns)
+
+    def sign_vocabulary(self) -> List[str]:
+        """Distinct sign phrases across the library, for multiselect widgets."""
+        phrases = {p.strip() for c in self.conditions for p in c["signs"].split(",") if p.strip()}
+        return sorted(phrases, key=str.lower)
@@ -0,0 +1,68 @@
+"""
+frame_cache.py
+LRU memo for herd DataFrames and per-page aggregates, keyed on the store's
+data version so Streamlit reruns that did not change the herd (language
+toggle, menu clicks) reuse the frames built last time.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class FrameCache:
+    """
+    Thread-safe LRU of computed values keyed by (name, version, *params).
+
+    When a newer data version is seen, entries from older versions are
+    dropped at once rather than waiting for LRU eviction.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, name: str, version: int, compute: Callable[[], Any], *params: Hashable) -> Any:
+        key = (name, version) + params
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+        # computed outside the lock; two sessions racing on a miss both compute, last write wins
+        value = compute()
+        with self._lock:
+            if self._version is None or version > self._version:
+                stale = [k for k in self._entries if k[1] < version]
+                for k in stale:
+                    del self._entries[k]
+                self.evictions += len(stale)
+                self._version = version
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,275 @@
+"""
+heat_stress.py
+Station-scale heat-stress analytics on hourly temperature / humidity series.
+
+Series are (stations × hours) NumPy arrays; THI is BioEngines.thi_index
+applied elementwise. HeatStressAccumulator folds consecutive hourly blocks
+in, carrying the rolling-window tail and the current night across block
+boundaries, so a year of station logs streams through in bounded memory.
+
+Hours are identified by an integer clock hour (hours since the Unix epoch,
+in the stations' local time) so that hour-of-day is clock % 24.
+"""
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# THI at which mild heat stress begins (commonly cited onset values)
+SPECIES_THI_THRESHOLDS = {
+    "Dairy": 68.0, "Beef": 72.0, "Pig": 74.0, "Poultry": 70.0, "Sheep": 76.0, "Goat": 78.0,
+}
+HEAT_LOAD_WINDOW = 24
+NIGHT_HOURS = (21, 5)          # 21:00 to 05:00
+RECOVERY_HOURS = 6             # cool night hours needed to dissipate the day's heat
+
+
+def thi(temp, humidity) -> np.ndarray:
+    """Vectorized BioEngines.thi_index; arguments broadcast, NaN propagates."""
+    temp = np.asarray(temp, dtype=float)
+    humidity = np.asarray(humidity, dtype=float)
+    return 0.8 * temp + (humidity / 100) * (temp - 14.4) + 46.4
+
+
+def _excess(thi_values: np.ndarray, threshold: float) -> np.ndarray:
+    """THI degrees above threshold, 0 where below or missing."""
+    with np.errstate(invalid="ignore"):
+        return np.where(thi_values > threshold, thi_values - threshold, 0.0)
+
+
+def rolling_heat_load(thi_values, threshold: float, window: int = HEAT_LOAD_WINDOW) -> np.ndarray:
+    """
+    THI-degree-hours above threshold over the trailing `window` hours
+    (last axis), via one cumulative sum; the first window-1 hours use the
+    partial window.
+    """
+    c = np.cumsum(_excess(np.asarray(thi_values, dtype=float), threshold), axis=-1)
+    out = c.copy()
+    out[..., window:] -= c[..., :-window]
+    return out
+
+
+def hours_above(thi_values, thresholds: Dict[str, float] = SPECIES_THI_THRESHOLDS) -> pd.DataFrame:
+    """Hours above each species threshold, one row per station (first axis)."""
+    thi_values = np.atleast_2d(np.asarray(thi_values, dtype=float))
+    with np.errstate(invalid="ignore"):
+        return pd.DataFrame({name: (thi_values > t).sum(axis=1) for name, t in thresholds.items()})
+
+
+def _in_night(hod: np.ndarray, night: Tuple[int, int]) -> np.ndarray:
+    start, end = night
+    if start > end:
+        return (hod >= start) | (hod < end)
+    return (hod >= start) & (hod < end)
+
+
+class HeatStressAccumulator:
+    """
+    Running per-station heat-stress summary over consecutive hourly blocks.
+
+    threshold drives heat load and night recovery (the herd's species);
+    species_thresholds are all counted as hours-above. A night counts as
+    recovered when at least recovery_hours of its hours are below threshold.
+    Stations may appear part-way through; blocks must not go back in time,
+    and gaps between blocks are treated as missing readings.
+    """
+
+    def __init__(self,
+                 threshold: float = SPECIES_THI_THRESHOLDS["Beef"],
+                 species_thresholds: Dict[str, float] = SPECIES_THI_THRESHOLDS,
+                 window: int = HEAT_LOAD_WINDOW,
+                 night: Tuple[int, int] = NIGHT_HOURS,
+                 recovery_hours: int = RECOVERY_HOURS):
+        self.threshold = threshold
+        self.species = dict(species_thresholds)
+        self.window = window
+        self.night = night
+        self.recovery_hours = recovery_hours
+        self._night_len = (night[1] - night[0]) % 24 or 24
+        self._ids = pd.Index([], dtype=object)
+        self.next_hour: Optional[int] = None
+        self._pending_night: Optional[int] = None
+        self._a: Dict[str, np.ndarray] = {}
+        self._grow(0)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _grow(self, extra: int) -> None:
+        fills = {"hours": 0.0, "thi_sum": 0.0, "thi_max": np.nan, "load_max": 0.0, "load": 0.0,
+                 "nights": 0.0, "recovered": 0.0, "pending_cool": 0.0, "pending_valid": 0.0}
+        for name, fill in fills.items():
+            self._a[name] = np.concatenate([self._a.get(name, np.empty(0)), np.full(extra, fill)])
+        self._a["above"] = np.vstack([self._a.get("above", np.empty((0, len(self.species)))),
+                                      np.zeros((extra, len(self.species)))])
+        self._a["tail"] = np.vstack([self._a.get("tail", np.empty((0, self.window - 1))),
+                                     np.zeros((extra, self.window - 1))])
+
+    def _codes(self, stations) -> np.ndarray:
+        labels = pd.Index(np.asarray(stations, dtype=object))
+        pos = self._ids.get_indexer(labels)
+        new = pos < 0
+        if new.any():
+            fresh = labels[new].unique()
+            self._ids = self._ids.append(pd.Index(fresh, dtype=object))
+            self._grow(len(fresh))
+            pos = self._ids.get_indexer(labels)
+        return pos
+
+    def update(self, stations, start_hour: int, temp, humidity) -> None:
+        """
+        Fold in one block: temp / humidity are (len(stations), hours) arrays
+        whose column 0 is clock hour start_hour. Stations missing from the
+        block are treated as having no readings for its hours.
+        """
+        temp = np.atleast_2d(np.asarray(temp, dtype=float))
+        humidity = np.atleast_2d(np.asarray(humidity, dtype=float))
+        codes = self._codes(stations)
+        k, h = len(self._ids), temp.shape[1]
+        start_hour = int(start_hour)
+        if self.next_hour is not None:
+            gap = start_hour - self.next_hour
+            if gap < 0:
+                raise ValueError(f"block starts at hour {start_hour}, before the next expected hour {self.next_hour}")
+            if gap >= self.window:
+                self._a["tail"][:] = 0.0
+            elif gap:
+                # pad with missing hours so the rolling window and nights stay aligned
+                temp = np.hstack([np.full((len(codes), gap), np.nan), temp])
+                humidity = np.hstack([np.full((len(codes), gap), np.nan), humidity])
+                start_hour, h = start_hour - gap, h + gap
+        t = np.full((k, h), np.nan)
+        t[codes] = thi(temp, humidity)
+        self.next_hour = start_hour + h
+
+        a = self._a
+        valid = ~np.isnan(t)
+        a["hours"] += valid.sum(axis=1)
+        a["thi_sum"] += np.where(valid, t, 0.0).sum(axis=1)
+        a["thi_max"] = np.fmax(a["thi_max"], np.where(valid, t, -np.inf).max(axis=1))
+        a["thi_max"][np.isinf(a["thi_max"])] = np.nan
+        with np.errstate(invalid="ignore"):
+            for j, limit in enumerate(self.species.values()):
+                a["above"][:, j] += (t > limit).sum(axis=1)
+
+        # rolling heat load, continuing from the previous block's last window-1 hours
+        ext = np.hstack([a["tail"], _excess(t, self.threshold)])
+        c = np.zeros((k, ext.shape[1] + 1))
+        np.cumsum(ext, axis=1, out=c[:, 1:])
+        load = c[:, self.window:] - c[:, :-self.window]
+        a["load_max"] = np.maximum(a["load_max"], load.max(axis=1))
+        a["load"] = load[:, -1]
+        a["tail"] = ext[:, ext.shape[1] - (self.window - 1):]
+
+        self._fold_nights(t, valid, start_hour)
+
+    def _fold_nights(self, t: np.ndarray, valid: np.ndarray, start_hour: int) -> None:
+        a = self._a
+        clock = start_hour + np.arange(t.shape[1])
+        cols = np.flatnonzero(_in_night(clock % 24, self.night))
+        if not len(cols):
+            return
+        night_id = (clock[cols] - self.night[0]) // 24
+        starts = np.flatnonzero(np.r_[True, np.diff(night_id) != 0])
+        ids = night_id[starts]
+        with np.errstate(invalid="ignore"):
+            cool = np.add.reduceat((t[:, cols] < self.threshold).astype(float), starts, axis=1)
+        seen = np.add.reduceat(valid[:, cols].astype(float), starts, axis=1)
+        if self._pending_night is not None:
+            if ids[0] == self._pending_night:
+                cool[:, 0] += a["pending_cool"]
+                seen[:, 0] += a["pending_valid"]
+            else:
+                self._close_nights(a["pending_cool"][:, None], a["pending_valid"][:, None])
+        # the last night stays open unless the block reaches its final hour
+        last_hour = ids[-1] * 24 + self.night[0] + self._night_len - 1
+        done = len(ids) if clock[-1] >= last_hour else len(ids) - 1
+        self._close_nights(cool[:, :done], seen[:, :done])
+        if done < len(ids):
+            self._pending_night = int(ids[-1])
+            a["pending_cool"], a["pending_valid"] = cool[:, -1], seen[:, -1]
+        else:
+            self._pending_night = None
+
+    def _close_nights(self, cool: np.ndarray, seen: np.ndarray) -> None:
+        observed = seen > 0
+        self._a["nights"] += observed.sum(axis=1)
+        self._a["recovered"] += (observed & (cool >= self.recovery_hours)).sum(axis=1)
+
+    def summary(self) -> pd.DataFrame:
+        """
+        One row per station (sorted): hours observed, mean / max THI, hours
+        above each species threshold, peak and current rolling heat load
+        (THI-degree-hours), completed nights, recovered nights and recovery rate.
+        """
+        a = self._a
+        hours = a["hours"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out = pd.DataFrame({
+                "hours": hours.astype(int),
+                "mean_thi": np.where(hours > 0, a["thi_sum"] / hours, np.nan),
+                "max_thi": a["thi_max"],
+                **{f"hours_above_{name}": a["above"][:, j].astype(int) for j, name in enumerate(self.species)},
+                "max_heat_load": a["load_max"],
+                "heat_load": a["load"],
+                "nights": a["nights"].astype(int),
+                "recovered_nights": a["recovered"].astype(int),
+                "recovery_rate": np.where(a["nights"] > 0, a["recovered"] / a["nights"], np.nan),
+            }, index=self._ids.rename("station"))
+        return out.sort_index()
+
+
+def to_clock_hours(timestamps) -> np.ndarray:
+    """Whole hours since the Unix epoch for datetime-like values."""
+    ts = pd.to_datetime(pd.Series(timestamps))
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_localize(None)      # keep local wall-clock time
+    return ts.to_numpy(dtype="datetime64[h]").astype(np.int64)
+
+
+def stream_station_log(path,
+                       chunksize: int = 500_000,
+                       station_col: str = "station",
+                       time_col: str = "timestamp",
+                       temp_col: str = "temp",
+                       humidity_col: str = "humidity") -> Iterator[Tuple[np.ndarray, int, np.ndarray, np.ndarray]]:
+    """
+    Read a long-format station log (one row per station-hour, in time order)
+    and yield (stations, start_hour, temp, humidity) wide blocks for
+    HeatStressAccumulator.update. Rows of the chunk's last hour are held back
+    until the next chunk, since that hour may continue there.
+    """
+    carry = None
+    reader = pd.read_csv(path, usecols=[station_col, time_col, temp_col, humidity_col],
+                         chunksize=chunksize, dtype={station_col: str})
+    for raw in reader:
+        df = pd.DataFrame({
+            "station": raw[station_col].to_numpy(),
+            "hour": to_clock_hours(raw[time_col]),
+            "temp": pd.to_numeric(raw[temp_col], errors="coerce").to_numpy(dtype=float),
+            "humidity": pd.to_numeric(raw[humidity_col], errors="coerce").to_numpy(dtype=float),
+        })
+        if carry is not None:
+            df = pd.concat([carry, df], ignore_index=True)
+        last = df["hour"].max()
+        carry = df[df["hour"] == last]
+        block = _wide_block(df[df["hour"] < last])
+        if block is not None:
+            yield block
+    if carry is not None:
+        block = _wide_block(carry)
+        if block is not None:
+            yield block
+
+
+def _wide_block(df: pd.DataFrame):
+    if df.empty:
+        return None
+    codes, stations = pd.factorize(df["station"])
+    start = int(df["hour"].min())
+    offset = df["hour"].to_numpy() - start
+    temp = np.full((len(stations), int(offset.max()) + 1), np.nan)
+    humidity = np.full_like(temp, np.nan)
+    temp[codes, offset] = df["temp"].to_numpy()
+    humidity[codes, offset] = df["humidity"].to_numpy()
+    return np.asarray(stations, dtype=object), start, temp, humidity
@@ -0,0 +1,243 @@
+"""
+herd_store.py
+Durable SQLite herd storage shared by app.py and new_app.py.
+
+Each app keeps its animals in its own table; pages ask the store for only the
+rows, columns and aggregates they render instead of building a DataFrame of
+the whole herd on every rerun.
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# app.py "Authenticate & Log" records
+RECORD_SCHEMA = {
+    "ID": "TEXT", "Species": "TEXT", "Sire": "TEXT", "ADG": "REAL", "Profit": "REAL",
+    "Manure": "REAL", "Biogas": "REAL", "CH4": "REAL", "FCR": "REAL", "Date": "TEXT", "Weight": "REAL",
+}
+RECORD_INDEXES = ("ID", "Species", "Sire", "Date")
+
+# new_app.py "DEPLOY TO CLOUD" assets
+ASSET_SCHEMA = {
+    "uid": "TEXT", "spec": "TEXT", "breed": "TEXT", "wt": "REAL", "day": "INTEGER", "date": "TEXT",
+    "route": "TEXT",
+}
+ASSET_INDEXES = ("uid", "spec", "date")
+
+# new_app.py Brookside daily milk records (day = day in milk)
+MILK_SCHEMA = {"uid": "TEXT", "day": "INTEGER", "litres": "REAL", "date": "TEXT"}
+MILK_INDEXES = ("uid",)
+
+# new_app.py Pharmacovigilance treatment log; withdrawal days as recorded at treatment time
+TREATMENT_SCHEMA = {"uid": "TEXT", "drug": "TEXT", "date": "TEXT", "milk_days": "INTEGER", "meat_days": "INTEGER"}
+TREATMENT_INDEXES = ("uid", "date")
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class HerdStore:
+    """
+    One SQLite table of herd records with indexed lookup columns.
+
+    File-backed stores run in WAL mode so Streamlit sessions can read while
+    another session writes. The connection is shared across threads and
+    guarded by a lock, so a single store can live in st.cache_resource.
+
+    `version` increases on every committed write, so callers can key caches
+    of derived frames on it. `generation` increases whenever the table is
+    emptied (replace, clear), after which SQLite may hand out old rowids again;
+    it is kept in a small per-table "_meta" table so it survives restarts.
+    """
+
+    def __init__(self,
+                 path: str = ":memory:",
+                 table: str = "records",
+                 schema: Dict[str, str] = RECORD_SCHEMA,
+                 indexes: Sequence[str] = RECORD_INDEXES):
+        self.path = path
+        self.table = table
+        self.schema = dict(schema)
+        self._lock = threading.RLock()
+        self.version = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        cols = ", ".join(f"{_quote(c)} {t}" for c, t in self.schema.items())
+        with self._lock, self._conn:
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {_quote(table)} ({cols})")
+            # columns added to a schema after the table was first created
+            existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({_quote(table)})")}
+            for col, sql_type in self.schema.items():
+                if col not in existing:
+                    self._conn.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(col)} {sql_type}")
+            for col in indexes:
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{table}_{col}')} ON {_quote(table)} ({_quote(col)})"
+                )
+            self._conn.execute('CREATE TABLE IF NOT EXISTS "_meta" '
+                               '("tbl" TEXT, "key" TEXT, "value" TEXT, PRIMARY KEY ("tbl", "key"))')
+
+    @contextmanager
+    def _writing(self):
+        with self._lock:
+            with self._conn:
+                yield
+            self.version += 1
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute('SELECT "value" FROM "_meta" WHERE "tbl" = ? AND "key" = ?',
+                                 (self.table, key)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: Optional[str]) -> None:
+        # callers hold the lock and an open transaction
+        if value is None:
+            self._conn.execute('DELETE FROM "_meta" WHERE "tbl" = ? AND "key" = ?', (self.table, key))
+        else:
+            self._conn.execute('INSERT OR REPLACE INTO "_meta" VALUES (?, ?, ?)', (self.table, key, value))
+
+    def _empty(self) -> None:
+        self._conn.execute(f"DELETE FROM {_quote(self.table)}")
+        self._set_meta("generation", str(self.generation + 1))
+        self._set_meta("snapshot", None)
+
+    @property
+    def generation(self) -> int:
+        with self._lock:
+            return int(self._get_meta("generation") or 0)
+
+    def snapshot_mark(self) -> Tuple[Optional[str], int]:
+        """(id, max rowid) recorded by the last mark_snapshot, or (None, 0) if none or emptied since."""
+        with self._lock:
+            mark = self._get_meta("snapshot")
+        if mark is None:
+            return None, 0
+        snapshot_id, rowid = mark.split(":")
+        return snapshot_id, int(rowid)
+
+    def mark_snapshot(self, snapshot_id: str) -> None:
+        """Record that the table now holds exactly the given snapshot's rows."""
+        with self._lock, self._conn:
+            self._set_meta("snapshot", f"{snapshot_id}:{self.max_rowid()}")
+
+    def _columns(self, columns: Optional[Iterable[str]]) -> List[str]:
+        if columns is None:
+            return list(self.schema)
+        columns = list(columns)
+        unknown = [c for c in columns if c not in self.schema]
+        if unknown:
+            raise KeyError(f"unknown columns for {self.table}: {unknown}")
+        return columns
+
+    def insert(self, record: dict) -> None:
+        self.insert_many([record])
+
+    def _insert_sql(self) -> str:
+        cols = list(self.schema)
+        return (f"INSERT INTO {_quote(self.table)} ({', '.join(map(_quote, cols))}) "
+                f"VALUES ({', '.join('?' * len(cols))})")
+
+    def _rows(self, records: Iterable[dict]) -> Iterator[tuple]:
+        cols = list(self.schema)
+        return (tuple(r.get(c) for c in cols) for r in records)
+
+    def insert_many(self, records: Iterable[dict]) -> int:
+        """
+        Bulk insert in one transaction; keys outside the schema are ignored.
+        records may be a lazy iterable, so large restores stream through.
+        """
+        with self._writing():
+            return self._conn.executemany(self._insert_sql(), self._rows(records)).rowcount
+
+    def replace_all(self, records: Iterable[dict]) -> int:
+        """Swap the table contents for records in a single transaction (restore)."""
+        with self._writing():
+            self._empty()
+            return self._conn.executemany(self._insert_sql(), self._rows(records)).rowcount
+
+    def insert_frames(self, frames: Iterable[pd.DataFrame], replace: bool = False) -> int:
+        """
+        insert_many for DataFrame blocks, converted column-wise (NaN -> NULL).
+        With replace the table is emptied first, in the same transaction.
+        """
+        def rows():
+            for df in frames:
+                df = df.reindex(columns=list(self.schema))
+                cols = [df[c].astype(object).where(df[c].notna(), None).tolist() for c in self.schema]
+                yield from zip(*cols)
+
+        with self._writing():
+            if replace:
+                self._empty()
+            return self._conn.executemany(self._insert_sql(), rows()).rowcount
+
+    def max_rowid(self) -> int:
+        """Highest SQLite rowid; rows inserted later always have a larger one."""
+        with self._lock:
+            return self._conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {_quote(self.table)}").fetchone()[0]
+
+    def count(self, where: Optional[str] = None, params: Sequence = ()) -> int:
+        sql = f"SELECT COUNT(*) FROM {_quote(self.table)}"
+        if where:
+            sql += f" WHERE {where}"
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def fetch(self,
+              columns: Optional[Iterable[str]] = None,
+              where: Optional[str] = None,
+              params: Sequence = (),
+              order_by: Optional[str] = None,
+              limit: Optional[int] = None,
+              offset: int = 0,
+              with_rowid: bool = False) -> pd.DataFrame:
+        """
+        Rows as a DataFrame, restricted to the given columns. where / order_by
+        are SQL fragments written by the calling page; values go in params.
+        with_rowid adds a leading 'rowid' column for keyset paging.
+        """
+        cols = [_quote(c) for c in self._columns(columns)]
+        if with_rowid:
+            cols.insert(0, "rowid")
+        sql = f"SELECT {', '.join(cols)} FROM {_quote(self.table)}"
+        if where:
+            sql += f" WHERE {where}"
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)} OFFSET {int(offset)}"
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=list(params))
+
+    def aggregate(self,
+                  exprs: Dict[str, str],
+                  group_by: Sequence[str] = (),
+                  where: Optional[str] = None,
+                  params: Sequence = ()) -> pd.DataFrame:
+        """
+        SQL-side aggregation, e.g. aggregate({"roi": "SUM(Profit)"}, group_by=["Sire"]).
+        Returns one row per group (or a single row without group_by).
+        """
+        keys = self._columns(group_by)
+        select = [_quote(k) for k in keys] + [f"{e} AS {_quote(name)}" for name, e in exprs.items()]
+        sql = f"SELECT {', '.join(select)} FROM {_quote(self.table)}"
+        if where:
+            sql += f" WHERE {where}"
+        if keys:
+            sql += f" GROUP BY {', '.join(map(_quote, keys))}"
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=list(params))
+
+    def clear(self) -> None:
+        with self._writing():
+            self._empty()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,232 @@
+"""
+ingest.py
+Streaming ingestion of weigh-scale CSV exports into the metrics pipeline.
+
+The file is read in bounded-size chunks; each chunk is folded into per-animal
+running sums, so peak memory depends on the number of animals, not rows.
+"""
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from dates import fitting_formats, is_numeric_days, parse_dates
+from metrics import to_day_values, compute_metrics_batch, parse_date_column, regression_from_sums
+
+
+@dataclass
+class IngestStats:
+    rows: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+class WeighInAccumulator:
+    """
+    Per-animal running regression sums plus first/last weighing and feed total.
+
+    Day values are stored relative to a per-animal pivot (the first day seen
+    for that animal) to keep the sums numerically well conditioned. State is
+    kept as flat arrays addressed by an integer code per animal so a chunk
+    costs one hash lookup per distinct animal, not per row.
+    """
+
+    SUMS = ["n", "sx", "sy", "sxy", "sxx", "syy", "feed"]
+    COLUMNS = ["pivot", "first_day", "first_wt", "last_day", "last_wt"] + SUMS
+
+    def __init__(self):
+        self._ids = pd.Index([], dtype=object)
+        self._arrays = {col: np.empty(0) for col in self.COLUMNS}
+
+    def __len__(self):
+        return len(self._ids)
+
+    @property
+    def state(self) -> pd.DataFrame:
+        state = pd.DataFrame(self._arrays, index=self._ids.rename("animal_id"))
+        return state.sort_index()
+
+    def _codes(self, uniq: np.ndarray) -> np.ndarray:
+        pos = self._ids.get_indexer(uniq)
+        new = pos < 0
+        if new.any():
+            start = len(self._ids)
+            self._ids = self._ids.append(pd.Index(uniq[new], dtype=object))
+            pos[new] = np.arange(start, len(self._ids))
+            grow = int(new.sum())
+            for col in self.COLUMNS:
+                fill = 0.0 if col in self.SUMS else np.nan
+                self._arrays[col] = np.concatenate([self._arrays[col], np.full(grow, fill)])
+        return pos
+
+    def update(self, animal_ids, days, weights, feed=None) -> None:
+        """Fold one chunk of (animal, absolute day, weight[, feed]) rows in."""
+        days = np.asarray(days, dtype=float)
+        weights = np.asarray(weights, dtype=float)
+        feed = np.zeros_like(days) if feed is None else np.nan_to_num(np.broadcast_to(np.asarray(feed, dtype=float), days.shape))
+        animal_ids = np.asarray(animal_ids, dtype=object)
+        keep = ~(np.isnan(days) | np.isnan(weights)) & pd.notna(animal_ids)
+        if not keep.any():
+            return
+        days, weights, feed = days[keep], weights[keep], feed[keep]
+        inv, uniq = pd.factorize(animal_ids[keep])
+        pos = self._codes(np.asarray(uniq, dtype=object))
+        codes = pos[inv]
+        a = self._arrays
+        k = len(self._ids)
+
+        # first/last weighing per animal in this chunk
+        order = np.lexsort((days, inv))
+        bounds = np.flatnonzero(np.diff(inv[order])) + 1
+        first_rows = order[np.r_[0, bounds]]
+        last_rows = order[np.r_[bounds - 1, len(order) - 1]]
+        first_day, last_day = days[first_rows], days[last_rows]
+
+        fresh = np.isnan(a["pivot"][pos])
+        a["pivot"][pos[fresh]] = first_day[fresh]
+        earlier = fresh | (first_day < a["first_day"][pos])
+        a["first_day"][pos[earlier]] = first_day[earlier]
+        a["first_wt"][pos[earlier]] = weights[first_rows][earlier]
+        later = fresh | (last_day >= a["last_day"][pos])
+        a["last_day"][pos[later]] = last_day[later]
+        a["last_wt"][pos[later]] = weights[last_rows][later]
+
+        x = days - a["pivot"][codes]
+        y = weights
+        a["n"] += np.bincount(codes, minlength=k)
+        for col, w in (("sx", x), ("sy", y), ("sxy", x * y), ("sxx", x * x), ("syy", y * y), ("feed", feed)):
+            a[col] += np.bincount(codes, w, k)
+
+    def adg(self) -> pd.DataFrame:
+        """Same columns as metrics.compute_adg_grouped, indexed by animal id."""
+        s = self.state
+        fit = regression_from_sums(s["n"], s["sx"], s["sy"], s["sxy"], s["sxx"], s["syy"])
+        # move the intercept from the pivot day to each animal's first weighing
+        offset = (s["first_day"] - s["pivot"]).to_numpy()
+        return pd.DataFrame({
+            "adg": fit["slope"],
+            "intercept": fit["intercept"] + fit["slope"] * offset,
+            "n_points": s["n"].astype(int).to_numpy(),
+            "r2": fit["r2"],
+        }, index=s.index.rename("animal_id"))
+
+    def results(self, price_per_kg, feed_cost, target_wt=None) -> pd.DataFrame:
+        """
+        ADG regression joined with compute_metrics_batch KPIs. Initial and
+        current weights are the first and last weighings, days is their span,
+        and feed_used is the summed feed column. price_per_kg, feed_cost and
+        target_wt may be scalars or Series indexed by animal id.
+        """
+        s = self.state
+
+        def per_animal(v):
+            return v.reindex(s.index).to_numpy() if isinstance(v, pd.Series) else v
+
+        kpis = compute_metrics_batch(
+            s["first_wt"].to_numpy(), s["last_wt"].to_numpy(),
+            (s["last_day"] - s["first_day"]).to_numpy(), s["feed"].to_numpy(),
+            per_animal(price_per_kg), per_animal(feed_cost),
+            target_wt=None if target_wt is None else per_animal(target_wt),
+        )
+        kpis.index = s.index.rename("animal_id")
+        # the regression slope replaces the two-point gain / days estimate
+        return self.adg().join(kpis.drop(columns="adg"))
+
+
+def detect_date_format(path, date_col: str = "date", chunksize: int = 250_000) -> Optional[str]:
+    """
+    One date format for the whole file, so every chunk is read the same way.
+
+    The date column's distinct values are scanned chunk by chunk, narrowing
+    the fitting formats until at most one is left; a day-first export whose
+    first chunk only has days <= 12 is therefore not read month-first there.
+    None for numeric-day columns and for columns no single format fits.
+    """
+    formats = None
+    for raw in pd.read_csv(path, usecols=[date_col], chunksize=chunksize, dtype=str):
+        values = pd.Index(raw[date_col].dropna().unique())
+        if not len(values):
+            continue
+        if formats is None and is_numeric_days(pd.Series(values)):
+            return None
+        formats = fitting_formats(values, formats)
+        if len(formats) <= 1:
+            break
+    return formats[0] if formats else None
+
+
+def _day_column(dates: pd.Series, format: Optional[str]) -> np.ndarray:
+    if format is not None:
+        try:
+            return to_day_values(parse_dates(dates, format=format))
+        except ValueError:
+            pass    # a value beyond the scanned part breaks the format; detect per chunk
+    return to_day_values(parse_date_column(dates))
+
+
+def stream_weigh_ins(path,
+                     chunksize: int = 250_000,
+                     id_col: str = "animal_id",
+                     date_col: str = "date",
+                     weight_col: str = "weight",
+                     feed_col: Optional[str] = "feed",
+                     extra_cols: Sequence[str] = ()) -> Iterator[pd.DataFrame]:
+    """
+    Yield bounded-size chunks of a weigh-in CSV with columns
+    ['animal_id', 'day', 'weight', 'feed']; 'day' is absolute days parsed
+    with parse_date_column semantics (dates or numeric days), using one date
+    format detected for the whole file (detect_date_format). extra_cols
+    present in the file are passed through unchanged, after those four.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    missing = [c for c in (id_col, date_col, weight_col) if c not in header]
+    if missing:
+        raise KeyError(f"missing weigh-in columns: {missing}")
+    has_feed = bool(feed_col) and feed_col in header
+    extra = [c for c in extra_cols if c in header]
+    usecols = [id_col, date_col, weight_col] + ([feed_col] if has_feed else []) + extra
+    date_format = detect_date_format(path, date_col, chunksize)
+    reader = pd.read_csv(path, usecols=usecols, chunksize=chunksize, dtype={id_col: str})
+    for raw in reader:
+        chunk = pd.DataFrame({
+            "animal_id": raw[id_col].to_numpy(),
+            "day": _day_column(raw[date_col], date_format),
+            "weight": pd.to_numeric(raw[weight_col], errors="coerce").to_numpy(dtype=float),
+            "feed": pd.to_numeric(raw[feed_col], errors="coerce").to_numpy(dtype=float) if has_feed else 0.0,
+        })
+        for col in extra:
+            chunk[col] = raw[col].to_numpy()
+        yield chunk
+
+
+def ingest_weigh_csv(path,
+                     price_per_kg,
+                     feed_cost,
+                     target_wt=None,
+                     chunksize: int = 250_000,
+                     progress: Optional[Callable[[IngestStats], None]] = None,
+                     **columns) -> Tuple[pd.DataFrame, IngestStats]:
+    """
+    Stream a weigh-in CSV through WeighInAccumulator and return per-animal
+    ADG/FCR/profit results plus throughput stats. progress, if given, is
+    called with the running IngestStats after every chunk. Extra keyword
+    arguments override the column names accepted by stream_weigh_ins.
+    """
+    acc = WeighInAccumulator()
+    stats = IngestStats()
+    start = time.perf_counter()
+    for chunk in stream_weigh_ins(path, chunksize=chunksize, **columns):
+        acc.update(chunk["animal_id"], chunk["day"], chunk["weight"], chunk["feed"])
+        stats.rows += len(chunk)
+        stats.chunks += 1
+        stats.seconds = time.perf_counter() - start
+        if progress:
+            progress(stats)
+    stats.seconds = time.perf_counter() - start
+    return acc.results(price_per_kg, feed_cost, target_wt), stats
@@ -0,0 +1,195 @@
+"""
+instrumentation.py
+Lightweight timing spans for the hot paths of app.py and new_app.py.
+
+Each named span keeps a count, a running total and the last `window` wall
+times in a ring buffer, from which rolling percentiles are computed on read.
+Spans are opened with `span(name)` (context manager), `start(name).stop()`
+(for page blocks that can exit through st.rerun), or the `timed(name)`
+decorator. When the registry is disabled, span/start hand back a shared
+no-op object and timed wrappers make one attribute check before calling
+through, so instrumented code costs well under a microsecond per call.
+
+Snapshots render as a DataFrame for the settings panels and as Prometheus
+text exposition (a summary per span) for a textfile collector.
+"""
+import functools
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_WINDOW = 1024
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class _Series:
+    """Count, total, max and a ring of the most recent durations for one span."""
+
+    __slots__ = ("count", "total", "max", "ring", "pos")
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.ring: List[float] = [0.0] * window
+        self.pos = 0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.ring[self.pos] = seconds
+        self.pos = (self.pos + 1) % len(self.ring)
+
+    def recent(self) -> np.ndarray:
+        return np.asarray(self.ring[:min(self.count, len(self.ring))])
+
+
+class Span:
+    """One running timing; stop() (or leaving the with block) records it once."""
+
+    __slots__ = ("_owner", "name", "_start")
+
+    def __init__(self, owner: "Instrumentation", name: str):
+        self._owner = owner
+        self.name = name
+        self._start = time.perf_counter()
+
+    def stop(self) -> float:
+        if self._start is None:
+            return 0.0
+        seconds = time.perf_counter() - self._start
+        self._start = None
+        self._owner.record(self.name, seconds)
+        return seconds
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def stop(self) -> float:
+        return 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Instrumentation:
+    """Process-wide registry of named span timings. Thread-safe."""
+
+    def __init__(self, enabled: bool = True, window: int = DEFAULT_WINDOW):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.enabled = enabled
+        self.window = window
+        self._lock = threading.Lock()
+        self._series: Dict[str, _Series] = {}
+        self._last_export = 0.0
+
+    # -- recording -----------------------------------------------------------
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                series = self._series[name] = _Series(self.window)
+            series.add(seconds)
+
+    def start(self, name: str):
+        return Span(self, name) if self.enabled else _NULL_SPAN
+
+    span = start
+
+    def timed(self, name: Optional[str] = None) -> Callable:
+        """Decorator recording each call of the function under `name` (default: its qualname)."""
+        def wrap(fn):
+            label = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(label, time.perf_counter() - start)
+            return wrapper
+        return wrap
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    # -- reading -------------------------------------------------------------
+
+    def snapshot(self) -> pd.DataFrame:
+        """
+        One row per span: lifetime count/total/max and rolling mean and
+        percentiles (milliseconds) over the last `window` samples, slowest
+        p90 first.
+        """
+        with self._lock:
+            rows = [(name, s.count, s.total, s.max, s.recent()) for name, s in self._series.items()]
+        columns = ["span", "count", "total_s", "mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms"]
+        out = []
+        for name, count, total, peak, recent in rows:
+            q = np.quantile(recent, QUANTILES) * 1e3
+            out.append((name, count, total, recent.mean() * 1e3, *q, peak * 1e3))
+        frame = pd.DataFrame(out, columns=columns)
+        return frame.sort_values("p90_ms", ascending=False, ignore_index=True)
+
+    def to_prometheus(self, prefix: str = "aegis") -> str:
+        """Prometheus text exposition: one summary metric labelled by span name."""
+        metric = f"{prefix}_span_seconds"
+        with self._lock:
+            rows = [(name, s.count, s.total, s.recent()) for name, s in sorted(self._series.items())]
+        lines = [f"# HELP {metric} Wall time of instrumented spans (rolling quantiles over the last "
+                 f"{self.window} samples).",
+                 f"# TYPE {metric} summary"]
+        for name, count, total, recent in rows:
+            label = name.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            for q, v in zip(QUANTILES, np.quantile(recent, QUANTILES)):
+                lines.append(f'{metric}{{span="{label}",quantile="{q}"}} {v:.9g}')
+            lines.append(f'{metric}_sum{{span="{label}"}} {total:.9g}')
+            lines.append(f'{metric}_count{{span="{label}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, prefix: str = "aegis") -> None:
+        """Atomically replace `path` with the current exposition (textfile collector safe)."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus(prefix))
+        os.replace(tmp, path)
+        self._last_export = time.monotonic()
+
+    def export(self, path: Optional[str], min_interval: float = 10.0, prefix: str = "aegis") -> bool:
+        """write_prometheus at most once per min_interval seconds; returns whether it wrote."""
+        if not path or not self.enabled or time.monotonic() - self._last_export < min_interval:
+            return False
+        self.write_prometheus(path, prefix)
+        return True
+
+
+INSTRUMENTS = Instrumentation(enabled=os.environ.get("AEGIS_INSTRUMENTATION", "1").lower() not in ("0", "false", "off"))
+span = INSTRUMENTS.span
+start = INSTRUMENTS.start
+timed = INSTRUMENTS.timed
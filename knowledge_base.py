@@ -0,0 +1,117 @@
+"""
+knowledge_base.py
+Veterinary reference data shared by app.py, new_app.py and the diagnostic index.
+"""
+
+# new_app.py clinical triage library: group -> condition -> signs / tx / triage / vax
+CLINICAL_MASTER_DB = {
+    "Bovine: Tick-Borne": {
+        "East Coast Fever (ECF)": {"signs": "Swollen parotid lymph nodes, frothy breath, fever", "tx": "Buparvaquone (Butalex)", "triage": "Red", "vax": "ECF-ITM Muguga"},
+        "Anaplasmosis": {"signs": "Jaundice (yellow gums), constipation, anemia", "tx": "Oxytetracycline 20%", "triage": "Red", "vax": "Tick Control"},
+        "Babesiosis (Redwater)": {"signs": "Red/dark urine, high fever, pale membranes", "tx": "Diminazene Aceturate", "triage": "Red", "vax": "Tick Control"},
+        "Heartwater": {"signs": "Nervous signs (high stepping), head pressing", "tx": "Tetracyclines", "triage": "Red", "vax": "Tick Control"},
+        "Corridor Disease": {"signs": "Rapid death post-buffalo contact, pulmonary edema", "tx": "Buparvaquone", "triage": "Red", "vax": "Wildlife Buffer"},
+        "Sweating Sickness": {"signs": "Moist eczema, skin peeling, hyperthermia", "tx": "Supportive care", "triage": "Yellow", "vax": "Hyalomma Control"}
+    },
+    "Bovine: Viral & Transboundary": {
+        "FMD (Foot & Mouth)": {"signs": "Blisters on tongue/hooves, heavy salivation", "tx": "Supportive/Antiseptics", "triage": "Red", "vax": "FMD Quadrivalent (O,A,SAT1,SAT2)"},
+        "LSD (Lumpy Skin)": {"signs": "Nodules on skin, fever, edema in limbs", "tx": "Antibiotics for secondary infection", "triage": "Yellow", "vax": "LSD-Neethling Strain"},
+        "CBPP": {"signs": "Labored breathing, elbows out, head extended", "tx": "Quarantine only", "triage": "Red", "vax": "T1/44 Vaccine"},
+        "Rift Valley Fever": {"signs": "Mass abortions, liver necrosis, high fever", "tx": "No treatment", "triage": "Red", "vax": "RVF Clone 13"},
+        "Rabies": {"signs": "Aggression, salivation, paralysis", "tx": "Cull immediately", "triage": "Red", "vax": "Rabisin"},
+        "Bovine Ephemeral Fever": {"signs": "Three-day stiffness, sudden shivering", "tx": "NSAIDs/Flunixin", "triage": "Yellow", "vax": "Three-day Sickness Vax"}
+    },
+    "Bovine: Metabolic & Nutritional": {
+        "Milk Fever": {"signs": "S-curve neck, cold skin, post-calving collapse", "tx": "Calcium Borogluconate IV", "triage": "Red", "vax": "Anionic Salts Pre-Calve"},
+        "Ketosis": {"signs": "Sweet breath (acetone), drop in milk, lethargy", "tx": "Propylene glycol", "triage": "Yellow", "vax": "High Energy Transition Diet"},
+        "Frothy Bloat": {"signs": "Left flank distension, respiratory distress", "tx": "Anti-foaming agent/Trocar", "triage": "Red", "vax": "Antizymotics"},
+        "Acidosis": {"signs": "Laminitis, grey diarrhea, low rumen pH", "tx": "Sodium Bicarbonate", "triage": "Yellow", "vax": "TMR Buffering"},
+        "Hypomagnesemia (Grass Staggers)": {"signs": "Muscle tremors, convulsions, sudden death", "tx": "Magnesium Sulfate", "triage": "Red", "vax": "Magnesium Supplementation"},
+        "Hardware Disease": {"signs": "Reluctance to move, grunting, arched back", "tx": "Magnet/Surgery", "triage": "Red", "vax": "Magnetic Oral Bolus"}
+    },
+    "Poultry: Industrial Pathogens": {
+        "Newcastle Disease (vND)": {"signs": "Twisted neck, green diarrhea, respiratory gasping", "tx": "None", "triage": "Red", "vax": "Lasota / HB1"},
+        "Gumboro (IBD)": {"signs": "Watery diarrhea, self-pecking at vent, trembling", "tx": "Electrolytes", "triage": "Red", "vax": "IBD Intermediate Plus"},
+        "Fowl Pox": {"signs": "Warty scabs on comb/wattles", "tx": "Antiseptics", "triage": "Yellow", "vax": "Fowl Pox Wing Web"},
+        "Coccidiosis": {"signs": "Bloody droppings, ruffled feathers", "tx": "Amprolium / Toltrazuril", "triage": "Yellow", "vax": "Coccivax"},
+        "Marek's Disease": {"signs": "Sciatic paralysis (one leg forward), blindness", "tx": "Cull", "triage": "Red", "vax": "HVT at Day 0"},
+        "Fowl Cholera": {"signs": "Green/Yellow diarrhea, swollen wattles", "tx": "Sulfonamides", "triage": "Red", "vax": "Pasteurella Multocida Vax"},
+        "Infectious Coryza": {"signs": "Facial edema, foul nasal discharge", "tx": "Erythromycin", "triage": "Yellow", "vax": "Coryza Vax"},
+        "Avian Influenza (H5N1)": {"signs": "Cyanosis of comb, sudden death, head swelling", "tx": "NOTIFY GOVT", "triage": "Red", "vax": "Emergency Only"}
+    }
+}
+
+# app.py market prices (KES/kg) and per-species husbandry constants
+MARKET_PRICES = {
+    "Beef": 760, "Pig": 550, "Goat": 950, "Sheep": 900, "Poultry": 600, "Dairy": 70
+}
+
+SPECIES_METRICS = {
+    "Beef": {
+        "ch4_factor": 0.18, "manure_rate": 12.0, "biogas_yield": 0.04, "feed_cost": 55, "adg_target": 0.8,
+        "vaccines": [("FMD", 0), ("LSD", 30), ("Anthrax", 180), ("Blackquarter", 240)],
+        "vitals": {"temp": "38.5-39.5°C", "hr": "48-84 bpm", "rr": "26-50 bpm"}
+    }, 
+    "Pig": {
+        "ch4_factor": 0.04, "manure_rate": 4.0, "biogas_yield": 0.06, "feed_cost": 65, "adg_target": 0.6,
+        "vaccines": [("CSF", 0), ("Parvo", 21), ("Erysipelas", 45), ("Foot & Mouth", 60)],
+        "vitals": {"temp": "38.7-39.8°C", "hr": "70-120 bpm", "rr": "13-18 bpm"}
+    },
+    "Goat": {
+        "ch4_factor": 0.02, "manure_rate": 1.5, "biogas_yield": 0.05, "feed_cost": 45, "adg_target": 0.15,
+        "vaccines": [("PPR", 0), ("Entero", 21), ("CCPP", 60), ("Orf", 90)],
+        "vitals": {"temp": "38.5-40.5°C", "hr": "70-90 bpm", "rr": "15-30 bpm"}
+    },
+    "Sheep": {
+        "ch4_factor": 0.02, "manure_rate": 1.5, "biogas_yield": 0.05, "feed_cost": 45, "adg_target": 0.2,
+        "vaccines": [("Blue Tongue", 0), ("Sheep Pox", 30), ("Foot Rot", 120)],
+        "vitals": {"temp": "38.5-40.0°C", "hr": "70-90 bpm", "rr": "12-20 bpm"}
+    }
+}
+
+# app.py field-manual symptom logic: presenting sign -> differential diagnoses
+SYMPTOM_MATRIX = {
+    "High Fever": ["Pneumonia", "East Coast Fever", "Anthrax"],
+    "Pale Mucous": ["Internal Parasites", "Anemia", "Babesiosis"],
+    "Bloat": ["Grain Overload", "Esophageal Obstruction", "Toxic Plants"],
+    "Limping": ["Foot Rot", "FMD", "Physical Injury"],
+    "Skin Lumps": ["Lumpy Skin Disease", "Mange", "Ringworm"]
+}
+
+# new_app.py nutrition lab ingredients: group -> feed -> cp % / me MJ/kg / dm % / cost KES/kg
+FEED_LIBRARY = {
+    "Basal Energy": {
+        "Maize Bran": {"cp": 8.0, "me": 11.5, "dm": 88, "cost": 38},
+        "Wheat Pollard": {"cp": 15.0, "me": 10.2, "dm": 89, "cost": 42},
+        "Maize Germ": {"cp": 10.5, "me": 12.0, "dm": 90, "cost": 45},
+        "Molasses": {"cp": 3.0, "me": 13.2, "dm": 75, "cost": 30}
+    },
+    "Protein Concentrates": {
+        "Soya Bean Meal": {"cp": 45.0, "me": 12.5, "dm": 90, "cost": 105},
+        "Cotton Seed Cake": {"cp": 28.0, "me": 10.5, "dm": 92, "cost": 72},
+        "Sunflower Meal": {"cp": 26.0, "me": 9.8, "dm": 91, "cost": 48},
+        "Fish Meal": {"cp": 62.0, "me": 12.2, "dm": 93, "cost": 185}
+    },
+    "Forage & Roughage": {
+        "Lucerne (Alfalfa)": {"cp": 19.5, "me": 9.5, "dm": 85, "cost": 65},
+        "Napier Grass (Fresh)": {"cp": 9.0, "me": 8.0, "dm": 22, "cost": 15},
+        "Maize Silage": {"cp": 8.5, "me": 10.5, "dm": 35, "cost": 25},
+        "Rhodes Grass Hay": {"cp": 7.0, "me": 8.5, "dm": 88, "cost": 35}
+    }
+}
+
+# new_app.py pharmacovigilance withdrawal periods (days): group -> drug -> milk / meat / target
+PHARMA_DB = {
+    "Antibiotics": {
+        "Oxytetracycline 20%": {"milk": 7, "meat": 28, "target": "Bacterial/TBDs"},
+        "Penicillin G (Procaine)": {"milk": 3, "meat": 10, "target": "BQ/Anthrax"},
+        "Tylosin Tartrate": {"milk": 4, "meat": 21, "target": "Respiratory/CCPP"},
+        "Ceftiofur": {"milk": 0, "meat": 3, "target": "Mastitis/Pneumonia"}
+    },
+    "Acaricides/Anthelmintics": {
+        "Albendazole": {"milk": 3, "meat": 14, "target": "Internal Worms"},
+        "Ivermectin": {"milk": 28, "meat": 28, "target": "Ecto/Endo parasites"},
+        "Amitraz (Dip)": {"milk": 0, "meat": 1, "target": "Tick Control"},
+        "Levamisole": {"milk": 2, "meat": 7, "target": "Nematodes"}
+    }
+}
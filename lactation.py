@@ -0,0 +1,232 @@
+"""
+lactation.py
+Herd-scale milk forecasting with the Wood lactation curve Y(t) = a·t^b·e^(-ct).
+
+Forecasts are evaluated as one NumPy broadcast over a (cow × day) matrix,
+processed in row blocks so a 50k-cow, 305-day horizon stays within a few
+tens of MB.
+"""
+import numpy as np
+import pandas as pd
+
+# BioEngines.wood_model defaults
+WOOD_A, WOOD_B, WOOD_C = 22.0, 0.2, 0.04
+MAX_HORIZON = 305
+BLOCK_COWS = 8192
+UNASSIGNED_ROUTE = "Unassigned"
+
+
+def wood_curve(day, a=WOOD_A, b=WOOD_B, c=WOOD_C):
+    """
+    Vectorized BioEngines.wood_model; arguments broadcast. Evaluated as
+    a·exp(b·ln t - c·t), one transcendental call instead of a power and an exp.
+    """
+    day = np.asarray(day, dtype=float)
+    with np.errstate(divide="ignore"):
+        return a * np.exp(b * np.log(day) - c * day)
+
+
+def _column(values, n: int) -> np.ndarray:
+    return np.broadcast_to(np.asarray(values, dtype=float), (n,))[:, None]
+
+
+def forecast_matrix(days_in_milk, horizon: int = 7, a=WOOD_A, b=WOOD_B, c=WOOD_C) -> np.ndarray:
+    """
+    Daily yield for each cow (rows) over the next `horizon` days (columns);
+    column 0 is the cow's current day in milk. a, b, c are scalars or per-cow arrays.
+    """
+    if not 1 <= horizon <= MAX_HORIZON:
+        raise ValueError(f"horizon must be between 1 and {MAX_HORIZON} days")
+    dim = np.asarray(days_in_milk, dtype=float)
+    n = len(dim)
+    t = dim[:, None] + np.arange(horizon)[None, :]
+    return wood_curve(t, _column(a, n), _column(b, n), _column(c, n))
+
+
+def forecast_totals(days_in_milk,
+                    horizon: int = 7,
+                    a=WOOD_A, b=WOOD_B, c=WOOD_C,
+                    routes=None,
+                    block_cows: int = BLOCK_COWS) -> pd.DataFrame:
+    """
+    Expected litres per horizon day, summed per collection route.
+
+    Returns a DataFrame indexed by day offset (0 = today) with one column per
+    route (a single 'Total' column when routes is None); cows with no route
+    are summed under UNASSIGNED_ROUTE. Cows are processed in blocks of block_cows rows, grouped by route with np.add.reduceat.
+    """
+    dim = np.asarray(days_in_milk, dtype=float)
+    n = len(dim)
+    a, b, c = (np.broadcast_to(np.asarray(p, dtype=float), (n,)) for p in (a, b, c))
+    if routes is None:
+        codes, labels = np.zeros(n, dtype=int), pd.Index(["Total"])
+    else:
+        routes = np.asarray(routes, dtype=object)
+        codes, labels = pd.factorize(np.where(pd.isna(routes), UNASSIGNED_ROUTE, routes), sort=True)
+    order = np.argsort(codes, kind="stable")
+    dim, a, b, c, codes = dim[order], a[order], b[order], c[order], codes[order]
+
+    totals = np.zeros((len(labels), horizon))
+    for lo in range(0, n, block_cows):
+        hi = min(lo + block_cows, n)
+        block = forecast_matrix(dim[lo:hi], horizon, a[lo:hi], b[lo:hi], c[lo:hi])
+        starts = np.flatnonzero(np.r_[True, np.diff(codes[lo:hi]) != 0])
+        totals[codes[lo:hi][starts]] += np.add.reduceat(block, starts, axis=0)
+    return pd.DataFrame(totals.T, index=pd.RangeIndex(horizon, name="day"), columns=labels)
+
+
+# --- per-cow parameter fitting ------------------------------------------------
+
+# sums of the log-linear design f = [1, ln t, -t] and target ln y, per cow
+_FIT_SUMS = ["n", "l", "t", "ll", "lt", "tt", "y", "yl", "yt"]
+
+
+def _normal_equations(s: dict):
+    """(k, 3, 3) Gram matrices and (k, 3) right-hand sides from per-cow sums."""
+    g = np.empty((len(s["n"]), 3, 3))
+    g[:, 0, 0] = s["n"]
+    g[:, 0, 1] = g[:, 1, 0] = s["l"]
+    g[:, 0, 2] = g[:, 2, 0] = -s["t"]
+    g[:, 1, 1] = s["ll"]
+    g[:, 1, 2] = g[:, 2, 1] = -s["lt"]
+    g[:, 2, 2] = s["tt"]
+    h = np.stack([s["y"], s["yl"], -s["yt"]], axis=1)
+    return g, h
+
+
+def _solve_batch(g: np.ndarray, h: np.ndarray) -> np.ndarray:
+    """Batched 3x3 solve; rows with a (near-)singular system come back as NaN."""
+    out = np.full(h.shape, np.nan)
+    scale = np.abs(g).max(axis=(1, 2)) ** 3
+    ok = np.abs(np.linalg.det(g)) > 1e-12 * np.where(scale > 0, scale, 1.0)
+    if ok.any():
+        out[ok] = np.linalg.solve(g[ok], h[ok][..., None])[..., 0]
+    return out
+
+
+def _log_linear_sums(codes: np.ndarray, k: int, t: np.ndarray, y: np.ndarray) -> dict:
+    lt_, ly = np.log(t), np.log(y)
+    weights = {"n": None, "l": lt_, "t": t, "ll": lt_ * lt_, "lt": lt_ * t, "tt": t * t,
+               "y": ly, "yl": ly * lt_, "yt": ly * t}
+    return {name: np.bincount(codes, w, k) for name, w in weights.items()}
+
+
+def _params_frame(coef: np.ndarray, n: np.ndarray, index) -> pd.DataFrame:
+    """
+    Per-cow (a, b, c, n). Fits that are not a rise-then-decline curve
+    (non-finite, b <= 0 or c <= 0) come back as NaN so callers fall back to
+    the herd defaults instead of forecasting unbounded yields.
+    """
+    with np.errstate(over="ignore"):
+        a = np.exp(coef[:, 0])
+    b, c = coef[:, 1], coef[:, 2]
+    bad = ~(np.isfinite(a) & np.isfinite(b) & np.isfinite(c) & (b > 0) & (c > 0))
+    a, b, c = (np.where(bad, np.nan, p) for p in (a, b, c))
+    return pd.DataFrame({"a": a, "b": b, "c": c, "n": n.astype(int)}, index=index)
+
+
+def fit_wood(cow_ids, days, yields, refine: int = 0) -> pd.DataFrame:
+    """
+    Fit (a, b, c) for every cow at once from daily milk records.
+
+    The log-linear model ln y = ln a + b·ln t - c·t is solved for all cows in
+    one batched least-squares pass; refine > 0 adds that many batched
+    Gauss-Newton steps on the original scale (a step is kept per cow only if
+    it lowers that cow's squared error). Records with t <= 0 or y <= 0 are
+    ignored. Cows with fewer than three usable days, or whose fit is not a
+    plausible lactation curve (b <= 0 or c <= 0), get NaN parameters.
+    """
+    t = np.asarray(days, dtype=float)
+    y = np.asarray(yields, dtype=float)
+    ok = (t > 0) & (y > 0)
+    codes, cows = pd.factorize(np.asarray(cow_ids)[ok], sort=True)
+    t, y = t[ok], y[ok]
+    k = len(cows)
+    s = _log_linear_sums(codes, k, t, y)
+    coef = _solve_batch(*_normal_equations(s))
+    if refine:
+        coef = _gauss_newton(coef, codes, k, t, y, refine)
+    return _params_frame(coef, s["n"], pd.Index(cows, name="cow"))
+
+
+def _gauss_newton(coef, codes, k, t, y, steps):
+    """Batched Gauss-Newton on y = exp(θ0 + θ1·ln t - θ2·t), θ = (ln a, b, c)."""
+    lt_ = np.log(t)
+
+    def model(theta):
+        return np.exp(theta[codes, 0] + theta[codes, 1] * lt_ - theta[codes, 2] * t)
+
+    f = model(coef)
+    r = y - f
+    current = np.bincount(codes, r * r, k)
+    for _ in range(steps):
+        # Jacobian columns w.r.t. (ln a, b, c)
+        j = (f, f * lt_, -f * t)
+        g = np.empty((k, 3, 3))
+        for p in range(3):
+            for q in range(p, 3):
+                g[:, p, q] = g[:, q, p] = np.bincount(codes, j[p] * j[q], k)
+        h = np.stack([np.bincount(codes, jp * r, k) for jp in j], axis=1)
+        trial = coef + np.nan_to_num(_solve_batch(g, h))
+        f_trial = model(trial)
+        r_trial = y - f_trial
+        trial_sse = np.bincount(codes, r_trial * r_trial, k)
+        better = trial_sse < current
+        coef = np.where(better[:, None], trial, coef)
+        current = np.where(better, trial_sse, current)
+        keep = better[codes]
+        f = np.where(keep, f_trial, f)
+        r = np.where(keep, r_trial, r)
+    return coef
+
+
+class WoodFitter:
+    """
+    Cached per-cow Wood parameters, refreshed incrementally.
+
+    add_records() folds new milk records into per-cow log-linear sums; only
+    cows touched since the last refresh are re-solved when params is read.
+    """
+
+    def __init__(self):
+        self._ids = pd.Index([], dtype=object)
+        self._sums = {name: np.empty(0) for name in _FIT_SUMS}
+        self._coef = np.empty((0, 3))
+        self._dirty = np.empty(0, dtype=bool)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add_records(self, cow_ids, days, yields) -> None:
+        t = np.asarray(days, dtype=float)
+        y = np.asarray(yields, dtype=float)
+        ok = (t > 0) & (y > 0)
+        inv, uniq = pd.factorize(np.asarray(cow_ids, dtype=object)[ok])
+        if not len(uniq):
+            return
+        pos = self._ids.get_indexer(uniq)
+        new = pos < 0
+        if new.any():
+            start = len(self._ids)
+            self._ids = self._ids.append(pd.Index(np.asarray(uniq, dtype=object)[new], dtype=object))
+            pos[new] = np.arange(start, len(self._ids))
+            grow = int(new.sum())
+            for name in _FIT_SUMS:
+                self._sums[name] = np.concatenate([self._sums[name], np.zeros(grow)])
+            self._coef = np.vstack([self._coef, np.full((grow, 3), np.nan)])
+            self._dirty = np.concatenate([self._dirty, np.ones(grow, dtype=bool)])
+        codes = pos[inv]
+        chunk = _log_linear_sums(codes, len(self._ids), t[ok], y[ok])
+        for name in _FIT_SUMS:
+            self._sums[name] += chunk[name]
+        self._dirty[pos] = True
+
+    @property
+    def params(self) -> pd.DataFrame:
+        """DataFrame indexed by cow with columns ['a', 'b', 'c', 'n']."""
+        if self._dirty.any():
+            rows = np.flatnonzero(self._dirty)
+            sub = {name: v[rows] for name, v in self._sums.items()}
+            self._coef[rows] = _solve_batch(*_normal_equations(sub))
+            self._dirty[:] = False
+        return _params_frame(self._coef, self._sums["n"], self._ids.rename("cow"))
@@ -8,6 +8,9 @@ from typing import List, Tuple, Optional
 import numpy as np
 import pandas as pd
 
+from dates import day_values, normalize_dates
+from instrumentation import timed
+
 
 def safe_div(a: float, b: float) -> Optional[float]:
     try:
@@ -16,6 +19,7 @@ def safe_div(a: float, b: float) -> Optional[float]:
         return None
 
 
+@timed("metrics.compute_metrics")
 def compute_metrics(initial_wt: float,
                     current_wt: float,
                     days: int,
@@ -44,6 +48,7 @@ def compute_metrics(initial_wt: float,
     }
 
 
+@timed("metrics.estimate_days_to_target")
 def estimate_days_to_target(current_wt: float, target_wt: float, adg: Optional[float]) -> float:
     """
     Returns estimated days to reach target weight.
@@ -60,18 +65,13 @@ def estimate_days_to_target(current_wt: float, target_wt: float, adg: Optional[f
 
 def parse_date_column(series: pd.Series) -> pd.Series:
     """
-    Parse date-like series into datetime64[ns]; if values look like integers (days),
-    they are returned as-is (numeric).
+    Parse date-like series into datetimes; numeric days (including numbers
+    stored as text) are returned as numbers. See dates.normalize_dates.
     """
-    # Try parse to datetime; if fails, leave numeric
-    try:
-        s = pd.to_datetime(series)
-        return s
-    except Exception:
-        # maybe it's already numeric days
-        return series
+    return normalize_dates(series)
 
 
+@timed("metrics.compute_adg_from_timeseries")
 def compute_adg_from_timeseries(dates: List, weights: List[float]) -> Tuple[Optional[float], pd.DataFrame]:
     """
     Compute ADG (kg/day) using linear regression (least squares slope) on the provided
@@ -88,27 +88,172 @@ def compute_adg_from_timeseries(dates: List, weights: List[float]) -> Tuple[Opti
     if len(weights) < 2:
         return None, pd.DataFrame({"day": [], "weight": []})
 
-    df = pd.DataFrame({"date": dates, "weight": weights})
-    # Try to parse dates; if parsing works, compute day offsets
-    try:
-        df["date_parsed"] = pd.to_datetime(df["date"])
-        df = df.sort_values("date_parsed")
-        df["day"] = (df["date_parsed"] - df["date_parsed"].iloc[0]).dt.total_seconds() / (24 * 3600)
-    except Exception:
-        # treat date column as numeric days
-        df = df.sort_values("date")
-        df["day"] = pd.to_numeric(df["date"]) - float(pd.to_numeric(df["date"]).iloc[0])
-
-    # ensure numeric
-    df["weight"] = pd.to_numeric(df["weight"], errors="coerce")
-    df = df.dropna(subset=["weight", "day"])
-    if len(df) < 2:
+    day = day_values(pd.Series(dates))
+    weight = pd.to_numeric(pd.Series(weights), errors="coerce").to_numpy(dtype=float)
+    order = np.argsort(day, kind="stable")          # missing dates sort last
+    day, weight = day[order] - day[order[0]], weight[order]
+    keep = ~(np.isnan(day) | np.isnan(weight))
+    x, y = day[keep], weight[keep]
+    if len(x) < 2:
         return None, pd.DataFrame({"day": [], "weight": []})
 
-    x = df["day"].to_numpy()
-    y = df["weight"].to_numpy()
-
     # Fit linear model y = m*x + c; slope m is ADG (kg/day)
     m, c = np.polyfit(x, y, 1)
     adg = float(m)
-    return adg, df[["day", "weight"]].reset_index(drop=True)
+    return adg, pd.DataFrame({"day": x, "weight": y})
+
+
+def _as_float_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=float)
+
+
+@timed("metrics.estimate_days_to_target_batch")
+def estimate_days_to_target_batch(current_wt, target_wt, adg) -> np.ndarray:
+    """
+    Vectorized estimate_days_to_target.
+    adg may contain NaN where the scalar version would receive None;
+    those rows (and rows with adg <= 0) return inf unless already at target.
+    """
+    current_wt = _as_float_array(current_wt)
+    target_wt = _as_float_array(target_wt)
+    adg = _as_float_array(adg)
+    remaining = target_wt - current_wt
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days = np.where(adg > 0, remaining / adg, inf)
+    return np.where(remaining <= 0, 0.0, days)
+
+
+@timed("metrics.compute_metrics_batch")
+def compute_metrics_batch(initial_wt,
+                          current_wt,
+                          days,
+                          feed_used,
+                          price_per_kg,
+                          feed_cost,
+                          target_wt=None) -> pd.DataFrame:
+    """
+    Vectorized compute_metrics over many animals in one pass.
+
+    Inputs are arrays (or scalars, which broadcast) of equal length.
+    KPIs that compute_metrics reports as None are NaN here. If target_wt is
+    given, a 'days_to_target' column is added with estimate_days_to_target
+    semantics (0 at/above target, inf when ADG is missing or <= 0).
+
+    Returns a DataFrame with one row per animal and the compute_metrics keys
+    as columns.
+    """
+    initial_wt, current_wt, days, feed_used, price_per_kg, feed_cost = np.broadcast_arrays(
+        *(_as_float_array(v) for v in (initial_wt, current_wt, days, feed_used, price_per_kg, feed_cost))
+    )
+    weight_gain = current_wt - initial_wt
+    gained = weight_gain > 0
+    costs = feed_used * feed_cost
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        adg = np.where(days > 0, weight_gain / days, np.nan)
+        fcr = np.where(gained, feed_used / weight_gain, np.nan)
+        cost_per_kg_gain = np.where(gained, costs / weight_gain, np.nan)
+
+    revenue_now = current_wt * price_per_kg
+    out = pd.DataFrame({
+        "weight_gain": weight_gain,
+        "adg": adg,
+        "fcr": fcr,
+        "revenue_now": revenue_now,
+        "costs": costs,
+        "profit_now": revenue_now - costs,
+        "cost_per_kg_gain": cost_per_kg_gain,
+    })
+    if target_wt is not None:
+        out["days_to_target"] = estimate_days_to_target_batch(current_wt, target_wt, adg)
+    return out
+
+
+METRIC_INPUT_COLUMNS = ("initial_wt", "current_wt", "days", "feed_used", "price_per_kg", "feed_cost")
+
+
+def compute_metrics_frame(df: pd.DataFrame, target_col: Optional[str] = None) -> pd.DataFrame:
+    """
+    compute_metrics_batch over a DataFrame whose columns are named after the
+    compute_metrics arguments (see METRIC_INPUT_COLUMNS). The result keeps
+    df's index so it can be joined back onto the herd table.
+    """
+    missing = [c for c in METRIC_INPUT_COLUMNS if c not in df.columns]
+    if missing:
+        raise KeyError(f"missing metric input columns: {missing}")
+    target = df[target_col].to_numpy() if target_col else None
+    out = compute_metrics_batch(*(df[c].to_numpy() for c in METRIC_INPUT_COLUMNS), target_wt=target)
+    out.index = df.index
+    return out
+
+
+def to_day_values(series: pd.Series) -> np.ndarray:
+    """
+    Absolute day values (float) for a date-like or numeric-day series.
+    Dates become days since the Unix epoch; numeric input is used as-is.
+    """
+    return day_values(series)
+
+
+def regression_from_sums(n, sx, sy, sxy, sxx, syy) -> dict:
+    """
+    Closed-form least-squares line y = slope*x + intercept from running sums.
+    Works elementwise on arrays, one fit per element. slope/intercept are NaN
+    where fewer than two points or no spread in x; r2 is NaN where y is flat.
+    """
+    n, sx, sy, sxy, sxx, syy = (_as_float_array(v) for v in (n, sx, sy, sxy, sxx, syy))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cxx = sxx - sx * sx / n
+        cxy = sxy - sx * sy / n
+        cyy = syy - sy * sy / n
+        ok = (n >= 2) & (cxx > 0)
+        slope = np.where(ok, cxy / cxx, np.nan)
+        intercept = np.where(ok, (sy - slope * sx) / n, np.nan)
+        r2 = np.where(ok & (cyy > 0), cxy * cxy / (cxx * cyy), np.nan)
+    return {"slope": slope, "intercept": intercept, "r2": r2}
+
+
+@timed("metrics.compute_adg_grouped")
+def compute_adg_grouped(df: pd.DataFrame,
+                        id_col: str = "animal_id",
+                        date_col: str = "date",
+                        weight_col: str = "weight") -> pd.DataFrame:
+    """
+    Per-animal ADG regression over a long-format weigh-in table in one pass.
+
+    Equivalent to calling compute_adg_from_timeseries once per animal: day is
+    measured from each animal's first weighing, so 'intercept' is the fitted
+    weight on that day. Rows with a missing animal id, weight or date are dropped.
+
+    Returns a DataFrame indexed by animal id with columns
+    ['adg', 'intercept', 'n_points', 'r2']; adg is NaN where the scalar
+    function would return None.
+    """
+    x = to_day_values(df[date_col])
+    y = pd.to_numeric(df[weight_col], errors="coerce").to_numpy(dtype=float)
+    animal = df[id_col].to_numpy()
+    keep = ~(np.isnan(x) | np.isnan(y)) & pd.notna(animal)
+    codes, ids = pd.factorize(animal[keep], sort=True)
+    x, y = x[keep], y[keep]
+    k = len(ids)
+
+    # shift to days since each animal's first weighing
+    first = np.full(k, np.inf)
+    np.minimum.at(first, codes, x)
+    x = x - first[codes]
+
+    n = np.bincount(codes, minlength=k)
+    fit = regression_from_sums(
+        n,
+        np.bincount(codes, x, k),
+        np.bincount(codes, y, k),
+        np.bincount(codes, x * y, k),
+        np.bincount(codes, x * x, k),
+        np.bincount(codes, y * y, k),
+    )
+    return pd.DataFrame({
+        "adg": fit["slope"],
+        "intercept": fit["intercept"],
+        "n_points": n,
+        "r2": fit["r2"],
+    }, index=pd.Index(ids, name=id_col))
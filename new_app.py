@@ -7,128 +7,33 @@
 # ==============================================================================
 
 import streamlit as st
-import pandas as pd
-import numpy as np
-import time
 import random
-import json
-import base64
-from datetime import datetime, timedelta
+from datetime import datetime
+
+from instrumentation import INSTRUMENTS
+from new_app_pages import PAGES
+from new_app_pages.common import CSS, METRICS_PATH, get_store, log_action
 
 # ------------------------------------------------------------------------------
 # 1. THE DATA MOAT: GLOBAL & REGIONAL INTELLIGENCE LIBRARIES
 # ------------------------------------------------------------------------------
 
-# --- 1.1 EXPANDED CLINICAL TRIAGE (60+ CONDITIONS) ---
-CLINICAL_MASTER_DB = {
-    "Bovine: Tick-Borne": {
-        "East Coast Fever (ECF)": {"signs": "Swollen parotid lymph nodes, frothy breath, fever", "tx": "Buparvaquone (Butalex)", "triage": "Red", "vax": "ECF-ITM Muguga"},
-        "Anaplasmosis": {"signs": "Jaundice (yellow gums), constipation, anemia", "tx": "Oxytetracycline 20%", "triage": "Red", "vax": "Tick Control"},
-        "Babesiosis (Redwater)": {"signs": "Red/dark urine, high fever, pale membranes", "tx": "Diminazene Aceturate", "triage": "Red", "vax": "Tick Control"},
-        "Heartwater": {"signs": "Nervous signs (high stepping), head pressing", "tx": "Tetracyclines", "triage": "Red", "vax": "Tick Control"},
-        "Corridor Disease": {"signs": "Rapid death post-buffalo contact, pulmonary edema", "tx": "Buparvaquone", "triage": "Red", "vax": "Wildlife Buffer"},
-        "Sweating Sickness": {"signs": "Moist eczema, skin peeling, hyperthermia", "tx": "Supportive care", "triage": "Yellow", "vax": "Hyalomma Control"}
-    },
-    "Bovine: Viral & Transboundary": {
-        "FMD (Foot & Mouth)": {"signs": "Blisters on tongue/hooves, heavy salivation", "tx": "Supportive/Antiseptics", "triage": "Red", "vax": "FMD Quadrivalent (O,A,SAT1,SAT2)"},
-        "LSD (Lumpy Skin)": {"signs": "Nodules on skin, fever, edema in limbs", "tx": "Antibiotics for secondary infection", "triage": "Yellow", "vax": "LSD-Neethling Strain"},
-        "CBPP": {"signs": "Labored breathing, elbows out, head extended", "tx": "Quarantine only", "triage": "Red", "vax": "T1/44 Vaccine"},
-        "Rift Valley Fever": {"signs": "Mass abortions, liver necrosis, high fever", "tx": "No treatment", "triage": "Red", "vax": "RVF Clone 13"},
-        "Rabies": {"signs": "Aggression, salivation, paralysis", "tx": "Cull immediately", "triage": "Red", "vax": "Rabisin"},
-        "Bovine Ephemeral Fever": {"signs": "Three-day stiffness, sudden shivering", "tx": "NSAIDs/Flunixin", "triage": "Yellow", "vax": "Three-day Sickness Vax"}
-    },
-    "Bovine: Metabolic & Nutritional": {
-        "Milk Fever": {"signs": "S-curve neck, cold skin, post-calving collapse", "tx": "Calcium Borogluconate IV", "triage": "Red", "vax": "Anionic Salts Pre-Calve"},
-        "Ketosis": {"signs": "Sweet breath (acetone), drop in milk, lethargy", "tx": "Propylene glycol", "triage": "Yellow", "vax": "High Energy Transition Diet"},
-        "Frothy Bloat": {"signs": "Left flank distension, respiratory distress", "tx": "Anti-foaming agent/Trocar", "triage": "Red", "vax": "Antizymotics"},
-        "Acidosis": {"signs": "Laminitis, grey diarrhea, low rumen pH", "tx": "Sodium Bicarbonate", "triage": "Yellow", "vax": "TMR Buffering"},
-        "Hypomagnesemia (Grass Staggers)": {"signs": "Muscle tremors, convulsions, sudden death", "tx": "Magnesium Sulfate", "triage": "Red", "vax": "Magnesium Supplementation"},
-        "Hardware Disease": {"signs": "Reluctance to move, grunting, arched back", "tx": "Magnet/Surgery", "triage": "Red", "vax": "Magnetic Oral Bolus"}
-    },
-    "Poultry: Industrial Pathogens": {
-        "Newcastle Disease (vND)": {"signs": "Twisted neck, green diarrhea, respiratory gasping", "tx": "None", "triage": "Red", "vax": "Lasota / HB1"},
-        "Gumboro (IBD)": {"signs": "Watery diarrhea, self-pecking at vent, trembling", "tx": "Electrolytes", "triage": "Red", "vax": "IBD Intermediate Plus"},
-        "Fowl Pox": {"signs": "Warty scabs on comb/wattles", "tx": "Antiseptics", "triage": "Yellow", "vax": "Fowl Pox Wing Web"},
-        "Coccidiosis": {"signs": "Bloody droppings, ruffled feathers", "tx": "Amprolium / Toltrazuril", "triage": "Yellow", "vax": "Coccivax"},
-        "Marek's Disease": {"signs": "Sciatic paralysis (one leg forward), blindness", "tx": "Cull", "triage": "Red", "vax": "HVT at Day 0"},
-        "Fowl Cholera": {"signs": "Green/Yellow diarrhea, swollen wattles", "tx": "Sulfonamides", "triage": "Red", "vax": "Pasteurella Multocida Vax"},
-        "Infectious Coryza": {"signs": "Facial edema, foul nasal discharge", "tx": "Erythromycin", "triage": "Yellow", "vax": "Coryza Vax"},
-        "Avian Influenza (H5N1)": {"signs": "Cyanosis of comb, sudden death, head swelling", "tx": "NOTIFY GOVT", "triage": "Red", "vax": "Emergency Only"}
-    }
-}
-
-# --- 1.2 THE NUTRITIONAL MATRIX (40+ INGREDIENTS) ---
-FEED_LIBRARY = {
-    "Basal Energy": {
-        "Maize Bran": {"cp": 8.0, "me": 11.5, "dm": 88, "cost": 38},
-        "Wheat Pollard": {"cp": 15.0, "me": 10.2, "dm": 89, "cost": 42},
-        "Maize Germ": {"cp": 10.5, "me": 12.0, "dm": 90, "cost": 45},
-        "Molasses": {"cp": 3.0, "me": 13.2, "dm": 75, "cost": 30}
-    },
-    "Protein Concentrates": {
-        "Soya Bean Meal": {"cp": 45.0, "me": 12.5, "dm": 90, "cost": 105},
-        "Cotton Seed Cake": {"cp": 28.0, "me": 10.5, "dm": 92, "cost": 72},
-        "Sunflower Meal": {"cp": 26.0, "me": 9.8, "dm": 91, "cost": 48},
-        "Fish Meal": {"cp": 62.0, "me": 12.2, "dm": 93, "cost": 185}
-    },
-    "Forage & Roughage": {
-        "Lucerne (Alfalfa)": {"cp": 19.5, "me": 9.5, "dm": 85, "cost": 65},
-        "Napier Grass (Fresh)": {"cp": 9.0, "me": 8.0, "dm": 22, "cost": 15},
-        "Maize Silage": {"cp": 8.5, "me": 10.5, "dm": 35, "cost": 25},
-        "Rhodes Grass Hay": {"cp": 7.0, "me": 8.5, "dm": 88, "cost": 35}
-    }
-}
-
-# --- 1.3 PHARMACOVIGILANCE SAFETY MATRIX ---
-PHARMA_DB = {
-    "Antibiotics": {
-        "Oxytetracycline 20%": {"milk": 7, "meat": 28, "target": "Bacterial/TBDs"},
-        "Penicillin G (Procaine)": {"milk": 3, "meat": 10, "target": "BQ/Anthrax"},
-        "Tylosin Tartrate": {"milk": 4, "meat": 21, "target": "Respiratory/CCPP"},
-        "Ceftiofur": {"milk": 0, "meat": 3, "target": "Mastitis/Pneumonia"}
-    },
-    "Acaricides/Anthelmintics": {
-        "Albendazole": {"milk": 3, "meat": 14, "target": "Internal Worms"},
-        "Ivermectin": {"milk": 28, "meat": 28, "target": "Ecto/Endo parasites"},
-        "Amitraz (Dip)": {"milk": 0, "meat": 1, "target": "Tick Control"},
-        "Levamisole": {"milk": 2, "meat": 7, "target": "Nematodes"}
-    }
-}
+# CLINICAL_MASTER_DB, FEED_LIBRARY and PHARMA_DB live in knowledge_base.py, loaded
+# once per process by the pages that use them
 
 # ------------------------------------------------------------------------------
 # 2. SCIENTIFIC LOGIC ENGINES (PROPRIETARY)
 # ------------------------------------------------------------------------------
 
-class BioEngines:
-    @staticmethod
-    def pearson_square(target_cp, f1_cp, f2_cp):
-        if not (min(f1_cp, f2_cp) < target_cp < max(f1_cp, f2_cp)):
-            return None
-        p1 = abs(f2_cp - target_cp)
-        p2 = abs(f1_cp - target_cp)
-        return (p1/(p1+p2))*100, (p2/(p1+p2))*100
-
-    @staticmethod
-    def wood_model(day, a=22, b=0.2, c=0.04):
-        # Y(t) = at^b * e^-ct (Biological Lactation Curve)
-        return a * (day**b) * np.exp(-c * day)
-
-    @staticmethod
-    def thi_index(temp, humidity):
-        # Temperature Humidity Index for Heat Stress
-        return (0.8 * temp) + ((humidity/100) * (temp - 14.4)) + 46.4
+# BioEngines (Pearson square, Wood lactation curve, THI) live in bio_engines.py
 
 # ------------------------------------------------------------------------------
 # 3. STATE MANAGEMENT & SYSTEM ARCHITECTURE
 # ------------------------------------------------------------------------------
 
-if 'db' not in st.session_state: st.session_state.db = []
+# Stores and the audit log live in new_app_pages/common.py
+store = get_store()
 if 'ledger' not in st.session_state: st.session_state.ledger = []
-if 'audit' not in st.session_state: st.session_state.audit = []
-
-def log_action(msg, level="INFO"):
-    entry = f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] [{level}] {msg}"
-    st.session_state.audit.append(entry)
 
 # ------------------------------------------------------------------------------
 # 4. STREAMLIT UI: THE COMMAND INTERFACE
@@ -136,34 +41,14 @@ def log_action(msg, level="INFO"):
 
 st.set_page_config(page_title="AEGIS v35.0 Sovereign", layout="wide", page_icon="🛡️")
 
-# CSS for Enterprise Look
-st.markdown("""
-    <style>
-    .main { background-color: #f5f7f9; }
-    .stMetric { background-color: #ffffff; padding: 15px; border-radius: 10px; border: 1px solid #e1e4e8; }
-    </style>
-    """, unsafe_allow_html=True)
+st.markdown(CSS, unsafe_allow_html=True)
 
 with st.sidebar:
     st.image("https://upload.wikimedia.org/wikipedia/en/thumb/7/71/University_of_Nairobi_Logo.png/220px-University_of_Nairobi_Logo.png", width=100)
     st.title("🛡️ AEGIS v35.0")
     st.caption("Lead: Eric Kamau | AEGIS Project")
     
-    nav = st.radio("Sovereign Modules", [
-        "📊 Command Dashboard",
-        "🧪 Precision Nutrition Lab",
-        "🩺 Clinical Triage (Deep Data)",
-        "👁️ FAMACHA Anemia Lab",
-        "☣️ Bio-Security Lockdown",
-        "🥛 Brookside Logistics Hub",
-        "🐤 Kenchic Batch Unit",
-        "🧬 Genetic Breed Registry",
-        "📅 Pharmacovigilance Hub",
-        "♻️ Green Hub (Carbon)",
-        "🆔 Digital Passports",
-        "📡 National Data Uplink",
-        "⚙️ Admin & Audit Control"
-    ])
+    nav = st.radio("Sovereign Modules", PAGES.labels())
     
     st.divider()
     with st.form("asset_intake"):
@@ -173,194 +58,20 @@ with st.sidebar:
         breed = st.selectbox("Genetic Breed", ["Holstein", "Jersey", "Ayrshire", "Boran", "Sahiwal", "Kienyeji"])
         wt = st.number_input("Weight (kg)", 0.1, 1500.0, 350.0)
         day = st.number_input("Production Day", 0, 1000, 45)
+        route = st.text_input("Collection Route", "AEG-TRUCK-09")
         if st.form_submit_button("DEPLOY TO CLOUD"):
-            st.session_state.db.append({"uid": uid, "spec": cat, "breed": breed, "wt": wt, "day": day, "date": datetime.now()})
-            log_action(f"Deployed Asset {uid} ({breed})", "CORE")
+            store.insert({"uid": uid, "spec": cat, "breed": breed, "wt": wt, "day": day,
+                          "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "route": route})
+            log_action(f"Deployed Asset {uid} ({breed})", "CORE", asset=uid)
             st.rerun()
 
 # ------------------------------------------------------------------------------
 # 5. MODULE IMPLEMENTATIONS (HIGH DENSITY)
 # ------------------------------------------------------------------------------
 
-# --- A. COMMAND DASHBOARD ---
-if nav == "📊 Command Dashboard":
-    st.header("📈 Enterprise Tactical Dashboard")
-    
-    if st.session_state.db:
-        df = pd.DataFrame(st.session_state.db)
-        c1, c2, c3, c4 = st.columns(4)
-        c1.metric("Herd Population", len(df))
-        c2.metric("Total Biomass", f"{df['wt'].sum():,.1f} kg")
-        c3.metric("System Integrity", "99.99%")
-        c4.metric("Market Sentiment", "Bullish")
-        
-        st.divider()
-        col_l, col_r = st.columns(2)
-        with col_l:
-            st.subheader("Population by Species")
-            st.bar_chart(df['spec'].value_counts())
-        with col_r:
-            st.subheader("Recent Deployment Logs")
-            st.dataframe(df.tail(5), use_container_width=True)
-    else:
-        st.info("System Ready. Please ingest assets via the Command Sidebar.")
-
-# --- B. NUTRITION LAB ---
-elif nav == "🧪 Precision Nutrition Lab":
-    st.header("🧪 Precision Ration Optimizer")
-    
-    target_cp = st.slider("Target Crude Protein %", 8.0, 30.0, 16.0)
-    
-    col1, col2 = st.columns(2)
-    cat_e = col1.selectbox("Basal Group", list(FEED_LIBRARY.keys()))
-    f1 = col1.selectbox("Energy Feed", list(FEED_LIBRARY[cat_e].keys()))
-    cat_p = col2.selectbox("Supplement Group", list(FEED_LIBRARY.keys()))
-    f2 = col2.selectbox("Protein Feed", list(FEED_LIBRARY[cat_p].keys()))
-    
-    res = BioEngines.pearson_square(target_cp, FEED_LIBRARY[cat_e][f1]['cp'], FEED_LIBRARY[cat_p][f2]['cp'])
-    
-    if res:
-        st.success(f"**Optimization Found:** {res[0]:.1f}% {f1} | {res[1]:.1f}% {f2}")
-        cost = (res[0]/100 * FEED_LIBRARY[cat_e][f1]['cost']) + (res[1]/100 * FEED_LIBRARY[cat_p][f2]['cost'])
-        st.metric("Estimated Cost per KG", f"KES {cost:.2f}")
-    else:
-        st.error("Mathematics Error: Target CP is outside the range of selected feeds.")
-
-# --- C. CLINICAL TRIAGE ---
-elif nav == "🩺 Clinical Triage (Deep Data)":
-    st.header("🩺 Sovereign Clinical Diagnostic Engine")
-    
-    group = st.selectbox("Pathogen Category", list(CLINICAL_MASTER_DB.keys()))
-    cond = st.selectbox("Observed Symptomatology", list(CLINICAL_MASTER_DB[group].keys()))
-    
-    data = CLINICAL_MASTER_DB[group][cond]
-    with st.container(border=True):
-        col1, col2 = st.columns([1, 2])
-        with col1:
-            if data['triage'] == "Red": st.error(f"🚨 EMERGENCY: {data['triage']}")
-            else: st.warning(f"⚠️ URGENT: {data['triage']}")
-            st.write(f"**Recommended Vaccine:** {data['vax']}")
-        with col2:
-            st.subheader(cond)
-            st.info(f"**Clinical Signs:** {data['signs']}")
-            st.write(f"**Intervention:** {data['tx']}")
-
-# --- D. FAMACHA LAB ---
-elif nav == "👁️ FAMACHA Anemia Lab":
-    st.header("👁️ FAMACHA Targeted Selective Treatment")
-    st.camera_input("Mucous Membrane Scan (Real-time)")
-    score = st.select_slider("Anemia Visual Match", options=[1, 2, 3, 4, 5])
-    if score >= 4:
-        st.error("🆘 CRITICAL: Severe Anemia. Dose with Levamisole immediately.")
-    elif score == 3:
-        st.warning("⚠️ BORDERLINE: Iron/Nutritional deficiency detected.")
-    else:
-        st.success("✅ OPTIMAL: Animal shows resilience to Haemonchus contortus.")
-
-# --- E. BIO-SECURITY ---
-elif nav == "☣️ Bio-Security Lockdown":
-    st.header("☣️ Level 4 Bio-Security Protocols")
-    
-    st.warning("Active Threat Monitoring: H5N1 / FMD / ASF")
-    
-    cols = st.columns(3)
-    cols[0].checkbox("Virkon S Footbath Active", value=True)
-    cols[1].checkbox("Vehicle Tire Dip Engaged", value=True)
-    cols[2].checkbox("PPE Enforced for All Staff", value=True)
-    
-    mort = st.number_input("Daily Mortality Count", 0, 5000, 2)
-    if mort > 10:
-        st.error("🚨 THRESHOLD EXCEEDED: Lockdown initiated. Notify National Veterinary Hub.")
-    else:
-        st.success("STABLE: Biosecurity integrity confirmed.")
-
-# --- F. BROOKSIDE LOGISTICS ---
-elif nav == "🥛 Brookside Logistics Hub":
-    st.header("🥛 Brookside Supply Chain Optimization")
-    
-    if st.session_state.db:
-        df = pd.DataFrame(st.session_state.db)
-        dairy = df[df['spec'] == "Dairy"]
-        if not dairy.empty:
-            forecast = [sum([BioEngines.wood_model(row['day']+d) for i, row in dairy.iterrows()]) for d in range(7)]
-            st.line_chart(forecast)
-            st.metric("Expected 24h Yield (Liters)", f"{int(forecast[0])}")
-            st.info("Logistics Uplink: Cold-chain truck AEG-TRUCK-09 assigned.")
-        else: st.warning("No dairy assets found.")
-
-# --- G. KENCHIC BATCH ---
-elif nav == "🐤 Kenchic Batch Unit":
-    st.header("🐤 Kenchic Industrial Performance")
-    col1, col2, col3 = st.columns(3)
-    b_size = col1.number_input("Batch Size", 100, 100000, 1000)
-    feed = col2.number_input("Total Feed (kg)", 1.0, 500000.0, 1800.0)
-    wt_gain = col3.number_input("Total Biomass Gain (kg)", 1.0, 100000.0, 950.0)
-    
-    fcr = feed / wt_gain
-    st.metric("Feed Conversion Ratio (FCR)", f"{fcr:.2f}")
-    if fcr > 1.8: st.warning("Efficiency Loss: Check feed wastage or sub-clinical disease.")
-
-# --- H. PHARMACOVIGILANCE ---
-elif nav == "📅 Pharmacovigilance Hub":
-    st.header("📅 Withdrawal Period Control")
-    cat = st.selectbox("Medicine Group", list(PHARMA_DB.keys()))
-    drug = st.selectbox("Drug Administered", list(PHARMA_DB[cat].keys()))
-    d_date = st.date_input("Administration Date")
-    
-    info = PHARMA_DB[cat][drug]
-    m_safe = d_date + timedelta(days=info['milk'])
-    t_safe = d_date + timedelta(days=info['meat'])
-    
-    with st.container(border=True):
-        st.write(f"### Product: {drug}")
-        if datetime.now().date() < m_safe: st.error(f"🚫 MILK UNSAFE UNTIL {m_safe}")
-        else: st.success("✅ MILK SAFE")
-        
-        if datetime.now().date() < t_safe: st.error(f"🚫 MEAT UNSAFE UNTIL {t_safe}")
-        else: st.success("✅ MEAT SAFE")
-
-# --- I. GREEN HUB ---
-elif nav == "♻️ Green Hub (Carbon)":
-    st.header("🌍 Methane Mitigation & Carbon Ledger")
-    
-    if st.session_state.db:
-        total_wt = sum([x['wt'] for x in st.session_state.db])
-        co2e = (total_wt * 0.035) / 1000 # Tons
-        st.metric("Annual Carbon Offset (Tons CO2e)", f"{co2e:.4f}")
-        st.success(f"Voluntary Carbon Credit Value: KES {co2e * 2800:,.2f}")
-
-# --- J. DIGITAL PASSPORTS ---
-elif nav == "🆔 Digital Passports":
-    st.header("🆔 Sovereign Digital Asset Passport")
-    if st.session_state.db:
-        target = st.selectbox("Select Asset UID", [x['uid'] for x in st.session_state.db])
-        qr_code = f"https://api.qrserver.com/v1/create-qr-code/?size=200x200&data=AEGIS_VERIFIED_{target}"
-        
-        p1, p2 = st.columns([2,1])
-        with p1:
-            st.write(f"### UID: {target}")
-            st.write("**Verification:** UoN Sovereign Node")
-            st.write("**Traceability:** Fully Documented")
-        p2.image(qr_code, caption="Blockchain Trust Badge")
-
-# --- K. NATIONAL UPLINK ---
-elif nav == "📡 National Data Uplink":
-    st.header("📡 National Agricultural Data Gateway")
-    
-    if st.button("EXECUTE ENCRYPTED UPLINK"):
-        with st.status("Establishing SSL Tunnel to KALRO..."):
-            time.sleep(2)
-        st.success("✅ UPLINK COMPLETE: REF-UON-2026-SOVEREIGN")
-
-# --- L. ADMIN PANEL ---
-elif nav == "⚙️ Admin & Audit Control":
-    st.header("⚙️ System Administration")
-    if st.button("🔴 PURGE SYSTEM CACHE"):
-        st.session_state.db = []
-        st.rerun()
-    
-    st.subheader("System Audit Log")
-    for log in reversed(st.session_state.audit): st.caption(log)
+# Each module is its own file in new_app_pages/, imported the first time it is selected
+PAGES.render(nav)
+INSTRUMENTS.export(METRICS_PATH)
 
 # ------------------------------------------------------------------------------
 # 6. SYSTEM FOOTER
@@ -0,0 +1,20 @@
+"""
+new_app_pages
+new_app.py Sovereign Modules, one module per menu entry, imported on first selection.
+"""
+from page_registry import PageRegistry
+
+PAGES = (PageRegistry(__name__)
+         .add("📊 Command Dashboard", "dashboard")
+         .add("🧪 Precision Nutrition Lab", "nutrition")
+         .add("🩺 Clinical Triage (Deep Data)", "triage")
+         .add("👁️ FAMACHA Anemia Lab", "famacha")
+         .add("☣️ Bio-Security Lockdown", "biosecurity")
+         .add("🥛 Brookside Logistics Hub", "brookside")
+         .add("🐤 Kenchic Batch Unit", "kenchic")
+         .add("🧬 Genetic Breed Registry", None)
+         .add("📅 Pharmacovigilance Hub", "pharmacovigilance")
+         .add("♻️ Green Hub (Carbon)", "green_hub")
+         .add("🆔 Digital Passports", "passports")
+         .add("📡 National Data Uplink", "uplink")
+         .add("⚙️ Admin & Audit Control", "admin"))
@@ -0,0 +1,47 @@
+import pandas as pd
+import streamlit as st
+
+from instrumentation import INSTRUMENTS
+from new_app_pages.common import (METRICS_PATH, get_audit_log, get_milk_store, get_store, get_treatment_store,
+                                  log_action)
+
+
+def render():
+    st.header("⚙️ System Administration")
+    if st.button("🔴 PURGE SYSTEM CACHE"):
+        from new_app_pages.brookside import get_wood_fitter
+        get_store().clear()
+        get_milk_store().clear()
+        get_treatment_store().clear()
+        get_wood_fitter.clear()
+        log_action("System cache purged", "WARN")
+        st.rerun()
+    
+    st.subheader("System Audit Log")
+    audit = get_audit_log()
+    f1, f2, f3 = st.columns(3)
+    a_level = f1.selectbox("Level", ["All"] + audit.levels())
+    a_asset = f2.text_input("Asset ID", "").strip()
+    per_page = 50
+    a_page = f3.number_input("Page", 1, 10_000, 1) - 1
+    entries, total = audit.page(a_page, per_page, level=None if a_level == "All" else a_level, asset=a_asset or None)
+    st.caption(f"{total} matching entries | page {a_page + 1} of {max(1, -(-total // per_page))}")
+    if entries:
+        st.dataframe(pd.DataFrame([{"Time": e.ts.replace("T", " "), "Level": e.level, "Asset": e.asset or "",
+                                    "Event": e.message} for e in entries]), use_container_width=True, hide_index=True)
+
+    st.subheader("Render Timing")
+    INSTRUMENTS.enabled = st.toggle("Instrumentation", INSTRUMENTS.enabled,
+                                    help="Off: spans become no-ops and timed calls pass straight through.")
+    timings = INSTRUMENTS.snapshot()
+    if len(timings):
+        st.dataframe(timings.round(3), use_container_width=True, hide_index=True)
+        st.caption(f"Rolling percentiles over the last {INSTRUMENTS.window} calls per span | "
+                   f"Prometheus export: {METRICS_PATH}")
+        t1, t2 = st.columns(2)
+        t1.download_button("⬇️ Prometheus Metrics", INSTRUMENTS.to_prometheus(), file_name="aegis_metrics.prom",
+                           mime="text/plain")
+        if t2.button("Reset Timings"):
+            INSTRUMENTS.reset(); st.rerun()
+    else:
+        st.info("No spans recorded yet.")
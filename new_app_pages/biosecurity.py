@@ -0,0 +1,18 @@
+import streamlit as st
+
+
+def render():
+    st.header("☣️ Level 4 Bio-Security Protocols")
+    
+    st.warning("Active Threat Monitoring: H5N1 / FMD / ASF")
+    
+    cols = st.columns(3)
+    cols[0].checkbox("Virkon S Footbath Active", value=True)
+    cols[1].checkbox("Vehicle Tire Dip Engaged", value=True)
+    cols[2].checkbox("PPE Enforced for All Staff", value=True)
+    
+    mort = st.number_input("Daily Mortality Count", 0, 5000, 2)
+    if mort > 10:
+        st.error("🚨 THRESHOLD EXCEEDED: Lockdown initiated. Notify National Veterinary Hub.")
+    else:
+        st.success("STABLE: Biosecurity integrity confirmed.")
@@ -0,0 +1,50 @@
+"""
+new_app_pages/common.py
+Process-wide stores, audit trail and helpers shared by new_app.py and its pages.
+"""
+import os
+
+import streamlit as st
+
+from audit_log import AuditLog
+from herd_store import (ASSET_INDEXES, ASSET_SCHEMA, MILK_INDEXES, MILK_SCHEMA, TREATMENT_INDEXES,
+                        TREATMENT_SCHEMA, HerdStore)
+
+METRICS_PATH = os.environ.get("AEGIS_METRICS_PATH", "aegis_metrics.prom")
+
+# CSS for Enterprise Look
+CSS = """
+    <style>
+    .main { background-color: #f5f7f9; }
+    .stMetric { background-color: #ffffff; padding: 15px; border-radius: 10px; border: 1px solid #e1e4e8; }
+    </style>
+    """
+
+
+@st.cache_resource
+def get_store():
+    # Durable asset registry (SQLite/WAL), opened once per process
+    return HerdStore(os.environ.get("AEGIS_DB_PATH", "aegis_herd.db"),
+                     table="assets", schema=ASSET_SCHEMA, indexes=ASSET_INDEXES)
+
+
+@st.cache_resource
+def get_milk_store():
+    return HerdStore(os.environ.get("AEGIS_DB_PATH", "aegis_herd.db"),
+                     table="milk", schema=MILK_SCHEMA, indexes=MILK_INDEXES)
+
+
+@st.cache_resource
+def get_treatment_store():
+    return HerdStore(os.environ.get("AEGIS_DB_PATH", "aegis_herd.db"),
+                     table="treatments", schema=TREATMENT_SCHEMA, indexes=TREATMENT_INDEXES)
+
+
+@st.cache_resource
+def get_audit_log():
+    # bounded ring buffer + size-rotated JSONL on disk, shared by all sessions
+    return AuditLog(os.environ.get("AEGIS_AUDIT_PATH", "aegis_audit.jsonl"))
+
+
+def log_action(msg, level="INFO", asset=None):
+    get_audit_log().log(msg, level, asset)
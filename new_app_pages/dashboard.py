@@ -0,0 +1,28 @@
+import streamlit as st
+
+from new_app_pages.common import get_store
+
+
+def render():
+    store = get_store()
+    st.header("📈 Enterprise Tactical Dashboard")
+    
+    if store.count():
+        totals = store.aggregate({"head": "COUNT(*)", "biomass": "SUM(wt)"}).iloc[0]
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("Herd Population", int(totals['head']))
+        c2.metric("Total Biomass", f"{totals['biomass']:,.1f} kg")
+        c3.metric("System Integrity", "99.99%")
+        c4.metric("Market Sentiment", "Bullish")
+        
+        st.divider()
+        col_l, col_r = st.columns(2)
+        with col_l:
+            st.subheader("Population by Species")
+            st.bar_chart(store.aggregate({"count": "COUNT(*)"}, group_by=["spec"]).set_index("spec")["count"])
+        with col_r:
+            st.subheader("Recent Deployment Logs")
+            recent = store.fetch(order_by="rowid DESC", limit=5).iloc[::-1].reset_index(drop=True)
+            st.dataframe(recent, use_container_width=True)
+    else:
+        st.info("System Ready. Please ingest assets via the Command Sidebar.")
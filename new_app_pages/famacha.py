@@ -0,0 +1,13 @@
+import streamlit as st
+
+
+def render():
+    st.header("👁️ FAMACHA Targeted Selective Treatment")
+    st.camera_input("Mucous Membrane Scan (Real-time)")
+    score = st.select_slider("Anemia Visual Match", options=[1, 2, 3, 4, 5])
+    if score >= 4:
+        st.error("🆘 CRITICAL: Severe Anemia. Dose with Levamisole immediately.")
+    elif score == 3:
+        st.warning("⚠️ BORDERLINE: Iron/Nutritional deficiency detected.")
+    else:
+        st.success("✅ OPTIMAL: Animal shows resilience to Haemonchus contortus.")
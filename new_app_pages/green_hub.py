@@ -0,0 +1,14 @@
+import streamlit as st
+
+from new_app_pages.common import get_store
+
+
+def render():
+    store = get_store()
+    st.header("🌍 Methane Mitigation & Carbon Ledger")
+    
+    if store.count():
+        total_wt = store.aggregate({"wt": "SUM(wt)"}).iloc[0]["wt"]
+        co2e = (total_wt * 0.035) / 1000 # Tons
+        st.metric("Annual Carbon Offset (Tons CO2e)", f"{co2e:.4f}")
+        st.success(f"Voluntary Carbon Credit Value: KES {co2e * 2800:,.2f}")
@@ -0,0 +1,13 @@
+import streamlit as st
+
+
+def render():
+    st.header("🐤 Kenchic Industrial Performance")
+    col1, col2, col3 = st.columns(3)
+    b_size = col1.number_input("Batch Size", 100, 100000, 1000)
+    feed = col2.number_input("Total Feed (kg)", 1.0, 500000.0, 1800.0)
+    wt_gain = col3.number_input("Total Biomass Gain (kg)", 1.0, 100000.0, 950.0)
+    
+    fcr = feed / wt_gain
+    st.metric("Feed Conversion Ratio (FCR)", f"{fcr:.2f}")
+    if fcr > 1.8: st.warning("Efficiency Loss: Check feed wastage or sub-clinical disease.")
@@ -0,0 +1,74 @@
+import pandas as pd
+import streamlit as st
+
+from bio_engines import BioEngines
+from knowledge_base import FEED_LIBRARY
+from ration import RationOptimizer, feed_table
+
+
+@st.cache_resource
+def get_ration_optimizer(ingredients):
+    # one memo per ingredient set; rations are cached by their full constraint set
+    return RationOptimizer(feed_table(FEED_LIBRARY, ingredients))
+
+
+def render():
+    st.header("🧪 Precision Ration Optimizer")
+    
+    all_feeds = feed_table(FEED_LIBRARY)
+    tab_lc, tab_pens, tab_ps = st.tabs(["Least-Cost Formulation", "Pen Reformulation", "Pearson Square"])
+    
+    with tab_lc:
+        picked = st.multiselect("Ingredients", list(all_feeds.index), default=list(all_feeds.index))
+        col1, col2, col3 = st.columns(3)
+        lc_cp = col1.slider("Min Crude Protein %", 8.0, 30.0, 16.0)
+        lc_me = col2.slider("Min ME (MJ/kg)", 7.0, 13.0, 10.0)
+        lc_dm = col3.slider("Min Dry Matter %", 20.0, 92.0, 80.0)
+        if picked:
+            limits = st.data_editor(
+                pd.DataFrame({"cost": all_feeds.loc[picked, "cost"], "min %": 0.0, "max %": 100.0}),
+                use_container_width=True, key="ration_limits")
+            optimizer = get_ration_optimizer(tuple(picked))
+            ration = optimizer.solve(
+                pd.DataFrame({"cp_min": [lc_cp], "me_min": [lc_me], "dm_min": [lc_dm]}),
+                cost=limits["cost"].to_numpy(float),
+                min_incl=limits["min %"].to_numpy(float) / 100, max_incl=limits["max %"].to_numpy(float) / 100,
+            ).iloc[0]
+            if ration["status"] == "optimal":
+                mix = ration[picked].astype(float)
+                st.success(f"**Optimization Found:** CP {ration['cp']:.1f}% | ME {ration['me']:.2f} MJ/kg | DM {ration['dm']:.1f}%")
+                st.metric("Least Cost per KG", f"KES {ration['cost']:.2f}")
+                st.dataframe((mix[mix > 1e-6] * 100).rename("Inclusion %").to_frame(), use_container_width=True)
+            else:
+                st.error("No ration meets these constraints with the selected ingredients.")
+    
+    with tab_pens:
+        st.caption("One ration per pen, solved in a single batch; unchanged pens come from cache.")
+        pens = st.data_editor(
+            pd.DataFrame({"cp_min": [14.0, 16.0, 18.0], "me_min": [9.5, 10.0, 10.5], "dm_min": [80.0, 80.0, 85.0]},
+                         index=pd.Index(["Pen A", "Pen B", "Pen C"], name="pen")),
+            num_rows="dynamic", use_container_width=True, key="ration_pens")
+        price_shift = st.slider("Ingredient Price Change %", -30, 30, 0)
+        optimizer = get_ration_optimizer(tuple(all_feeds.index))
+        plan = optimizer.solve(pens.dropna(how="all"), cost=all_feeds["cost"].to_numpy() * (1 + price_shift / 100))
+        used = [c for c in all_feeds.index if plan[c].fillna(0).gt(1e-6).any()]
+        st.dataframe(pd.concat([(plan[used] * 100).round(1), plan[["cost", "cp", "me", "dm", "status"]]], axis=1),
+                     use_container_width=True)
+    
+    with tab_ps:
+        target_cp = st.slider("Target Crude Protein %", 8.0, 30.0, 16.0)
+        
+        col1, col2 = st.columns(2)
+        cat_e = col1.selectbox("Basal Group", list(FEED_LIBRARY.keys()))
+        f1 = col1.selectbox("Energy Feed", list(FEED_LIBRARY[cat_e].keys()))
+        cat_p = col2.selectbox("Supplement Group", list(FEED_LIBRARY.keys()))
+        f2 = col2.selectbox("Protein Feed", list(FEED_LIBRARY[cat_p].keys()))
+        
+        res = BioEngines.pearson_square(target_cp, FEED_LIBRARY[cat_e][f1]['cp'], FEED_LIBRARY[cat_p][f2]['cp'])
+        
+        if res:
+            st.success(f"**Optimization Found:** {res[0]:.1f}% {f1} | {res[1]:.1f}% {f2}")
+            cost = (res[0]/100 * FEED_LIBRARY[cat_e][f1]['cost']) + (res[1]/100 * FEED_LIBRARY[cat_p][f2]['cost'])
+            st.metric("Estimated Cost per KG", f"KES {cost:.2f}")
+        else:
+            st.error("Mathematics Error: Target CP is outside the range of selected feeds.")
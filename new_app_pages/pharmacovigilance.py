@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from knowledge_base import PHARMA_DB
+from new_app_pages.common import get_store, get_treatment_store, log_action
+from withdrawal import WithdrawalRegistry
+
+
+@st.cache_resource(max_entries=1)
+def get_withdrawal_registry(version):
+    # interval index over the treatment log, rebuilt only when the log changes
+    log = get_treatment_store().fetch()
+    return WithdrawalRegistry(pd.DataFrame({
+        "Animal ID": log["uid"], "Drug": log["drug"], "Date": log["date"],
+        "Milk Days": log["milk_days"], "Meat Days": log["meat_days"],
+    }))
+
+
+def render():
+    store, treatment_store = get_store(), get_treatment_store()
+    st.header("📅 Withdrawal Period Control")
+    cat = st.selectbox("Medicine Group", list(PHARMA_DB.keys()))
+    drug = st.selectbox("Drug Administered", list(PHARMA_DB[cat].keys()))
+    d_date = st.date_input("Administration Date")
+    
+    info = PHARMA_DB[cat][drug]
+    m_safe = d_date + timedelta(days=info['milk'])
+    t_safe = d_date + timedelta(days=info['meat'])
+    
+    with st.container(border=True):
+        st.write(f"### Product: {drug}")
+        if datetime.now().date() < m_safe: st.error(f"🚫 MILK UNSAFE UNTIL {m_safe}")
+        else: st.success("✅ MILK SAFE")
+        
+        if datetime.now().date() < t_safe: st.error(f"🚫 MEAT UNSAFE UNTIL {t_safe}")
+        else: st.success("✅ MEAT SAFE")
+        
+        uids = store.fetch(["uid"])['uid'].dropna().unique().tolist() if store.count() else []
+        tx_animals = st.multiselect("Treated Animals", sorted(uids))
+        if st.button("LOG TREATMENT", disabled=not tx_animals):
+            treatment_store.insert_many({"uid": uid, "drug": drug, "date": str(d_date),
+                                         "milk_days": info['milk'], "meat_days": info['meat']} for uid in tx_animals)
+            for uid in tx_animals:
+                log_action(f"Treatment logged: {drug}", asset=uid)
+            st.success(f"Withdrawal recorded for {len(tx_animals)} animal(s).")
+    
+    registry = get_withdrawal_registry(treatment_store.version)
+    st.subheader(f"Herd Withdrawal Register ({len(registry)} treatments)")
+    c1, c2 = st.columns(2)
+    q_date = c1.date_input("Check Date", key="wd_date")
+    q_product = c2.radio("Product", ["milk", "meat"], horizontal=True)
+    unsafe = registry.unsafe_animals(q_date, q_product)
+    if unsafe.empty: st.success(f"✅ No animals under {q_product} withdrawal on {q_date}.")
+    else: st.dataframe(unsafe, use_container_width=True, hide_index=True)
+    
+    manifest_file = st.file_uploader("Milk Collection Manifest (CSV: Load, Animal ID[, Date])", type=["csv"])
+    if manifest_file:
+        manifest = pd.read_csv(manifest_file, dtype={"Animal ID": str})
+        if {"Load", "Animal ID"} <= set(manifest.columns):
+            screened = registry.screen_manifest(manifest, "milk", when=q_date)
+            loads = WithdrawalRegistry.contaminated_loads(screened)
+            if loads.empty: st.success(f"✅ All {manifest['Load'].nunique()} loads clear.")
+            else:
+                st.error(f"🚫 {len(loads)} load(s) contain milk from withdrawn animals.")
+                st.dataframe(loads, use_container_width=True, hide_index=True)
+        else:
+            st.error("Manifest needs 'Load' and 'Animal ID' columns.")
@@ -0,0 +1,44 @@
+import pandas as pd
+import streamlit as st
+
+from diagnostics import DiagnosticIndex
+from knowledge_base import CLINICAL_MASTER_DB, SYMPTOM_MATRIX
+
+
+@st.cache_resource
+def get_diagnostic_index():
+    # inverted sign index over both knowledge bases, built once per process
+    return DiagnosticIndex.from_knowledge_bases(CLINICAL_MASTER_DB, SYMPTOM_MATRIX)
+
+
+def render():
+    st.header("🩺 Sovereign Clinical Diagnostic Engine")
+    
+    dx_index = get_diagnostic_index()
+    observed = st.multiselect("Observed Signs", dx_index.sign_vocabulary())
+    free_text = st.text_input("Other Findings (free text)", "")
+    if observed or free_text.strip():
+        ranked = dx_index.search(observed + [free_text], top=10)
+        if ranked:
+            st.dataframe(pd.DataFrame([{
+                "Condition": m.condition, "Match %": round(m.score * 100, 1), "Triage": m.triage or "—",
+                "Vaccine / Control": m.vax or "—", "Intervention": m.tx or "—", "Matched Signs": ", ".join(m.matched),
+            } for m in ranked]), use_container_width=True, hide_index=True)
+        else:
+            st.info("No condition in the library matches these signs.")
+    
+    st.divider()
+    group = st.selectbox("Pathogen Category", list(CLINICAL_MASTER_DB.keys()))
+    cond = st.selectbox("Observed Symptomatology", list(CLINICAL_MASTER_DB[group].keys()))
+    
+    data = CLINICAL_MASTER_DB[group][cond]
+    with st.container(border=True):
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            if data['triage'] == "Red": st.error(f"🚨 EMERGENCY: {data['triage']}")
+            else: st.warning(f"⚠️ URGENT: {data['triage']}")
+            st.write(f"**Recommended Vaccine:** {data['vax']}")
+        with col2:
+            st.subheader(cond)
+            st.info(f"**Clinical Signs:** {data['signs']}")
+            st.write(f"**Intervention:** {data['tx']}")
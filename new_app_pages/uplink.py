@@ -0,0 +1,15 @@
+import time
+
+import streamlit as st
+
+from instrumentation import span
+
+
+def render():
+    st.header("📡 National Agricultural Data Gateway")
+    
+    if st.button("EXECUTE ENCRYPTED UPLINK"):
+        with st.status("Establishing SSL Tunnel to KALRO..."):
+            with span("uplink.simulated_latency"):
+                time.sleep(2)
+        st.success("✅ UPLINK COMPLETE: REF-UON-2026-SOVEREIGN")
@@ -0,0 +1,60 @@
+"""
+page_registry.py
+Menu label -> page module mapping for the Streamlit apps, loaded lazily.
+
+Each page lives in its own module exposing render(). A page module (and the
+engines, charting libraries and knowledge bases it imports) is imported the
+first time its menu entry is selected; after that Python's module cache
+makes the lookup free, so reruns only pay for the page actually on screen.
+"""
+import importlib
+import sys
+from types import ModuleType
+from typing import Dict, List, Optional
+
+from instrumentation import INSTRUMENTS, span
+
+
+class PageRegistry:
+    """
+    Ordered menu of pages. Module names are relative to `package`; a page
+    registered with module=None renders nothing (a menu placeholder).
+    """
+
+    def __init__(self, package: str):
+        self.package = package
+        self._modules: Dict[str, Optional[str]] = {}
+
+    def add(self, label: str, module: Optional[str]) -> "PageRegistry":
+        if label in self._modules:
+            raise ValueError(f"page {label!r} is already registered")
+        self._modules[label] = module
+        return self
+
+    def labels(self) -> List[str]:
+        return list(self._modules)
+
+    def module_name(self, label: str) -> Optional[str]:
+        if label not in self._modules:
+            raise KeyError(f"no page registered for {label!r}")
+        module = self._modules[label]
+        return f"{self.package}.{module}" if module else None
+
+    def load(self, label: str) -> Optional[ModuleType]:
+        """Import (once) and return the page module for `label`."""
+        name = self.module_name(label)
+        if name is None:
+            return None
+        if name in sys.modules:
+            return sys.modules[name]
+        with span(f"import.{name}"):
+            return importlib.import_module(name)
+
+    def render(self, label: str) -> None:
+        """Render one page; its timing is recorded unless it exits early (e.g. st.rerun())."""
+        module = self.load(label)
+        if module is None:
+            return
+        timer = INSTRUMENTS.start(f"page.{label.split(' ', 1)[-1]}")
+        module.render()
+        timer.stop()
@@ -0,0 +1,291 @@
+"""
+ration.py
+Least-cost ration formulation over FEED_LIBRARY-style ingredient tables.
+
+A ration is a vector of inclusion fractions x (summing to 1) that minimizes
+cost·x subject to mix-level nutrient bounds (CP %, ME MJ/kg, DM %) and
+per-ingredient min/max inclusion. Nutrients of the mix are inclusion-weighted
+averages of the ingredient values, so every constraint is linear.
+
+solve_rations() runs a batched two-phase simplex: hundreds of rations over
+the same ingredient set (one per pen, CP target or price scenario) share one
+tableau layout and are pivoted together as a (batch, rows, cols) array.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+NUTRIENTS = ("cp", "me", "dm")
+MAX_PIVOTS = 500
+_EPS = 1e-9
+
+
+def feed_table(library: Dict[str, Dict[str, dict]], names: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Flatten a {group: {ingredient: {cp, me, dm, cost}}} library into a frame
+    indexed by ingredient, optionally restricted to (and ordered by) names.
+    """
+    rows = {name: spec for group in library.values() for name, spec in group.items()}
+    table = pd.DataFrame.from_dict(rows, orient="index")[list(NUTRIENTS) + ["cost"]].astype(float)
+    table.index.name = "ingredient"
+    if names is not None:
+        names = list(names)
+        missing = [n for n in names if n not in table.index]
+        if missing:
+            raise KeyError(f"unknown ingredients: {missing}")
+        table = table.loc[names]
+    return table
+
+
+def _per_problem(value, batch: int, default: float) -> np.ndarray:
+    """Scalar or length-batch bound as a float array; None/NaN becomes default."""
+    if value is None:
+        return np.full(batch, default)
+    out = np.array(np.broadcast_to(np.asarray(value, dtype=float), (batch,)))
+    out[np.isnan(out)] = default
+    return out
+
+
+def _inclusion(limits, feeds: pd.DataFrame, batch: int, default: float) -> np.ndarray:
+    """(batch, n) inclusion limits from None, {ingredient: fraction} or an array."""
+    n = len(feeds)
+    if limits is None:
+        return np.full((batch, n), default)
+    if isinstance(limits, dict):
+        unknown = [k for k in limits if k not in feeds.index]
+        if unknown:
+            raise KeyError(f"unknown ingredients: {unknown}")
+        limits = pd.Series(limits, dtype=float).reindex(feeds.index).to_numpy()
+    out = np.array(np.broadcast_to(np.asarray(limits, dtype=float), (batch, n)))
+    out[np.isnan(out)] = default
+    return out
+
+
+def _batch_size(*values) -> int:
+    sizes = {np.shape(v)[0] for v in values if v is not None and not isinstance(v, dict) and np.ndim(v) > 0}
+    if len(sizes) > 1:
+        raise ValueError(f"batch arguments have different lengths: {sorted(sizes)}")
+    return sizes.pop() if sizes else 1
+
+
+def solve_rations(feeds: pd.DataFrame,
+                  cost=None,
+                  cp_min=None, cp_max=None,
+                  me_min=None, me_max=None,
+                  dm_min=None, dm_max=None,
+                  min_incl=None, max_incl=None,
+                  max_pivots: int = MAX_PIVOTS) -> pd.DataFrame:
+    """
+    Solve a batch of least-cost rations over the ingredients in feeds
+    (a feed_table() frame).
+
+    Every bound is a scalar (shared) or a length-B array (one per ration);
+    None or NaN leaves it open. cost defaults to feeds['cost'] and may be a
+    (B, n) matrix of price scenarios. min_incl / max_incl are fractions given
+    as {ingredient: fraction} or arrays of shape (n,) or (B, n).
+
+    Returns one row per ration: inclusion fraction per ingredient, the mix
+    'cost', 'cp', 'me', 'dm' and 'status' ('optimal', 'infeasible' or
+    'pivot_limit'). Non-optimal rows have NaN fractions.
+    """
+    names = list(feeds.index)
+    n = len(names)
+    if cost is not None and np.ndim(cost) == 2:
+        batch = _batch_size(np.asarray(cost), cp_min, cp_max, me_min, me_max, dm_min, dm_max)
+    else:
+        batch = _batch_size(cp_min, cp_max, me_min, me_max, dm_min, dm_max)
+    price = np.broadcast_to(feeds["cost"].to_numpy(float) if cost is None else np.asarray(cost, dtype=float),
+                            (batch, n)).astype(float)
+    lo = np.clip(_inclusion(min_incl, feeds, batch, 0.0), 0.0, 1.0)
+    hi = np.clip(_inclusion(max_incl, feeds, batch, 1.0), 0.0, 1.0)
+    values = feeds[list(NUTRIENTS)].to_numpy(float)
+
+    # Shift x = lo + z so that 0 <= z <= hi - lo; rows are (coefficients, rhs, sense)
+    # with sense +1 for <=, -1 for >= and 0 for =.
+    rows, rhs, sense = [np.ones((batch, n))], [1.0 - lo.sum(axis=1)], [0]
+    limits = {"cp": (cp_min, cp_max), "me": (me_min, me_max), "dm": (dm_min, dm_max)}
+    for j, nutrient in enumerate(NUTRIENTS):
+        a = values[:, j]
+        base = lo @ a
+        for bound, s in zip(limits[nutrient], (-1, 1)):
+            b = _per_problem(bound, batch, np.nan)
+            active = ~np.isnan(b)
+            if not active.any():
+                continue
+            # an open bound becomes the trivially satisfied row 0·z <= 0
+            rows.append(np.where(active[:, None], a, 0.0))
+            rhs.append(np.where(active, b - base, 0.0))
+            sense.append(s)
+    for i in range(n):
+        coef = np.zeros((batch, n))
+        coef[:, i] = 1.0
+        rows.append(coef)
+        rhs.append(hi[:, i] - lo[:, i])
+        sense.append(1)
+
+    # min_incl above max_incl gives a negative upper-bound row, which phase I reports infeasible
+    z, status = _simplex(np.stack(rows, axis=1), np.stack(rhs, axis=1), np.array(sense), price, max_pivots)
+    x = lo + z
+    x[status != 0] = np.nan
+
+    out = pd.DataFrame(x, columns=names)
+    out["cost"] = np.einsum("bi,bi->b", x, price)
+    for j, nutrient in enumerate(NUTRIENTS):
+        out[nutrient] = x @ values[:, j]
+    out["status"] = np.array(["optimal", "infeasible", "pivot_limit"])[status]
+    return out
+
+
+def least_cost_ration(feeds: pd.DataFrame, **constraints) -> pd.Series:
+    """Single-ration solve_rations(); returns that ration's row."""
+    return solve_rations(feeds, **constraints).iloc[0]
+
+
+def _simplex(a: np.ndarray, b: np.ndarray, sense: np.ndarray, c: np.ndarray, max_pivots: int):
+    """
+    Batched two-phase tableau simplex for min c·z, a·z (<=, >=, =) b, z >= 0.
+    a: (B, m, n), b: (B, m), c: (B, n). Returns (z, status) with status
+    0 optimal, 1 infeasible, 2 pivot limit hit.
+    """
+    batch, m, n = a.shape
+    slack_rows = np.flatnonzero(sense != 0)
+    k = len(slack_rows)
+    # columns: z (n) | slacks (k) | artificials (m) | rhs
+    width = n + k + m
+    t = np.zeros((batch, m, width + 1))
+    t[:, :, :n] = a
+    t[:, slack_rows, n + np.arange(k)] = sense[slack_rows]
+    t[:, :, -1] = b
+    flip = t[:, :, -1] < 0
+    t[flip] *= -1
+    t[:, np.arange(m), n + k + np.arange(m)] = 1.0
+    basis = np.broadcast_to(n + k + np.arange(m), (batch, m)).copy()
+    artificial = np.zeros(width, dtype=bool)
+    artificial[n + k:] = True
+
+    # phase I: minimize the sum of artificials
+    obj = np.zeros((batch, width + 1))
+    obj[:, :n + k] = -t[:, :, :n + k].sum(axis=1)
+    obj[:, -1] = -t[:, :, -1].sum(axis=1)
+    t, obj, basis, done = _pivot_loop(t, obj, basis, np.ones(width, dtype=bool), artificial, max_pivots)
+    infeasible = -obj[:, -1] > 1e-7 * (1.0 + np.abs(b).sum(axis=1))
+
+    # phase II: reduced costs of the real objective w.r.t. the phase I basis
+    cost = np.zeros((batch, width + 1))
+    cost[:, :n] = c
+    cb = np.take_along_axis(cost[:, :width], basis, axis=1)
+    obj = cost - np.einsum("bi,bij->bj", cb, t)
+    t, obj, basis, done2 = _pivot_loop(t, obj, basis, ~artificial, artificial, max_pivots)
+
+    z = np.zeros((batch, width))
+    np.put_along_axis(z, basis, t[:, :, -1], axis=1)
+    status = np.where(infeasible, 1, np.where(done & done2, 0, 2))
+    return np.clip(z[:, :n], 0.0, None), status
+
+
+def _pivot_loop(t, obj, basis, enterable, artificial, max_pivots):
+    """
+    Pivots every unfinished tableau at once. Entering columns follow
+    Dantzig's rule (most negative reduced cost) and switch to Bland's rule
+    (first negative) after `bland_after` pivots, which rules out cycling on
+    degenerate rations.
+    """
+    batch, m, _ = t.shape
+    done = np.zeros(batch, dtype=bool)
+    bland_after = max_pivots // 4
+    for it in range(max_pivots):
+        reduced = np.where(enterable, obj[:, :-1], 0.0)
+        candidates = reduced < -_EPS
+        done |= ~candidates.any(axis=1)
+        live = np.flatnonzero(~done)
+        if not len(live):
+            break
+        enter = (candidates[live].argmax(axis=1) if it >= bland_after
+                 else reduced[live].argmin(axis=1))
+        col = t[live, :, enter]
+        rhs = t[live, :, -1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(col > _EPS, rhs / col, np.inf)
+        # an artificial still basic at zero leaves first, so it can never grow in phase II
+        stuck = artificial[basis[live]] & (np.abs(col) > _EPS) & (rhs <= _EPS)
+        ratio = np.where(stuck, -1.0, ratio)
+        leave = ratio.argmin(axis=1)
+        # ratios are never all-inf: the sum-to-one row bounds every ration
+        pivot_row = t[live, leave] / col[np.arange(len(live)), leave][:, None]
+        t[live] -= col[:, :, None] * pivot_row[:, None, :]
+        t[live, leave] = pivot_row
+        obj[live] -= obj[live, enter][:, None] * pivot_row
+        basis[live, leave] = enter
+    return t, obj, basis, done
+
+
+def _canonical(values: np.ndarray) -> np.ndarray:
+    # one NaN bit pattern and no -0.0, so equal constraints give equal key bytes
+    # (an empty editor cell is NaN, and NaN != NaN in a tuple key)
+    return np.where(np.isnan(values), np.nan, values) + 0.0
+
+
+class RationOptimizer:
+    """
+    solve_rations() with an LRU memo per ration. Each ration is keyed on its
+    full constraint set (ingredients, prices, nutrient bounds, inclusion
+    limits), so a reformulation run only solves rations whose inputs changed.
+    """
+
+    def __init__(self, feeds: pd.DataFrame, maxsize: int = 4096):
+        self.feeds = feeds
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def solve(self, scenarios: pd.DataFrame, cost=None, min_incl=None, max_incl=None) -> pd.DataFrame:
+        """
+        One ration per scenarios row. Columns named like the solve_rations
+        bounds ('cp_min', 'me_max', ...) are read per row; cost and inclusion
+        limits follow solve_rations. The result keeps scenarios' index.
+        """
+        feeds = self.feeds
+        batch = len(scenarios)
+        bounds = {col: scenarios[col].to_numpy(float) for col in scenarios.columns
+                  if col.split("_")[0] in NUTRIENTS and col.split("_")[-1] in ("min", "max")}
+        price = np.broadcast_to(feeds["cost"].to_numpy(float) if cost is None else np.asarray(cost, dtype=float),
+                                (batch, len(feeds)))
+        lo = _inclusion(min_incl, feeds, batch, 0.0)
+        hi = _inclusion(max_incl, feeds, batch, 1.0)
+        header = (tuple(feeds.index), feeds[list(NUTRIENTS)].to_numpy(float).tobytes(), tuple(sorted(bounds)))
+        limits = np.column_stack([v for _, v in sorted(bounds.items())]) if bounds else np.empty((batch, 0))
+        price, lo, hi, limits = (_canonical(a) for a in (price, lo, hi, limits))
+        keys = [header + (price[i].tobytes(), lo[i].tobytes(), hi[i].tobytes(), limits[i].tobytes())
+                for i in range(batch)]
+
+        with self._lock:
+            cached = [self._entries.get(key) for key in keys]
+        todo = [i for i, row in enumerate(cached) if row is None]
+        if todo:
+            fresh = solve_rations(feeds, cost=price[todo], min_incl=lo[todo], max_incl=hi[todo],
+                                  **{col: v[todo] for col, v in bounds.items()})
+            for i, row in zip(todo, fresh.itertuples(index=False)):
+                cached[i] = tuple(row)
+        with self._lock:
+            self.hits += batch - len(todo)
+            self.misses += len(todo)
+            for key, row in zip(keys, cached):
+                self._entries[key] = row
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        columns = list(feeds.index) + ["cost"] + list(NUTRIENTS) + ["status"]
+        return pd.DataFrame(cached, columns=columns, index=scenarios.index)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,251 @@
+"""
+service.py
+Local HTTP analytics service for scale controllers and milk-collection tablets.
+
+    python -m service --host 0.0.0.0 --port 8765
+
+An async (Starlette on uvicorn, both shipped with Streamlit) JSON API over
+the same functions the apps use. Every compute endpoint is a batch endpoint:
+inputs are arrays of equal length (scalars broadcast), evaluated in one
+vectorized call, and answered column-wise with null for NaN / infinite
+values; an optional "decimals" field rounds numeric outputs, which also
+makes large responses cheaper to serialize. Bodies over MAX_BODY_BYTES and
+batches over MAX_ITEMS are refused (413), and nested lists are rejected
+(400), before any array conversion; batches above INLINE_ITEMS run on the
+thread pool so one large request does not stall the event loop. The
+diagnostic index and the withdrawal table are built once at startup and
+kept in memory.
+
+    POST /v1/metrics           compute_metrics_batch
+    POST /v1/days-to-target    estimate_days_to_target_batch (null = unreachable)
+    POST /v1/pearson-square    BioEngines.pearson_square_batch (null = infeasible)
+    POST /v1/thi               BioEngines.thi_index
+    POST /v1/diagnose          DiagnosticIndex.search, one ranked list per query
+    POST /v1/withdrawal        PHARMA_DB milk/meat withdrawal days per drug
+    GET  /v1/stats             per-endpoint requests, items, rates, latency percentiles
+                               (4xx answers are timed as "<endpoint>.error")
+    GET  /metrics              the same latencies as Prometheus text
+    GET  /healthz
+"""
+import argparse
+import json
+import math
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from bio_engines import BioEngines
+from diagnostics import DiagnosticIndex
+from instrumentation import Instrumentation
+from knowledge_base import CLINICAL_MASTER_DB, PHARMA_DB, SYMPTOM_MATRIX
+from metrics import METRIC_INPUT_COLUMNS, compute_metrics_batch, estimate_days_to_target_batch
+from withdrawal import withdrawal_table
+
+MAX_ITEMS = 100_000         # per request; larger batches get 413
+MAX_BODY_BYTES = 32 << 20   # larger bodies get 413 before they are parsed
+INLINE_ITEMS = 5_000        # bigger batches are computed off the event loop
+MAX_TOP = 50
+
+
+class BadRequest(ValueError):
+    pass
+
+
+class TooLarge(ValueError):
+    pass
+
+
+def _items(body: dict) -> int:
+    """Batch size (the longest list); nested values are refused before anything is converted."""
+    size = 1
+    for name, value in body.items():
+        if isinstance(value, dict) or (isinstance(value, list) and any(isinstance(v, (list, dict)) for v in value)):
+            raise BadRequest(f"{name} must be a number, a string or a flat list")
+        if isinstance(value, list):
+            size = max(size, len(value))
+    if size > MAX_ITEMS:
+        raise TooLarge(f"at most {MAX_ITEMS} items per request")
+    return size
+
+
+async def _read_json(request: Request) -> dict:
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > MAX_BODY_BYTES:
+        raise TooLarge(f"body larger than {MAX_BODY_BYTES} bytes")
+    raw = await request.body()
+    if len(raw) > MAX_BODY_BYTES:
+        raise TooLarge(f"body larger than {MAX_BODY_BYTES} bytes")
+    body = json.loads(raw)      # malformed JSON is a ValueError
+    if not isinstance(body, dict):
+        raise BadRequest("body must be a JSON object")
+    return body
+
+
+def _column(values, decimals: Optional[int] = None) -> List[Optional[float]]:
+    values = np.asarray(values, dtype=float)
+    if decimals is not None:
+        values = np.round(values, decimals)     # shorter floats serialize faster
+    return [v if math.isfinite(v) else None for v in values.tolist()]
+
+
+def _decimals(body: dict) -> Optional[int]:
+    decimals = body.get("decimals")
+    if decimals is not None and (not isinstance(decimals, int) or not 0 <= decimals <= 12):
+        raise BadRequest("decimals must be an integer in [0, 12]")
+    return decimals
+
+
+def _arrays(body: dict, names, optional=()) -> Dict[str, np.ndarray]:
+    """Named numeric inputs broadcast to one length; 400 on missing / ragged / non-numeric."""
+    missing = [n for n in names if n not in body]
+    if missing:
+        raise BadRequest(f"missing fields: {missing}")
+    present = list(names) + [n for n in optional if body.get(n) is not None]
+    try:
+        arrays = np.broadcast_arrays(*(np.asarray(body[n], dtype=float) for n in present))
+    except (TypeError, ValueError, OverflowError) as exc:    # OverflowError: integers beyond float range
+        raise BadRequest(f"inputs must be numbers or equal-length number arrays: {exc}")
+    if arrays[0].ndim > 1:
+        raise BadRequest("inputs must be one-dimensional")
+    return {n: np.atleast_1d(a) for n, a in zip(present, arrays)}
+
+
+def _strings(body: dict, name: str) -> List[str]:
+    values = body.get(name)
+    if isinstance(values, str):
+        values = [values]
+    if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+        raise BadRequest(f"{name} must be a string or a list of strings")
+    return values
+
+
+class AnalyticsService:
+    """Knowledge bases loaded once, endpoint handlers and per-endpoint counters."""
+
+    def __init__(self, window: int = 4096):
+        self.diagnostics = DiagnosticIndex.from_knowledge_bases(CLINICAL_MASTER_DB, SYMPTOM_MATRIX)
+        self.withdrawal = {drug: (float(row.milk), float(row.meat))
+                           for drug, row in withdrawal_table(PHARMA_DB).iterrows()}
+        self.timings = Instrumentation(enabled=True, window=window)
+        self.items: Dict[str, int] = {}
+        self.started = time.time()
+
+    # compute handlers: body dict -> (items, response dict); run inline or on the thread pool
+
+    def metrics(self, body: dict):
+        x = _arrays(body, METRIC_INPUT_COLUMNS, optional=("target_wt",))
+        out = compute_metrics_batch(*(x[c] for c in METRIC_INPUT_COLUMNS), target_wt=x.get("target_wt"))
+        d = _decimals(body)
+        return len(out), {"n": len(out), "columns": {c: _column(out[c], d) for c in out.columns}}
+
+    def days_to_target(self, body: dict):
+        x = _arrays(body, ("current_wt", "target_wt", "adg"))
+        days = estimate_days_to_target_batch(x["current_wt"], x["target_wt"], x["adg"])
+        return len(days), {"n": len(days), "days": _column(days, _decimals(body))}
+
+    def pearson_square(self, body: dict):
+        x = _arrays(body, ("target_cp", "f1_cp", "f2_cp"))
+        f1, f2 = BioEngines.pearson_square_batch(x["target_cp"], x["f1_cp"], x["f2_cp"])
+        d = _decimals(body)
+        return len(f1), {"n": len(f1), "f1_pct": _column(f1, d), "f2_pct": _column(f2, d)}
+
+    def thi(self, body: dict):
+        x = _arrays(body, ("temp", "humidity"))
+        thi = BioEngines.thi_index(x["temp"], x["humidity"])
+        return len(thi), {"n": len(thi), "thi": _column(thi, _decimals(body))}
+
+    def diagnose(self, body: dict):
+        queries = _strings(body, "signs")
+        top = body.get("top", 5)
+        if not isinstance(top, int) or not 1 <= top <= MAX_TOP:
+            raise BadRequest(f"top must be an integer in [1, {MAX_TOP}]")
+        results = [[{"condition": m.condition, "group": m.group, "score": round(m.score, 4),
+                     "matched": m.matched, "triage": m.triage, "tx": m.tx, "vax": m.vax}
+                    for m in self.diagnostics.search(q, top=top)] for q in queries]
+        return len(queries), {"n": len(queries), "results": results}
+
+    def withdrawal_days(self, body: dict):
+        drugs = _strings(body, "drugs")
+        days = [self.withdrawal.get(d, (None, None)) for d in drugs]
+        return len(drugs), {"n": len(drugs), "milk": [m for m, _ in days], "meat": [m for _, m in days],
+                            "known": [d in self.withdrawal for d in drugs]}
+
+    def endpoint(self, name: str, handler: Callable[[dict], tuple]):
+        async def handle(request: Request):
+            timer = self.timings.start(name)
+            try:
+                body = await _read_json(request)
+                if _items(body) > INLINE_ITEMS:
+                    items, payload = await run_in_threadpool(handler, body)
+                else:
+                    items, payload = handler(body)
+            except ValueError as exc:       # BadRequest, TooLarge, malformed JSON
+                timer.name = f"{name}.error"
+                response = JSONResponse({"error": str(exc)}, status_code=413 if isinstance(exc, TooLarge) else 400)
+                timer.stop()
+                return response
+            response = JSONResponse(payload)       # serializes here, so it is inside the timing
+            self.items[name] = self.items.get(name, 0) + items
+            timer.stop()
+            return response
+        return handle
+
+    def stats(self) -> dict:
+        uptime = max(time.time() - self.started, 1e-9)
+        snap = self.timings.snapshot()
+        endpoints = {}
+        for row in snap.to_dict("records"):
+            name = row["span"]
+            endpoints[name] = {
+                "requests": int(row["count"]), "items": self.items.get(name, 0),
+                "requests_per_s": row["count"] / uptime, "items_per_s": self.items.get(name, 0) / uptime,
+                **{k: row[k] for k in ("mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms")},
+            }
+        return {"uptime_s": uptime, "endpoints": endpoints}
+
+
+def create_app(service: Optional[AnalyticsService] = None) -> Starlette:
+    service = service or AnalyticsService()
+    routes = [
+        Route(f"/v1/{path}", service.endpoint(path, handler), methods=["POST"])
+        for path, handler in (
+            ("metrics", service.metrics), ("days-to-target", service.days_to_target),
+            ("pearson-square", service.pearson_square), ("thi", service.thi),
+            ("diagnose", service.diagnose), ("withdrawal", service.withdrawal_days),
+        )
+    ]
+
+    async def stats(request):
+        return JSONResponse(service.stats())
+
+    async def prometheus(request):
+        return PlainTextResponse(service.timings.to_prometheus(prefix="aegis_service"))
+
+    async def healthz(request):
+        return JSONResponse({"ok": True, "conditions": len(service.diagnostics), "drugs": len(service.withdrawal)})
+
+    routes += [Route("/v1/stats", stats), Route("/metrics", prometheus), Route("/healthz", healthz)]
+    app = Starlette(routes=routes)
+    app.state.service = service
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--log-level", default="warning")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    uvicorn.run(create_app(), host=args.host, port=args.port, log_level=args.log_level, access_log=False)
+
+
+if __name__ == "__main__":
+    main()
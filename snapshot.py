@@ -0,0 +1,185 @@
+"""
+snapshot.py
+Compact binary herd snapshots: columnar, zlib-compressed and versioned.
+
+Layout (little-endian):
+    b"AEGSNAP" | u8 format version | u32 header length | JSON header
+    then blocks of: u32 row count, and per column u8 encoding + u32 length + payload
+
+REAL/INTEGER columns are stored as float64 arrays (NULL -> NaN); TEXT columns
+are dictionary encoded (JSON list of distinct values + int32 codes, NULL -> -1).
+Each column payload is compressed on its own, so a block can be written or
+read without holding the rest of the herd in memory.
+
+A delta snapshot carries only rows inserted after its base snapshot and is
+applied on top of a store restored from that base. The store records which
+snapshot it was last restored to (HerdStore.mark_snapshot), so a delta is only
+accepted by a store still holding exactly its base; and a delta cannot be
+taken across a replace or purge of the source, since rowids restart then.
+"""
+import io
+import json
+import struct
+import uuid
+import zlib
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from herd_store import HerdStore
+
+MAGIC = b"AEGSNAP"
+FORMAT_VERSION = 1
+BLOCK_ROWS = 50_000
+
+ENC_FLOAT64 = 1
+ENC_DICT_TEXT = 2
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def _pack(data: bytes) -> bytes:
+    return struct.pack("<I", len(data)) + data
+
+
+def _read_exact(f: BinaryIO, n: int) -> bytes:
+    data = f.read(n)
+    if len(data) != n:
+        raise SnapshotError("truncated snapshot")
+    return data
+
+
+def _read_packed(f: BinaryIO) -> bytes:
+    (n,) = struct.unpack("<I", _read_exact(f, 4))
+    return _read_exact(f, n)
+
+
+def _encode_column(series: pd.Series, sql_type: str) -> bytes:
+    if sql_type == "TEXT":
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        values = json.dumps([str(u) for u in uniques]).encode()
+        payload = _pack(values) + codes.astype("<i4").tobytes()
+        return bytes([ENC_DICT_TEXT]) + _pack(zlib.compress(payload, 6))
+    values = pd.to_numeric(series, errors="coerce").to_numpy(dtype="<f8")
+    return bytes([ENC_FLOAT64]) + _pack(zlib.compress(values.tobytes(), 6))
+
+
+def _decode_column(f: BinaryIO, rows: int, sql_type: str) -> pd.Series:
+    enc = _read_exact(f, 1)[0]
+    try:
+        raw = zlib.decompress(_read_packed(f))
+    except zlib.error as e:
+        raise SnapshotError(f"corrupt column block: {e}") from e
+    if enc not in (ENC_FLOAT64, ENC_DICT_TEXT):
+        raise SnapshotError(f"unknown column encoding {enc}")
+    # a damaged block surfaces as bad JSON, a short buffer or out-of-range codes
+    try:
+        if enc == ENC_FLOAT64:
+            values = np.frombuffer(raw, dtype="<f8", count=rows)
+            if sql_type == "INTEGER":
+                return pd.Series(values).astype("Int64")
+            return pd.Series(values)
+        buf = io.BytesIO(raw)
+        uniques = np.array(json.loads(_read_packed(buf)) + [None], dtype=object)
+        codes = np.frombuffer(buf.read(), dtype="<i4", count=rows)
+        return pd.Series(uniques[codes], dtype=object)
+    except (ValueError, TypeError, IndexError) as e:
+        raise SnapshotError(f"corrupt column block: {e}") from e
+
+
+def write_snapshot(store: HerdStore,
+                   f: BinaryIO,
+                   base: Optional[dict] = None,
+                   block_rows: int = BLOCK_ROWS) -> dict:
+    """
+    Stream the store's table into f, block_rows rows at a time. With base
+    (the header returned when the base snapshot was written) only rows
+    inserted since then are written, as a delta. Returns this snapshot's header.
+    """
+    generation = store.generation
+    if base and base.get("generation") != generation:
+        raise SnapshotError("the store was replaced or purged since the base snapshot; write a full snapshot")
+    last_rowid = store.max_rowid()
+    first_rowid = base["last_rowid"] if base else 0
+    window = "rowid > ? AND rowid <= ?"
+    header = {
+        "version": FORMAT_VERSION,
+        "kind": "delta" if base else "full",
+        "snapshot_id": uuid.uuid4().hex,
+        "base_id": base["snapshot_id"] if base else None,
+        "base_rows": (base["base_rows"] + base["rows"]) if base else 0,
+        "table": store.table,
+        "schema": store.schema,
+        "rows": store.count(window, [first_rowid, last_rowid]),
+        "last_rowid": last_rowid,
+        "generation": generation,
+    }
+    f.write(MAGIC + bytes([FORMAT_VERSION]) + _pack(json.dumps(header).encode()))
+
+    cols = list(store.schema)
+    cursor = first_rowid
+    while cursor < last_rowid:
+        block = store.fetch(where=window, params=[cursor, last_rowid], order_by="rowid",
+                            limit=block_rows, with_rowid=True)
+        if block.empty:
+            break
+        f.write(struct.pack("<I", len(block)))
+        for col in cols:
+            f.write(_encode_column(block[col], store.schema[col]))
+        cursor = int(block["rowid"].iloc[-1])
+    f.write(struct.pack("<I", 0))
+    return header
+
+
+def read_header(f: BinaryIO) -> dict:
+    if _read_exact(f, len(MAGIC)) != MAGIC:
+        raise SnapshotError("not an AEGIS snapshot")
+    version = _read_exact(f, 1)[0]
+    if version > FORMAT_VERSION:
+        raise SnapshotError(f"snapshot format v{version} is newer than this build (v{FORMAT_VERSION})")
+    try:
+        header = json.loads(_read_packed(f))
+    except ValueError as e:
+        raise SnapshotError(f"corrupt snapshot header: {e}") from e
+    if not isinstance(header, dict) or not {"kind", "table", "schema"} <= set(header):
+        raise SnapshotError("corrupt snapshot header: missing fields")
+    return header
+
+
+def read_snapshot(f: BinaryIO) -> Tuple[dict, Iterator[pd.DataFrame]]:
+    """Header plus a lazy iterator of DataFrame blocks."""
+    header = read_header(f)
+    schema = header["schema"]
+
+    def blocks():
+        while True:
+            (rows,) = struct.unpack("<I", _read_exact(f, 4))
+            if rows == 0:
+                return
+            yield pd.DataFrame({col: _decode_column(f, rows, t) for col, t in schema.items()})
+
+    return header, blocks()
+
+
+def restore_snapshot(store: HerdStore, f: BinaryIO) -> dict:
+    """
+    Load a snapshot into the store. A full snapshot replaces the table in one
+    transaction; a delta is appended and only onto a store restored from its
+    base snapshot with nothing written since.
+    """
+    header, blocks = read_snapshot(f)
+    if header["table"] != store.table:
+        raise SnapshotError(f"snapshot is for table {header['table']!r}, not {store.table!r}")
+    if header["kind"] == "delta":
+        mark_id, mark_rowid = store.snapshot_mark()
+        if mark_id != header.get("base_id") or mark_rowid != store.max_rowid():
+            raise SnapshotError("delta does not follow the store's current contents; restore its base first")
+        store.insert_frames(blocks)
+    else:
+        store.insert_frames(blocks, replace=True)
+    if header.get("snapshot_id"):
+        store.mark_snapshot(header["snapshot_id"])
+    return header
@@ -0,0 +1,131 @@
+"""
+table_view.py
+Server-side paginated views over a HerdStore table for the apps' log tables.
+
+Filtering, sorting and column selection are pushed into one SQL query that
+returns only the requested page, and styling is applied to that page alone.
+Gradient colour scales are anchored to the column's min/max over the whole
+filtered set (one aggregate query), so a value gets the same shade on every
+page. Per-rerun work is one LIMIT/OFFSET query, at most one COUNT and a Styler over
+at most `per_page` rows, however large the herd grows.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from herd_store import HerdStore, _quote
+
+OPS = ("=", "in", "contains", ">=", "<=")
+NUMERIC_TYPES = ("REAL", "INTEGER")
+
+
+@dataclass(frozen=True)
+class Filter:
+    """column <op> value; 'in' takes a tuple so filters stay hashable cache keys."""
+    column: str
+    op: str
+    value: object
+
+
+@dataclass
+class TableQuery:
+    columns: Optional[Sequence[str]] = None
+    filters: Sequence[Filter] = field(default_factory=tuple)
+    sort: Optional[str] = None
+    descending: bool = False
+    page: int = 0
+    per_page: int = 50
+
+
+class PagedTable:
+    """Paged, filtered, sorted reads of one HerdStore table."""
+
+    def __init__(self, store: HerdStore):
+        self.store = store
+
+    def numeric_columns(self, columns: Optional[Sequence[str]] = None) -> List[str]:
+        cols = columns if columns is not None else list(self.store.schema)
+        return [c for c in cols if self.store.schema.get(c) in NUMERIC_TYPES]
+
+    def _check(self, column: str) -> None:
+        if column not in self.store.schema:
+            raise KeyError(f"unknown column for {self.store.table}: {column!r}")
+
+    def options(self, column: str) -> List:
+        """Distinct non-NULL values of a column, sorted, for filter widgets."""
+        self._check(column)
+        values = self.store.aggregate({}, group_by=[column], where=f"{_quote(column)} IS NOT NULL")[column]
+        return sorted(values)
+
+    def where(self, filters: Sequence[Filter]) -> Tuple[Optional[str], list]:
+        """SQL WHERE fragment and params for a set of filters (ANDed)."""
+        clauses, params = [], []
+        for f in filters:
+            self._check(f.column)
+            col = _quote(f.column)
+            if f.op == "=":
+                clauses.append(f"{col} = ?")
+                params.append(f.value)
+            elif f.op == "in":
+                values = list(f.value)
+                if not values:
+                    clauses.append("0")
+                    continue
+                clauses.append(f"{col} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+            elif f.op == "contains":
+                text = str(f.value).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                clauses.append(f"{col} LIKE ? ESCAPE '\\'")
+                params.append(f"%{text}%")
+            elif f.op in (">=", "<="):
+                clauses.append(f"{col} {f.op} ?")
+                params.append(f.value)
+            else:
+                raise ValueError(f"filter op must be one of {OPS}, not {f.op!r}")
+        return (" AND ".join(clauses) or None), params
+
+    def count(self, filters: Sequence[Filter] = ()) -> int:
+        where, params = self.where(filters)
+        return self.store.count(where, params)
+
+    def page(self, query: TableQuery, total: Optional[int] = None) -> Tuple[pd.DataFrame, int]:
+        """
+        (rows of the requested page, total rows matching the filters). Pass
+        total when the caller already has the count for these filters.
+        """
+        where, params = self.where(query.filters)
+        if total is None:
+            total = self.store.count(where, params)
+        order = "rowid DESC" if query.descending else "rowid"
+        if query.sort:
+            self._check(query.sort)
+            # rowid breaks ties so rows never repeat or vanish across pages
+            order = f"{_quote(query.sort)} {'DESC' if query.descending else 'ASC'}, {order}"
+        last_page = max(0, -(-total // query.per_page) - 1)
+        offset = min(max(query.page, 0), last_page) * query.per_page
+        rows = self.store.fetch(query.columns, where, params, order_by=order, limit=query.per_page, offset=offset)
+        return rows, total
+
+    def ranges(self, columns: Sequence[str], filters: Sequence[Filter] = ()) -> Dict[str, Tuple[float, float]]:
+        """(min, max) of each column over all rows matching the filters."""
+        if not columns:
+            return {}
+        for c in columns:
+            self._check(c)
+        where, params = self.where(filters)
+        exprs = {}
+        for c in columns:
+            exprs[f"lo_{c}"] = f"MIN({_quote(c)})"
+            exprs[f"hi_{c}"] = f"MAX({_quote(c)})"
+        row = self.store.aggregate(exprs, where=where, params=params).iloc[0]
+        return {c: (row[f"lo_{c}"], row[f"hi_{c}"]) for c in columns if pd.notna(row[f"lo_{c}"])}
+
+
+def style_page(page: pd.DataFrame, ranges: Dict[str, Tuple[float, float]], cmap: str = "YlGn"):
+    """background_gradient over one page, each column on its herd-wide (min, max) scale."""
+    styler = page.style
+    for col, (lo, hi) in ranges.items():
+        if col in page.columns:
+            styler = styler.background_gradient(cmap=cmap, subset=[col], vmin=lo, vmax=hi)
+    return styler
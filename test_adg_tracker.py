@@ -0,0 +1,70 @@
+import math
+import numpy as np
+import pytest
+from adg_tracker import AdgTracker, HerdAdgTracker
+from metrics import compute_adg_from_timeseries
+
+
+def test_tracker_matches_batch_regression():
+    dates = ["2025-01-01", "2025-01-08", "2025-01-20", "2025-02-03"]
+    weights = [200.0, 206.5, 214.0, 226.0]
+    t = AdgTracker("AEG-BE-1001")
+    for d, w in zip(dates, weights):
+        t.add_weighing(d, w)
+    adg, _ = compute_adg_from_timeseries(dates, weights)
+    assert t.slope == pytest.approx(adg)
+    assert t.days_to_target(300) == pytest.approx((300 - 226.0) / adg)
+
+
+def test_remove_weighing_is_inverse_of_add():
+    t = AdgTracker()
+    t.add_weighing(0, 100)
+    t.add_weighing(10, 110)
+    assert t.slope == pytest.approx(1.0)
+    t.add_weighing(20, 150)   # mis-read
+    t.remove_weighing(20, 150)
+    t.add_weighing(20, 120)
+    assert t.slope == pytest.approx(1.0)
+    t.remove_weighing(10, 110)
+    t.remove_weighing(20, 120)
+    assert t.slope is None
+    assert t.days_to_target(200, current_wt=100) == math.inf
+
+
+def test_herd_snapshot():
+    herd = HerdAdgTracker()
+    for day in (0, 10, 20):
+        herd.add_weighing("A", day, 100 + day)
+        herd.add_weighing("B", day, 50 + 0.5 * day)
+    herd.add_weighing("C", 0, 30)
+    snap = herd.snapshot(target_wt=130)
+    assert snap.loc["A", "adg"] == pytest.approx(1.0)
+    assert snap.loc["B", "days_to_target"] == pytest.approx((130 - 60) / 0.5)
+    assert snap.loc["C", "days_to_target"] == math.inf
+
+
+def test_removing_latest_reading_restores_previous_and_numpy_days():
+    t = AdgTracker()
+    for day, wt in ((0, 100), (10, 110), (20, 300)):
+        t.add_weighing(day, wt)
+    t.remove_weighing(20, 300)     # mis-read
+    assert (t.last_day, t.last_wt) == (10.0, 110.0)
+    assert t.days_to_target(200) == pytest.approx(90.0)
+    with pytest.raises(ValueError):
+        t.remove_weighing(20, 300)
+
+    drift = AdgTracker()
+    for day, wt in ((1e5, 412.3), (1e5 + 7, 433.9), (1e5 + 31, 501.7), (1e5, 415.1)):
+        drift.add_weighing(day, wt)
+    drift.remove_weighing(1e5 + 31, 501.7)
+    drift.remove_weighing(1e5 + 7, 433.9)     # both left on one day: no slope, whatever the sums say
+    assert drift.slope is None and drift.last_day == 1e5
+    drift.add_weighing(1e5 + 7, 433.9)
+    assert drift.last_day == 1e5 + 7 and drift.slope is not None
+
+    herd = HerdAdgTracker()
+    for day in np.array([0, 10, 20], dtype=np.int64):
+        herd.add_weighing("A", day, 100 + float(day))
+    herd.add_weighing("A", np.float32(30), 130)
+    assert herd["A"].slope == pytest.approx(1.0)
+    assert herd.snapshot().loc["A", "current_wt"] == 130
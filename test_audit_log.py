@@ -0,0 +1,57 @@
+import json
+
+from audit_log import AuditLog
+
+
+def test_ring_buffer_pages_newest_first_with_filters():
+    log = AuditLog(capacity=100)
+    for i in range(250):
+        log.log(f"event {i}", level="CORE" if i % 5 == 0 else "INFO", asset=f"A{i % 3}")
+    assert len(log) == 100
+    entries, total = log.page(0, per_page=10)
+    assert total == 100
+    assert [e.seq for e in entries] == list(range(249, 239, -1))
+    last, _ = log.page(9, per_page=10)
+    assert last[-1].seq == 150
+    assert log.page(10, per_page=10)[0] == []
+
+    core, total = log.page(0, per_page=5, level="CORE")
+    assert total == 20 and [e.seq for e in core] == [245, 240, 235, 230, 225]
+    both, total = log.page(1, per_page=3, level="CORE", asset="A0")
+    assert total == 7 and [e.seq for e in both] == [195, 180, 165]
+    tail, total = log.page(2, per_page=3, level="CORE", asset="A0")
+    assert total == 7 and [e.seq for e in tail] == [150]
+    assert log.page(3, per_page=3, level="CORE", asset="A0") == ([], 7)
+    assert log.page(0, level="MISSING") == ([], 0)
+    assert entries[0].format().endswith("[INFO] event 249")
+
+
+def test_persists_rotates_and_reloads(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    log = AuditLog(str(path), capacity=50, max_bytes=2_000, backups=2)
+    for i in range(120):
+        log.log(f"deploy {i}", asset=f"UID-{i}")
+    log.close()
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert files == ["audit.jsonl", "audit.jsonl.1", "audit.jsonl.2"]
+    assert all(p.stat().st_size <= 2_000 for p in tmp_path.iterdir())
+    first = json.loads(path.read_text().splitlines()[0])
+    assert set(first) == {"seq", "ts", "level", "message", "asset"}
+
+    reopened = AuditLog(str(path), capacity=50, max_bytes=2_000, backups=2)
+    entries, total = reopened.page(0, per_page=3)
+    assert [e.message for e in entries] == ["deploy 119", "deploy 118", "deploy 117"]
+    assert reopened.log("after restart").seq == 120
+    assert reopened.page(0, asset="UID-100")[1] == 1
+    reopened.close()
+
+
+def test_indexes_stay_bounded_by_capacity():
+    log = AuditLog(capacity=100)
+    for i in range(5_000):
+        log.log(f"tag {i}", level=f"L{i % 7}", asset=f"UID-{i}")
+    assert len(log._by_asset) <= 100
+    assert sum(len(ix) for ix in log._by_asset.values()) == 100
+    assert len(log._by_level) == 7
+    entries, total = log.page(0, per_page=5, level="L6", asset="UID-4990")
+    assert total == 1 and entries[0].seq == 4990
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from batch import BatchOptions, analyze_farm, find_exports, main, run_batch
+from ingest import ingest_weigh_csv
+from knowledge_base import MARKET_PRICES
+
+
+def _export(path, farm, n_animals=12, seed=0, species=("Beef", "Goat")):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n_animals):
+        for d in sorted(rng.choice(90, 4, replace=False)):
+            rows.append({"animal_id": f"{farm}-{i:02d}", "species": species[i % len(species)],
+                         "date": (pd.Timestamp("2025-01-01") + pd.Timedelta(days=int(d))).strftime("%Y-%m-%d"),
+                         "weight": 100 + 0.7 * d + rng.normal(0, 1), "feed": 5.0})
+    pd.DataFrame(rows).sample(frac=1, random_state=seed).to_csv(path / f"{farm}.csv", index=False)
+
+
+def test_farm_kpis_match_ingest_with_species_prices(tmp_path):
+    _export(tmp_path, "kiambu")
+    path = str(tmp_path / "kiambu.csv")
+    out = analyze_farm(path, BatchOptions(as_of="2025-02-15", feed_cost=55))
+    assert out.error is None and out.rows == 48 and len(out.kpis) == 12
+
+    species = out.kpis.set_index("animal_id")["species"]
+    expected, _ = ingest_weigh_csv(path, price_per_kg=species.map(MARKET_PRICES), feed_cost=55)
+    kpis = out.kpis.set_index("animal_id")
+    np.testing.assert_allclose(kpis["adg"], expected["adg"])
+    np.testing.assert_allclose(kpis["revenue_now"], expected["revenue_now"])
+    # overdue: the 30 days before as_of; due: as_of through the next 30 days
+    as_of = pd.Timestamp("2025-02-15")
+    due = out.doses.groupby("Status")["Date Due"].agg(["min", "max"])
+    assert due.loc["overdue", "min"] >= as_of - pd.Timedelta(days=30) and due.loc["overdue", "max"] < as_of
+    assert due.loc["due", "min"] >= as_of and due.loc["due", "max"] <= as_of + pd.Timedelta(days=30)
+    assert list(out.doses["farm"].unique()) == ["kiambu"]
+
+    # labels are matched case-insensitively; Dairy has a price but no feed cost
+    _export(tmp_path, "nyeri", species=("beef ", "Dairy", "Yak"))
+    mixed = analyze_farm(str(tmp_path / "nyeri.csv"), BatchOptions(as_of="2025-02-15"))
+    assert set(mixed.kpis["species"]) == {"Beef", "Dairy", "Yak"}
+    assert mixed.summary()["unpriced_animals"] == 8
+    assert mixed.kpis.loc[mixed.kpis["species"] == "Beef", "profit_now"].notna().all()
+
+
+def test_pool_output_is_identical_and_ordered(tmp_path):
+    for i, farm in enumerate(["nakuru", "embu", "kitale"]):
+        _export(tmp_path, farm, n_animals=10 + 5 * i, seed=i)
+    (tmp_path / "broken.csv").write_text("foo,bar\n1,2\n")
+    paths = find_exports(tmp_path)
+    options = BatchOptions(as_of="2025-03-01")
+    seen = []
+    serial = run_batch(paths, options, workers=1, progress=lambda done, total, farm: seen.append((done, total)))
+    pooled = run_batch(paths, options, workers=2)
+
+    assert [f.farm for f in pooled.farms] == ["broken", "embu", "kitale", "nakuru"]
+    assert seen[-1] == (4, 4)
+    assert [f.farm for f in pooled.failed] == ["broken"]
+    assert "missing weigh-in columns" in pooled.failed[0].error
+    pd.testing.assert_frame_equal(serial.kpis(), pooled.kpis())
+    pd.testing.assert_frame_equal(serial.doses(), pooled.doses())
+    pd.testing.assert_frame_equal(serial.summary(), pooled.summary())
+
+
+def test_cli_writes_outputs_and_flags_failures(tmp_path, capsys):
+    exports, out = tmp_path / "exports", tmp_path / "out"
+    exports.mkdir()
+    _export(exports, "meru")
+    assert main([str(exports), "--out", str(out), "--workers", "1", "--as-of", "2025-02-01"]) == 0
+    farms = pd.read_csv(out / "farms.csv")
+    assert farms["animals"].tolist() == [12] and farms["error"].isna().all()
+    assert len(pd.read_csv(out / "kpis.csv")) == 12
+    assert "1 farms, 48 rows" in capsys.readouterr().err
+
+    (exports / "empty.csv").write_text("animal_id,date\n")
+    assert main([str(exports), "--out", str(out), "--quiet", "--as-of", "2025-02-01"]) == 1
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / "nothing"), "--out", str(out)])
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.suite import compare, run_suite
+from benchmarks.synthetic import synthetic_herd, synthetic_weigh_ins
+from herd_store import RECORD_SCHEMA
+from metrics import compute_adg_grouped
+
+
+def test_generators_are_seeded():
+    herd = synthetic_herd(500, seed=7)
+    assert list(herd.columns) == list(RECORD_SCHEMA)
+    pd.testing.assert_frame_equal(herd, synthetic_herd(500, seed=7))
+    assert not herd.equals(synthetic_herd(500, seed=8))
+    assert herd["ID"].is_unique
+
+    weigh = synthetic_weigh_ins(200, per_animal=4, seed=7)
+    pd.testing.assert_frame_equal(weigh, synthetic_weigh_ins(200, per_animal=4, seed=7))
+    fit = compute_adg_grouped(weigh, date_col="day")
+    assert len(fit) == 200 and (fit["n_points"] == 4).all()
+    assert np.all(np.abs(fit["adg"] - 0.6) < 1.0)
+
+
+def test_compare_flags_regressions_above_threshold():
+    def run(seconds):
+        return {"results": {k: {"items": 10, "seconds": s} for k, s in seconds.items()}}
+
+    baseline = run({"a@10": 0.100, "b@10": 0.100, "c@10": 0.0005, "d@10": 0.1})
+    current = run({"a@10": 0.119, "b@10": 0.150, "c@10": 0.0010, "e@10": 0.1})
+    current["results"]["d@10"] = {"items": 20, "seconds": 1.0}    # different cap, not comparable
+    report = compare(baseline, current, threshold=0.2).set_index("benchmark")
+    assert list(report.index) == ["a@10", "b@10", "c@10"]
+    # c doubled but stays under the noise floor
+    assert list(report["regression"]) == [False, True, False]
+
+
+def test_suite_runs_every_case():
+    out = run_suite(sizes=[200], repeat=1, log=lambda *_: None)
+    assert len(out["results"]) >= 13
+    assert all(r["seconds"] >= 0 and r["items"] <= 200 for r in out["results"].values())
+    assert {"python", "numpy", "pandas", "seed"} <= set(out["meta"])
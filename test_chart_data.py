@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from chart_data import UNKNOWN_GROUP, daily_series, downsample_series, group_summary, histogram, lttb
+
+
+def test_histogram_matches_numpy_and_splits_groups():
+    rng = np.random.default_rng(0)
+    adg = rng.normal(0.6, 0.2, 5000)
+    species = rng.choice(["Beef", "Goat", "Pig"], 5000)
+    flat = histogram(np.append(adg, np.nan), bins=25)
+    counts, edges = np.histogram(adg, bins=25)
+    assert (flat["count"].to_numpy() == counts).all()
+    assert np.allclose(flat["bin_start"], edges[:-1])
+
+    grouped = histogram(adg, bins=25, by=species)
+    assert grouped["count"].sum() == 5000
+    per_group = grouped.groupby("group")["count"].sum()
+    assert per_group.to_dict() == pd.Series(species).value_counts().to_dict()
+    assert set(grouped["bin_start"]) <= set(edges[:-1])
+
+    unlabelled = histogram([0.5, 0.6, 0.7], bins=5, by=["Beef", None, np.nan])
+    assert unlabelled.groupby("group")["count"].sum().to_dict() == {"Beef": 1, UNKNOWN_GROUP: 2}
+
+
+def test_lttb_keeps_ends_and_spikes():
+    x = np.arange(10_000, dtype=float)
+    y = np.sin(x / 500)
+    y[4321] = 25.0
+    idx = lttb(x, y, 200)
+    assert len(idx) == 200 and idx[0] == 0 and idx[-1] == 9999
+    assert (np.diff(idx) > 0).all()
+    assert 4321 in idx
+    assert (lttb(x[:50], y[:50], 200) == np.arange(50)).all()
+
+
+def test_series_and_summaries_are_capped():
+    rng = np.random.default_rng(1)
+    n = 20_000
+    df = pd.DataFrame({
+        "Species": rng.choice(["Beef", "Goat"], n, p=[0.75, 0.25]),
+        "Date": (np.datetime64("2020-01-01") + rng.integers(0, 2000, n).astype("timedelta64[D]")).astype(str),
+        "CH4": rng.uniform(0, 60, n),
+        "Sire": rng.integers(0, 500, n).astype(str),
+    })
+    down = downsample_series(df.assign(t=np.arange(n)), "t", "CH4", by="Species", max_points=400)
+    assert len(down) <= 400
+    assert down.groupby("Species").size()["Beef"] > down.groupby("Species").size()["Goat"]
+    many = pd.DataFrame({"g": np.repeat(np.arange(600), 5), "t": np.tile(np.arange(5), 600), "v": 1.0})
+    many = many.iloc[:-1]               # group 599 is now the smallest, so it is the one dropped
+    capped = downsample_series(many, "t", "v", by="g", max_points=1000)
+    assert len(capped) <= 1000 and capped["g"].nunique() == 333 and 599 not in set(capped["g"])
+
+    daily = daily_series(df, "Date", "CH4", by="Species", max_points=500)
+    assert len(daily) <= 500 and pd.api.types.is_datetime64_any_dtype(daily["Date"])
+    small = daily_series(df.head(50), "Date", "CH4", by="Species")
+    assert len(small) == df.head(50).groupby(["Species", "Date"]).ngroups
+
+    sires = group_summary(df, "Sire", "CH4", top=30)
+    assert len(sires) == 30 and sires["mean"].is_monotonic_decreasing
+    assert sires["count"].sum() < n
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import dates
+from dates import day_values, detect_format, is_numeric_days, normalize_dates, parse_dates
+
+
+def test_detects_format_from_all_unique_values():
+    assert detect_format(["2024-03-01", "2024-03-15"]) == "%Y-%m-%d"
+    # month-first is guessed from the first value but 13/01 rules it out
+    assert detect_format(["01/02/2024", "13/01/2024"]) == "%d/%m/%Y"
+    parsed = parse_dates(pd.Series(["01/02/2024", None, "13/01/2024", "01/02/2024"]))
+    assert parsed.tolist() == [pd.Timestamp("2024-02-01"), pd.NaT, pd.Timestamp("2024-01-13"),
+                               pd.Timestamp("2024-02-01")]
+    assert detect_format(["not a date"]) is None
+
+
+def test_numeric_days_are_detected_without_parsing_as_dates():
+    assert is_numeric_days(pd.Series([0, 14, 30]))
+    assert is_numeric_days(pd.Series(["0", " 14", "30.5"]))
+    assert not is_numeric_days(pd.Series(["20240101", "20240315"]))    # YYYYMMDD dates
+    assert not is_numeric_days(pd.Series([True, False]))
+    assert is_numeric_days(pd.Series([0, 10, 20], dtype=object))
+    assert normalize_dates(pd.Series([0, 10.5, None], dtype=object)).tolist()[:2] == [0.0, 10.5]
+    many = pd.Series(np.arange(60_000), dtype=object)      # the direct path for near-unique columns
+    assert normalize_dates(many).dtype == float and day_values(many)[-1] == 59_999
+    assert normalize_dates(pd.Series(["3", None, "10"])).tolist()[::2] == [3.0, 10.0]
+    assert normalize_dates(pd.Series(["abc", "x"])).tolist() == ["abc", "x"]
+    with pytest.raises(ValueError):
+        day_values(pd.Series(["abc", "x"]))
+
+
+@pytest.mark.parametrize("rows", [1_000, 60_000])
+def test_matches_pandas_on_repeated_and_mostly_unique_columns(rows, monkeypatch):
+    rng = np.random.default_rng(1)
+    if rows > 1_000:
+        monkeypatch.setattr(dates, "SAMPLE_ROWS", 1_000)     # take the direct (no factorize) path
+        stamps = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.permutation(rows), unit="min")
+        col = pd.Series(stamps.strftime("%Y-%m-%d %H:%M:%S"))
+        assert dates._mostly_unique(col)
+    else:
+        col = pd.Series(pd.date_range("2024-01-01", periods=50).strftime("%Y-%m-%d").to_numpy()[
+            rng.integers(0, 50, rows)])
+    col.iloc[::7] = None
+    expected = pd.to_datetime(col)
+    assert parse_dates(col).equals(expected)
+    days = day_values(col)
+    assert np.allclose(days, (expected - pd.Timestamp(0)).dt.total_seconds() / 86_400, equal_nan=True)
@@ -0,0 +1,43 @@
+import numpy as np
+
+from diagnostics import DiagnosticIndex, tokenize
+from knowledge_base import CLINICAL_MASTER_DB, SYMPTOM_MATRIX
+
+
+def test_symptom_matrix_merges_into_clinical_conditions():
+    index = DiagnosticIndex.from_knowledge_bases(CLINICAL_MASTER_DB, SYMPTOM_MATRIX)
+    by_name = {c["condition"]: c for c in index.conditions}
+    assert "skin lumps" in by_name["LSD (Lumpy Skin)"]["signs"].lower()      # 'Lumpy Skin Disease'
+    assert "limping" in by_name["FMD (Foot & Mouth)"]["signs"].lower()        # 'FMD'
+    assert "high fever" in by_name["East Coast Fever (ECF)"]["signs"].lower()
+    assert by_name["Ringworm"]["group"] == "Symptom Matrix"
+    assert "East Coast Fever" not in by_name
+
+
+def test_ranks_by_match_then_triage():
+    index = DiagnosticIndex.from_knowledge_bases(CLINICAL_MASTER_DB, SYMPTOM_MATRIX)
+    top = index.search(["High fever", "pale membranes", "red urine"], top=3)
+    assert top[0].condition == "Babesiosis (Redwater)"
+    assert top[0].score == 1.0 and top[0].triage == "Red" and top[0].vax == "Tick Control"
+    assert top[1].score == top[2].score < 1.0
+    # equal scores: triaged conditions before unclassified differentials, then by name
+    ties = [m for m in index.search("fever", top=50) if m.score == index.search("fever", top=1)[0].score]
+    ranks = [{"Red": 0, "Yellow": 1}.get(m.triage, 3) for m in ties]
+    assert ranks == sorted(ranks)
+    assert index.search("unknown gibberish") == []
+    assert tokenize("Swollen lymph nodes, fever") == ["swollen", "lymph", "node", "fever"]
+
+
+def test_search_at_scale_matches_brute_force():
+    # timing lives in benchmarks/suite.py (diagnostics.search); here: same answer as scoring every condition
+    rng = np.random.default_rng(0)
+    words = [f"sign{i}" for i in range(2000)]
+    conditions = [{"condition": f"C{i:04d}", "group": "G", "signs": "", "triage": "Red", "tx": None, "vax": None,
+                   "tokens": set(rng.choice(words, 8))} for i in range(5000)]
+    index = DiagnosticIndex(conditions)
+    for q in [list(rng.choice(words, 4)) for _ in range(20)]:
+        hits = index.search(" ".join(q), top=5000)
+        expected = {c["condition"] for c in conditions if c["tokens"] & set(q)}
+        assert {m.condition for m in hits} == expected
+        assert all(set(m.matched) == set(q) & conditions[int(m.condition[1:])]["tokens"] for m in hits)
+        assert [m.score for m in hits] == sorted((m.score for m in hits), reverse=True)
@@ -0,0 +1,39 @@
+from frame_cache import FrameCache
+from herd_store import HerdStore
+
+
+def test_hits_misses_and_version_invalidation():
+    calls = []
+    cache = FrameCache()
+
+    def build():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_compute("base", 1, build) == 1
+    assert cache.get_or_compute("base", 1, build) == 1
+    assert cache.get_or_compute("base", 1, build, "Beef") == 2
+    assert cache.get_or_compute("base", 2, build) == 3
+    assert len(cache) == 1   # version 1 entries dropped
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 3, 2)
+
+
+def test_lru_eviction():
+    cache = FrameCache(maxsize=2)
+    for name in ("a", "b"):
+        cache.get_or_compute(name, 0, lambda: name)
+    cache.get_or_compute("a", 0, lambda: "x")        # refresh a
+    cache.get_or_compute("c", 0, lambda: "c")        # evicts b
+    assert cache.get_or_compute("a", 0, lambda: "y") == "a"
+    assert cache.get_or_compute("b", 0, lambda: "rebuilt") == "rebuilt"
+
+
+def test_store_version_bumps_on_writes():
+    store = HerdStore()
+    v0 = store.version
+    store.insert({"ID": "AEG-1", "Species": "Beef"})
+    store.replace_all([{"ID": "AEG-2", "Species": "Goat"}])
+    store.clear()
+    store.fetch()
+    assert store.version == v0 + 3
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from bio_engines import BioEngines
+from heat_stress import (HeatStressAccumulator, hours_above, rolling_heat_load, stream_station_log, thi)
+
+
+def _series(stations=5, hours=24 * 10, seed=0):
+    rng = np.random.default_rng(seed)
+    hod = np.arange(hours) % 24
+    temp = 26 + 8 * np.sin((hod - 9) / 24 * 2 * np.pi) + rng.normal(0, 2, (stations, hours))
+    humidity = np.clip(rng.normal(60, 12, (stations, hours)), 5, 100)
+    return temp, humidity
+
+
+def test_thi_matches_scalar_engine():
+    temp, humidity = _series(stations=2, hours=6)
+    expected = [[BioEngines.thi_index(t, h) for t, h in zip(tr, hr)] for tr, hr in zip(temp, humidity)]
+    assert np.allclose(thi(temp, humidity), expected)
+    assert np.isnan(thi(np.nan, 50))
+
+
+def test_chunked_stream_matches_whole_series():
+    temp, humidity = _series()
+    values = thi(temp, humidity)
+    stations = [f"S{i}" for i in range(len(temp))]
+    acc = HeatStressAccumulator(threshold=72.0)
+    for lo, hi in ((0, 7), (7, 50), (50, 131), (131, 240)):
+        acc.update(stations, lo, temp[:, lo:hi], humidity[:, lo:hi])
+    summary = acc.summary()
+
+    assert np.allclose(summary["max_heat_load"], rolling_heat_load(values, 72.0).max(axis=1))
+    assert np.allclose(summary["heat_load"], rolling_heat_load(values, 72.0)[:, -1])
+    assert (summary["hours_above_Beef"].to_numpy() == hours_above(values)["Beef"].to_numpy()).all()
+    assert np.allclose(summary["mean_thi"], values.mean(axis=1))
+
+    # nights 21:00-05:00: the partial one ending at 05:00 on day 0, then 9 full ones;
+    # the night starting on the last day is still open
+    hod = np.arange(240) % 24
+    cool = (values < 72.0) & ((hod >= 21) | (hod < 5))
+    nights = [cool[:, :5].sum(axis=1)] + [cool[:, 24 * d + 21:24 * d + 29].sum(axis=1) for d in range(9)]
+    assert (summary["nights"] == 10).all()
+    assert (summary["recovered_nights"].to_numpy() == (np.array(nights) >= 6).sum(axis=0)).all()
+
+
+def test_station_log_streams_long_csv(tmp_path):
+    temp, humidity = _series(stations=3, hours=72)
+    stamps = pd.date_range("2026-03-01", periods=72, freq="h")
+    log = pd.DataFrame({
+        "station": np.repeat(["Njoro", "Naivasha", "Kitale"], 72),
+        "timestamp": np.tile(stamps, 3),
+        "temp": temp.ravel(), "humidity": humidity.ravel(),
+    }).sort_values("timestamp", kind="stable")
+    log = log.drop(log.index[(log["station"] == "Kitale") & (log["timestamp"] < stamps[30])])
+    path = tmp_path / "stations.csv"
+    log.to_csv(path, index=False)
+
+    acc = HeatStressAccumulator()
+    for block in stream_station_log(path, chunksize=50):
+        acc.update(*block)
+    summary = acc.summary()
+    assert list(summary.index) == ["Kitale", "Naivasha", "Njoro"]
+    assert list(summary["hours"]) == [42, 72, 72]
+    assert np.isclose(summary.loc["Njoro", "max_thi"], thi(temp[0], humidity[0]).max())
@@ -0,0 +1,57 @@
+import pytest
+from herd_store import ASSET_INDEXES, ASSET_SCHEMA, HerdStore
+
+
+def _record(i, species="Beef", sire="UoN-BULL-01"):
+    return {"ID": f"AEG-{i}", "Species": species, "Sire": sire, "ADG": 0.5 + i / 10, "Profit": 1000.0 * i,
+            "Manure": 1.0, "Biogas": 0.1, "CH4": 0.2, "FCR": 4.0, "Date": f"2025-01-{i + 1:02d}", "Weight": 300.0}
+
+
+def test_insert_fetch_and_filter(tmp_path):
+    store = HerdStore(str(tmp_path / "herd.db"))
+    assert store.insert_many([_record(i, sire="S1" if i % 2 else "S2") for i in range(6)]) == 6
+    assert store.count() == 6
+    assert store.count("Sire = ?", ["S1"]) == 3
+
+    page = store.fetch(["ID", "ADG"], order_by='"ADG" DESC', limit=2)
+    assert list(page.columns) == ["ID", "ADG"]
+    assert list(page["ID"]) == ["AEG-5", "AEG-4"]
+
+    with pytest.raises(KeyError):
+        store.fetch(["ID", "nope"])
+
+
+def test_aggregate_and_persistence(tmp_path):
+    path = str(tmp_path / "herd.db")
+    store = HerdStore(path)
+    store.insert_many([_record(i, sire="S1" if i < 2 else "S2") for i in range(5)])
+    agg = store.aggregate({"n": "COUNT(*)", "profit": "SUM(Profit)"}, group_by=["Sire"]).set_index("Sire")
+    assert agg.loc["S1", "n"] == 2
+    assert agg.loc["S2", "profit"] == 2000 + 3000 + 4000
+    store.mark_snapshot("abc")
+    store.close()
+
+    reopened = HerdStore(path)
+    assert reopened.count() == 5
+    assert reopened.snapshot_mark() == ("abc", 5) and reopened.generation == 0
+    reopened.clear()
+    assert reopened.count() == 0
+    assert reopened.snapshot_mark() == (None, 0) and HerdStore(path).generation == 1
+
+
+def test_asset_table_alongside_records(tmp_path):
+    path = str(tmp_path / "herd.db")
+    HerdStore(path).insert(_record(1))
+    assets = HerdStore(path, table="assets", schema=ASSET_SCHEMA, indexes=ASSET_INDEXES)
+    assets.insert({"uid": "AEG-1001", "spec": "Dairy", "breed": "Jersey", "wt": 350.0, "day": 45, "date": "2025-01-01"})
+    assert assets.count() == 1
+    assert HerdStore(path).count() == 1
+
+
+def test_new_schema_columns_are_added_to_existing_table(tmp_path):
+    path = str(tmp_path / "herd.db")
+    old_schema = {k: v for k, v in ASSET_SCHEMA.items() if k != "route"}
+    HerdStore(path, table="assets", schema=old_schema, indexes=()).insert({"uid": "AEG-1", "spec": "Dairy"})
+    assets = HerdStore(path, table="assets", schema=ASSET_SCHEMA, indexes=ASSET_INDEXES)
+    row = assets.fetch(["uid", "route"]).iloc[0]
+    assert row["uid"] == "AEG-1" and row["route"] is None
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ingest import WeighInAccumulator, ingest_weigh_csv
+from metrics import compute_adg_grouped
+
+
+def _weigh_ins(n_animals=30, n_points=6, seed=3):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n_animals):
+        days = np.sort(rng.choice(120, n_points, replace=False))
+        for d in days:
+            rows.append({
+                "animal_id": f"AEG-{i:03d}",
+                "date": (pd.Timestamp("2025-03-01") + pd.Timedelta(days=int(d))).strftime("%Y-%m-%d"),
+                "weight": 150 + 0.9 * d + rng.normal(0, 1.5),
+                "feed": 6.0,
+            })
+    return pd.DataFrame(rows).sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def test_ingest_matches_grouped_adg(tmp_path):
+    long = _weigh_ins()
+    path = tmp_path / "scale.csv"
+    long.to_csv(path, index=False)
+
+    seen = []
+    out, stats = ingest_weigh_csv(path, price_per_kg=760, feed_cost=55, chunksize=17,
+                                  progress=lambda s: seen.append(s.rows))
+    expected = compute_adg_grouped(long)
+
+    assert stats.rows == len(long)
+    assert stats.chunks == -(-len(long) // 17)
+    assert seen[-1] == len(long)
+    assert stats.rows_per_second > 0
+    assert list(out.index) == list(expected.index)
+    np.testing.assert_allclose(out["adg"], expected["adg"])
+    np.testing.assert_allclose(out["intercept"], expected["intercept"])
+    np.testing.assert_allclose(out["costs"], 6 * 6 * 55)
+
+
+def test_accumulator_tracks_first_and_last_weighing():
+    acc = WeighInAccumulator()
+    acc.update(["A", "A"], [10, 20], [110, 120], [5, 5])
+    acc.update(["A"], [0], [100], [5])
+    res = acc.results(price_per_kg=100, feed_cost=10, target_wt=150)
+    assert res.loc["A", "weight_gain"] == 20
+    assert res.loc["A", "adg"] == pytest.approx(1.0)
+    assert res.loc["A", "intercept"] == pytest.approx(100.0)
+    assert res.loc["A", "fcr"] == pytest.approx(15 / 20)
+    assert res.loc["A", "days_to_target"] == pytest.approx(30.0)
+
+
+def test_date_format_is_detected_once_per_file(tmp_path):
+    # day-first dates; the first two-row chunk alone would also fit month-first
+    path = tmp_path / "dayfirst.csv"
+    pd.DataFrame({"animal_id": ["A"] * 4, "date": ["05/02/2025", "10/02/2025", "20/02/2025", "25/02/2025"],
+                  "weight": [100, 105, 115, 120]}).to_csv(path, index=False)
+    for chunksize in (2, 1000):
+        out, _ = ingest_weigh_csv(path, price_per_kg=760, feed_cost=55, chunksize=chunksize)
+        assert out.loc["A", "adg"] == pytest.approx(1.0)
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from instrumentation import Instrumentation
+
+
+def test_rolling_percentiles_over_window():
+    inst = Instrumentation(window=100)
+    for ms in range(1, 301):
+        inst.record("page.Dashboard", ms / 1e3)
+    row = inst.snapshot().set_index("span").loc["page.Dashboard"]
+    assert row["count"] == 300
+    assert row["total_s"] == pytest.approx(sum(range(1, 301)) / 1e3)
+    recent = np.arange(201, 301)
+    assert row["p50_ms"] == pytest.approx(np.quantile(recent, 0.5))
+    assert row["p99_ms"] == pytest.approx(np.quantile(recent, 0.99))
+    assert row["max_ms"] == pytest.approx(300)
+
+
+def test_disabled_registry_records_nothing():
+    inst = Instrumentation(enabled=False)
+    calls = []
+
+    @inst.timed("work")
+    def work(x):
+        calls.append(x)
+        return x * 2
+
+    with inst.span("block"):
+        assert work(3) == 6
+    inst.start("page").stop()
+    assert calls == [3] and inst.snapshot().empty
+
+    inst.enabled = True
+    with pytest.raises(ZeroDivisionError):
+        with inst.span("block"):
+            work(1) / 0
+    span = inst.start("page")
+    span.stop(); span.stop()          # recorded once
+    assert dict(inst.snapshot()[["span", "count"]].values) == {"block": 1, "work": 1, "page": 1}
+
+
+def test_prometheus_export(tmp_path):
+    inst = Instrumentation()
+    inst.record('frame."herd"', 0.25)
+    inst.record("BioEngines.thi_index", 0.001)
+    inst.record("BioEngines.thi_index", 0.003)
+    text = inst.to_prometheus()
+    assert "# TYPE aegis_span_seconds summary" in text
+    assert 'aegis_span_seconds_count{span="BioEngines.thi_index"} 2' in text
+    assert 'aegis_span_seconds{span="BioEngines.thi_index",quantile="0.5"} 0.002' in text
+    assert 'aegis_span_seconds_sum{span="frame.\\"herd\\""} 0.25' in text
+
+    path = tmp_path / "aegis.prom"
+    assert inst.export(str(path), min_interval=0)
+    assert path.read_text() == text
+    assert not inst.export(str(path), min_interval=3600)
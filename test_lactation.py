@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from bio_engines import BioEngines
+from lactation import UNASSIGNED_ROUTE, WoodFitter, fit_wood, forecast_matrix, forecast_totals, wood_curve
+
+
+def test_wood_curve_matches_bio_engine():
+    days = np.array([0, 1, 45, 120, 305])
+    np.testing.assert_allclose(wood_curve(days), BioEngines.wood_model(days))
+
+
+def test_forecast_totals_match_nested_loop():
+    rng = np.random.default_rng(1)
+    dim = rng.integers(0, 280, 500)
+    a = rng.uniform(15, 30, 500)
+    routes = rng.choice(["R1", "R2", "R3"], 500)
+    out = forecast_totals(dim, horizon=10, a=a, routes=routes, block_cows=64)
+    for route in ("R1", "R2", "R3"):
+        mine = routes == route
+        expected = [sum(BioEngines.wood_model(d + h, a=ai) for d, ai in zip(dim[mine], a[mine])) for h in range(10)]
+        np.testing.assert_allclose(out[route], expected)
+    np.testing.assert_allclose(forecast_totals(dim, 10, a=a)["Total"], out.sum(axis=1))
+
+    unrouted = forecast_totals([10, 20, 30], horizon=3, routes=["R1", None, np.nan])
+    assert list(unrouted.columns) == ["R1", UNASSIGNED_ROUTE]
+    np.testing.assert_allclose(unrouted["R1"], forecast_matrix([10], 3)[0])
+    np.testing.assert_allclose(unrouted[UNASSIGNED_ROUTE], forecast_matrix([20, 30], 3).sum(axis=0))
+
+
+def test_horizon_limits():
+    assert forecast_matrix([10, 20], horizon=305).shape == (2, 305)
+    with pytest.raises(ValueError):
+        forecast_matrix([10], horizon=306)
+
+
+def _milk_records(n_cows=40, seed=2):
+    rng = np.random.default_rng(seed)
+    a, b, c = rng.uniform(15, 30, n_cows), rng.uniform(0.1, 0.3, n_cows), rng.uniform(0.002, 0.006, n_cows)
+    cow = np.repeat(np.arange(n_cows), 60)
+    day = np.tile(np.arange(5, 305, 5), n_cows)
+    y = wood_curve(day, a[cow], b[cow], c[cow])
+    return cow, day, y, (a, b, c)
+
+
+def test_fit_wood_recovers_parameters():
+    cow, day, y, (a, b, c) = _milk_records()
+    fit = fit_wood(cow, day, y)
+    np.testing.assert_allclose(fit["a"], a, rtol=1e-8)
+    np.testing.assert_allclose(fit["b"], b, rtol=1e-8)
+    np.testing.assert_allclose(fit["c"], c, rtol=1e-6)
+
+    noisy = y * np.exp(np.random.default_rng(0).normal(0, 0.05, len(y)))
+    coarse = fit_wood(cow, day, noisy)
+    refined = fit_wood(cow, day, noisy, refine=5)
+
+    def sse(p):
+        return ((noisy - wood_curve(day, p["a"].to_numpy()[cow], p["b"].to_numpy()[cow], p["c"].to_numpy()[cow])) ** 2).sum()
+    assert sse(refined) <= sse(coarse)
+
+
+def test_wood_fitter_incremental_matches_batch():
+    cow, day, y, _ = _milk_records(n_cows=10)
+    fitter = WoodFitter()
+    half = len(cow) // 2
+    fitter.add_records(cow[:half], day[:half], y[:half])
+    first = fitter.params
+    fitter.add_records(cow[half:], day[half:], y[half:])
+    fitter.add_records(["new-cow"], [10], [20.0])
+    params = fitter.params
+    np.testing.assert_allclose(params.loc[list(range(10)), ["a", "b", "c"]],
+                               fit_wood(cow, day, y)[["a", "b", "c"]], rtol=1e-6)
+    assert np.isnan(params.loc["new-cow", "a"])
+    assert len(first) == 5
+
+
+def test_implausible_fit_falls_back_to_nan():
+    # yield dips then climbs: the log-linear fit has b < 0 and c < 0, unbounded at DIM 0 and late
+    fit = fit_wood(["c"] * 3, [10, 60, 120], [18, 12, 30])
+    assert fit.loc["c", ["a", "b", "c"]].isna().all()
+    assert fit.loc["c", "n"] == 3
+    fitter = WoodFitter()
+    fitter.add_records(["c"] * 3, [10, 60, 120], [18, 12, 30])
+    assert fitter.params.loc["c", ["a", "b", "c"]].isna().all()
@@ -1,5 +1,9 @@
 import math
-from metrics import compute_metrics, estimate_days_to_target, compute_adg_from_timeseries
+import numpy as np
+import pandas as pd
+import pytest
+from metrics import (compute_metrics, estimate_days_to_target, compute_adg_from_timeseries,
+                     compute_metrics_batch, compute_metrics_frame, compute_adg_grouped)
 
 def test_compute_metrics_basic():
     m = compute_metrics(initial_wt=100, current_wt=150, days=50, feed_used=200, price_per_kg=200, feed_cost=40)
@@ -32,3 +36,57 @@ def test_compute_adg_from_timeseries_dates():
     adg, df = compute_adg_from_timeseries(dates, weights)
     assert round(adg, 6) == 1.0
     assert len(df) == 3
+
+def test_compute_metrics_batch_matches_scalar():
+    rows = [
+        (100, 150, 50, 200, 200, 40),
+        (100, 100, 10, 50, 200, 40),   # no gain -> fcr None
+        (100, 90, 0, 50, 200, 40),     # no days -> adg None
+    ]
+    batch = compute_metrics_batch(*zip(*rows), target_wt=[300, 300, 50])
+    for i, row in enumerate(rows):
+        scalar = compute_metrics(*row)
+        for key, value in scalar.items():
+            if value is None:
+                assert math.isnan(batch[key].iloc[i])
+            else:
+                assert batch[key].iloc[i] == value
+    assert list(batch["days_to_target"]) == [150.0, math.inf, 0.0]
+
+def test_compute_metrics_frame_keeps_index():
+    df = pd.DataFrame({
+        "initial_wt": [100, 200], "current_wt": [150, 260], "days": [50, 30],
+        "feed_used": [200, 240], "price_per_kg": 200, "feed_cost": 40,
+    }, index=["A1", "A2"])
+    out = compute_metrics_frame(df)
+    assert list(out.index) == ["A1", "A2"]
+    assert out.loc["A2", "adg"] == 2.0
+
+def test_compute_adg_grouped_matches_single_animal_fit():
+    rng = np.random.default_rng(7)
+    frames = []
+    for i in range(20):
+        n = int(rng.integers(2, 12))
+        dates = pd.Timestamp("2025-01-01") + pd.to_timedelta(np.sort(rng.choice(200, n, replace=False)), unit="D")
+        weights = 80 + i + 0.7 * np.arange(n) + rng.normal(0, 2, n)
+        frames.append(pd.DataFrame({"animal_id": f"A{i:02d}", "date": dates.strftime("%Y-%m-%d"), "weight": weights}))
+    long = pd.concat(frames).sample(frac=1, random_state=1)
+
+    grouped = compute_adg_grouped(long)
+    assert len(grouped) == 20
+    for animal_id, g in long.groupby("animal_id"):
+        adg, ts = compute_adg_from_timeseries(list(g["date"]), list(g["weight"]))
+        _, intercept = np.polyfit(ts["day"], ts["weight"], 1)
+        assert grouped.loc[animal_id, "adg"] == pytest.approx(adg)
+        assert grouped.loc[animal_id, "intercept"] == pytest.approx(intercept)
+        assert grouped.loc[animal_id, "n_points"] == len(g)
+
+def test_compute_adg_grouped_insufficient_points():
+    long = pd.DataFrame({"animal_id": ["A", "B", "B"], "date": [0, 0, 10], "weight": [50, 50, 60]})
+    out = compute_adg_grouped(long)
+    assert math.isnan(out.loc["A", "adg"])
+    assert out.loc["B", "adg"] == pytest.approx(1.0)
+    assert out.loc["B", "r2"] == pytest.approx(1.0)
+
+    untagged = pd.concat([long, pd.DataFrame({"animal_id": [None], "date": [5], "weight": [999]})])
+    pd.testing.assert_frame_equal(compute_adg_grouped(untagged), out)
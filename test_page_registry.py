@@ -0,0 +1,44 @@
+import importlib
+import sys
+
+import pytest
+
+from page_registry import PageRegistry
+
+
+def _package(tmp_path, monkeypatch, name="fake_pages"):
+    pkg = tmp_path / name
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "alpha.py").write_text("CALLS = []\ndef render():\n    CALLS.append('alpha')\n")
+    (pkg / "beta.py").write_text("raise RuntimeError('beta must not be imported')\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, name, raising=False)
+    return name
+
+
+def test_pages_load_on_first_render_only(tmp_path, monkeypatch):
+    name = _package(tmp_path, monkeypatch)
+    pages = PageRegistry(name).add("A", "alpha").add("B", "beta").add("Placeholder", None)
+    assert pages.labels() == ["A", "B", "Placeholder"]
+    assert f"{name}.alpha" not in sys.modules
+
+    pages.render("A")
+    pages.render("A")
+    pages.render("Placeholder")
+    assert sys.modules[f"{name}.alpha"].CALLS == ["alpha", "alpha"]
+    assert f"{name}.beta" not in sys.modules
+    with pytest.raises(RuntimeError):
+        pages.render("B")
+    with pytest.raises(KeyError):
+        pages.render("C")
+    with pytest.raises(ValueError):
+        pages.add("A", "alpha")
+
+
+@pytest.mark.parametrize("package", ["app_pages", "new_app_pages"])
+def test_every_registered_page_has_render(package):
+    pages = importlib.import_module(package).PAGES
+    names = [pages.module_name(label) for label in pages.labels()]
+    for name in filter(None, names):
+        assert callable(importlib.import_module(name).render)
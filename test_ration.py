@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from bio_engines import BioEngines
+from ration import RationOptimizer, feed_table, least_cost_ration, solve_rations
+
+LIBRARY = {
+    "Energy": {
+        "Maize Bran": {"cp": 8.0, "me": 11.5, "dm": 88, "cost": 38},
+        "Molasses": {"cp": 3.0, "me": 13.2, "dm": 75, "cost": 30},
+    },
+    "Protein": {
+        "Soya Bean Meal": {"cp": 45.0, "me": 12.5, "dm": 90, "cost": 105},
+        "Sunflower Meal": {"cp": 26.0, "me": 9.8, "dm": 91, "cost": 48},
+    },
+    "Forage": {
+        "Napier Grass (Fresh)": {"cp": 9.0, "me": 8.0, "dm": 22, "cost": 15},
+    },
+}
+
+
+def test_two_feed_ration_matches_pearson_square():
+    feeds = feed_table(LIBRARY, ["Maize Bran", "Soya Bean Meal"])
+    ration = least_cost_ration(feeds, cp_min=16)
+    bran, soya = BioEngines.pearson_square(16, 8.0, 45.0)
+    assert ration["status"] == "optimal"
+    assert np.isclose(ration["Maize Bran"], bran / 100)
+    assert np.isclose(ration["Soya Bean Meal"], soya / 100)
+
+
+def test_constraints_hold_and_cost_beats_random_blends():
+    feeds = feed_table(LIBRARY)
+    ration = least_cost_ration(feeds, cp_min=16, me_min=10, dm_min=80,
+                               min_incl={"Napier Grass (Fresh)": 0.05}, max_incl={"Molasses": 0.1})
+    x = ration[feeds.index].to_numpy(float)
+    assert ration["status"] == "optimal"
+    assert np.isclose(x.sum(), 1.0)
+    assert ration["cp"] >= 16 - 1e-9 and ration["me"] >= 10 - 1e-9 and ration["dm"] >= 80 - 1e-9
+    assert x[feeds.index.get_loc("Napier Grass (Fresh)")] >= 0.05 - 1e-9
+    assert x[feeds.index.get_loc("Molasses")] <= 0.1 + 1e-9
+
+    blends = np.random.default_rng(0).dirichlet(np.full(len(feeds), 0.5), 50_000)
+    v = feeds[["cp", "me", "dm"]].to_numpy()
+    ok = ((blends @ v >= [16, 10, 80]).all(axis=1) & (blends[:, 4] >= 0.05) & (blends[:, 1] <= 0.1))
+    assert ration["cost"] <= (blends[ok] @ feeds["cost"].to_numpy()).min() + 1e-9
+
+
+def test_batch_matches_single_solves_and_flags_infeasible():
+    feeds = feed_table(LIBRARY)
+    cp = np.array([10.0, 18.0, 30.0, 50.0])      # 50% CP is above every ingredient
+    prices = feeds["cost"].to_numpy() * np.array([[1.0], [1.2], [0.9], [1.0]])
+    batch = solve_rations(feeds, cost=prices, cp_min=cp, me_min=9.5)
+    assert list(batch["status"]) == ["optimal"] * 3 + ["infeasible"]
+    for i in range(3):
+        single = least_cost_ration(feeds, cost=prices[i], cp_min=cp[i], me_min=9.5)
+        assert np.isclose(batch.loc[i, "cost"], single["cost"])
+    assert batch.loc[3, feeds.index].isna().all()
+
+
+def test_optimizer_caches_per_constraint_set():
+    optimizer = RationOptimizer(feed_table(LIBRARY))
+    pens = pd.DataFrame({"cp_min": [14.0, 16.0, 18.0], "me_min": 10.0}, index=["P1", "P2", "P3"])
+    first = optimizer.solve(pens)
+    assert (optimizer.hits, optimizer.misses) == (0, 3)
+    pens.loc["P3", "cp_min"] = 20.0
+    second = optimizer.solve(pens)
+    assert (optimizer.hits, optimizer.misses) == (2, 4)
+    pd.testing.assert_frame_equal(first.loc[["P1", "P2"]], second.loc[["P1", "P2"]])
+    assert list(second.index) == ["P1", "P2", "P3"]
+    # blank editor cells are NaN bounds; identical rations must still hit the cache
+    pens.loc["P2", "cp_min"] = np.nan
+    for _ in range(3):
+        optimizer.solve(pens)
+    assert (optimizer.hits, optimizer.misses, len(optimizer)) == (10, 5, 5)
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+import uvicorn
+
+import service
+from benchmarks.load_test import run_load
+from bio_engines import BioEngines
+from metrics import compute_metrics, estimate_days_to_target
+
+
+@pytest.fixture(scope="module")
+def url():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(service.create_app(), host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.time() + 20
+    while not server.started and time.time() < deadline:
+        time.sleep(0.05)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join(timeout=10)
+
+
+def _post(url, path, body):
+    req = urllib.request.Request(url + path, data=json.dumps(body).encode(), method="POST",
+                                 headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req) as resp:
+            return resp.status, json.load(resp)
+    except urllib.error.HTTPError as err:
+        return err.code, json.load(err)
+
+
+def test_batch_endpoints_match_the_library(url):
+    wt0, wt1, days, feed = [200, 300, 310], [260, 300, 330], [60, 0, 20], [400, 0, 90]
+    status, out = _post(url, "/v1/metrics", {"initial_wt": wt0, "current_wt": wt1, "days": days, "feed_used": feed,
+                                             "price_per_kg": 760, "feed_cost": 55, "target_wt": 450})
+    assert status == 200 and out["n"] == 3
+    for i in range(3):
+        expected = compute_metrics(wt0[i], wt1[i], days[i], feed[i], 760, 55)
+        for key, value in expected.items():
+            got = out["columns"][key][i]
+            assert (got is None) if value is None else got == pytest.approx(value)
+    assert out["columns"]["days_to_target"][1] is None        # ADG 0: never reaches target
+
+    _, out = _post(url, "/v1/days-to-target", {"current_wt": [300, 500], "target_wt": 450, "adg": 0.75})
+    assert out["days"] == [estimate_days_to_target(300, 450, 0.75), 0.0]
+    _, out = _post(url, "/v1/pearson-square", {"target_cp": [16, 50], "f1_cp": 9, "f2_cp": 44, "decimals": 2})
+    f1, f2 = BioEngines.pearson_square(16, 9, 44)
+    assert out["f1_pct"] == [round(f1, 2), None] and out["f2_pct"] == [round(f2, 2), None]
+    _, out = _post(url, "/v1/thi", {"temp": [30.0, 20.0], "humidity": 70})
+    assert out["thi"] == pytest.approx(BioEngines.thi_index(np.array([30.0, 20.0]), 70).tolist())
+
+
+def test_lookups_and_request_validation(url, monkeypatch):
+    status, out = _post(url, "/v1/diagnose", {"signs": ["high fever, drooling, lameness", "zzz"], "top": 3})
+    assert status == 200 and len(out["results"][0]) <= 3 and out["results"][1] == []
+    assert out["results"][0][0]["score"] >= out["results"][0][-1]["score"]
+    _, out = _post(url, "/v1/withdrawal", {"drugs": ["Ivermectin", "Snake Oil"]})
+    assert out == {"n": 2, "milk": [28.0, None], "meat": [28.0, None], "known": [True, False]}
+
+    assert _post(url, "/v1/thi", {"temp": [30, 31]})[0] == 400
+    assert _post(url, "/v1/thi", {"temp": [30, 31, 32], "humidity": [50, 60]})[0] == 400
+    assert _post(url, "/v1/thi", {"temp": ["hot"], "humidity": [50]})[0] == 400
+    assert _post(url, "/v1/diagnose", {"signs": "fever", "top": 0})[0] == 400
+    assert _post(url, "/v1/thi", {"temp": [[30, 31]], "humidity": 50})[0] == 400     # nested: refused unconverted
+    assert _post(url, "/v1/thi", {"temp": [10 ** 400], "humidity": 50})[0] == 400     # beyond float range
+    monkeypatch.setattr(service, "MAX_ITEMS", 2)
+    assert _post(url, "/v1/thi", {"temp": [1, 2, 3], "humidity": 50})[0] == 413
+    monkeypatch.setattr(service, "MAX_BODY_BYTES", 64)
+    assert _post(url, "/v1/withdrawal", {"drugs": ["Ivermectin"] * 2, "pad": "x" * 64})[0] == 413
+    assert _stats(url)["thi.error"]["requests"] == 6
+
+
+def _stats(url):
+    return json.load(urllib.request.urlopen(url + "/v1/stats"))["endpoints"]
+
+
+def test_stats_count_requests_and_items_under_load(url):
+    before = _stats(url).get("withdrawal", {"requests": 0, "items": 0})
+    result = asyncio.run(run_load(url, ["withdrawal"], batch=20, concurrency=4, duration=0.5, warmup=0.0))
+    assert result["requests"] > 0 and result["errors"] == 0
+    assert result["items"] == 20 * result["requests"]
+
+    after = _stats(url)["withdrawal"]
+    # the server also counts each worker's final request, answered after the deadline
+    sent = after["requests"] - before["requests"]
+    assert result["requests"] <= sent <= result["requests"] + 4
+    assert after["items"] - before["items"] == 20 * sent
+    assert after["p99_ms"] >= after["p50_ms"] > 0
+    text = urllib.request.urlopen(url + "/metrics").read().decode()
+    assert f'aegis_service_span_seconds_count{{span="withdrawal"}} {after["requests"]}' in text
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sire_eval import SireEvaluation
+
+
+def _progeny(n=600, n_sires=12, seed=5):
+    rng = np.random.default_rng(seed)
+    true = rng.normal(0, 0.05, n_sires)
+    sire = rng.integers(0, n_sires, n)
+    species = rng.choice(["Beef", "Goat"], n)
+    date = rng.choice(["2025-01-01", "2025-02-01", "2025-03-01"], n)
+    base = np.where(species == "Beef", 0.8, 0.15)
+    return pd.DataFrame({
+        "Sire": [f"S{i:02d}" for i in sire], "Species": species, "Date": date,
+        "ADG": base + true[sire] + rng.normal(0, 0.1, n),
+    })
+
+
+def _dense_solution(df, lam):
+    cg = pd.factorize(df["Species"] + "|" + df["Date"])[0]
+    sc, sires = pd.factorize(df["Sire"])
+    X = np.eye(cg.max() + 1)[cg]
+    Z = np.eye(len(sires))[sc]
+    W = np.hstack([X, Z])
+    lhs = W.T @ W
+    lhs[X.shape[1]:, X.shape[1]:] += lam * np.eye(len(sires))
+    sol = np.linalg.solve(lhs, W.T @ df["ADG"].to_numpy())
+    return pd.Series(2 * sol[X.shape[1]:], index=sires)
+
+
+def test_matches_dense_mixed_model_solve():
+    df = _progeny()
+    engine = SireEvaluation(h2=0.3, tol=1e-12)
+    out = engine.evaluate(df).set_index("Sire")
+    expected = _dense_solution(df, engine.lam)
+    assert engine.converged
+    np.testing.assert_allclose(out.loc[expected.index, "EBV"], expected, atol=1e-9)
+    assert out["Progeny_Count"].sum() == len(df)
+    assert ((out["Accuracy"] > 0) & (out["Accuracy"] < 1)).all()
+
+
+def test_warm_start_needs_fewer_iterations():
+    df = _progeny(n=3000)
+    engine = SireEvaluation()
+    engine.evaluate(df.iloc[:2900])
+    cold = SireEvaluation()
+    cold.evaluate(df)
+    engine.evaluate(df)
+    assert engine.iterations < cold.iterations
+
+
+def test_accuracy_grows_with_progeny():
+    df = pd.DataFrame({"Sire": ["A"] * 40 + ["B"] * 2, "Species": "Beef", "Date": ["d1", "d2"] * 21,
+                       "ADG": 0.8})
+    out = SireEvaluation().evaluate(df).set_index("Sire")
+    assert out.loc["A", "Accuracy"] > out.loc["B", "Accuracy"]
+    with pytest.raises(ValueError):
+        SireEvaluation(h2=0)
+
+
+def test_records_without_sire_or_group_are_ignored():
+    df = _progeny(n=200)
+    untagged = pd.concat([df, pd.DataFrame({"Sire": [None, "S00"], "Species": ["Beef", None],
+                                            "Date": ["2025-01-01", "2025-01-01"], "ADG": [5.0, 5.0]})],
+                         ignore_index=True)
+    pd.testing.assert_frame_equal(SireEvaluation(tol=1e-12).evaluate(untagged),
+                                  SireEvaluation(tol=1e-12).evaluate(df))
+    fit = SireEvaluation().fit(["A", None, "A", "B"], ["g", "g", None, "g"], [0.8, 0.9, 0.7, 0.6])
+    assert fit["Progeny_Count"].sum() == 2
@@ -0,0 +1,103 @@
+import base64
+import io
+import json
+import struct
+import zlib
+
+import pandas as pd
+import pytest
+from herd_store import ASSET_INDEXES, ASSET_SCHEMA, HerdStore
+from snapshot import (ENC_DICT_TEXT, ENC_FLOAT64, FORMAT_VERSION, MAGIC, SnapshotError, _encode_column, _pack,
+                      read_snapshot, restore_snapshot, write_snapshot)
+
+
+def _records(start, stop):
+    return [{"ID": f"AEG-BE-{i}", "Species": "Beef" if i % 3 else "Goat", "Sire": f"UoN-BULL-{i % 7:02d}",
+             "ADG": 0.4 + i / 1000, "Profit": 1500.0 * i, "Manure": 180.0, "Biogas": 7.2, "CH4": 2.7,
+             "FCR": 4.2, "Date": f"2025-02-{i % 28 + 1:02d}", "Weight": 250.0 + i} for i in range(start, stop)]
+
+
+def test_full_roundtrip_is_smaller_than_legacy_hash():
+    src = HerdStore()
+    src.insert_many(_records(0, 500))
+    src.insert({"ID": "AEG-NULL", "Species": "Pig"})   # NULL fields survive
+    buf = io.BytesIO()
+    header = write_snapshot(src, buf, block_rows=64)
+    assert header["rows"] == 501
+
+    legacy = base64.b64encode(json.dumps(src.fetch().to_dict("records")).encode())
+    assert len(buf.getvalue()) * 4 < len(legacy)
+
+    dst = HerdStore()
+    dst.insert_many(_records(900, 905))
+    buf.seek(0)
+    restore_snapshot(dst, buf)
+    assert dst.fetch().equals(src.fetch())
+
+
+def test_delta_holds_only_new_records():
+    src = HerdStore()
+    src.insert_many(_records(0, 100))
+    full = io.BytesIO()
+    base = write_snapshot(src, full)
+    src.insert_many(_records(100, 130))
+    delta = io.BytesIO()
+    header = write_snapshot(src, delta, base=base)
+    assert header["kind"] == "delta" and header["rows"] == 30
+
+    dst = HerdStore()
+    delta.seek(0)
+    with pytest.raises(SnapshotError):
+        restore_snapshot(dst, delta)
+    full.seek(0)
+    restore_snapshot(dst, full)
+    delta.seek(0)
+    restore_snapshot(dst, delta)
+    assert dst.fetch().equals(src.fetch())
+
+    # same row count but a different base, or rows written since the base was restored
+    other = HerdStore()
+    other.insert_many(_records(0, 100))
+    other_full = io.BytesIO()
+    write_snapshot(other, other_full)
+    for extra in ([], _records(500, 501)):
+        dst = HerdStore()
+        other_full.seek(0)
+        restore_snapshot(dst, other_full)
+        dst.insert_many(extra)
+        delta.seek(0)
+        with pytest.raises(SnapshotError, match="restore its base"):
+            restore_snapshot(dst, delta)
+        assert dst.count() == 100 + len(extra)
+
+    # rowids restart after a replace, so the source cannot take a delta across one
+    src.replace_all(_records(0, 130))
+    with pytest.raises(SnapshotError, match="full snapshot"):
+        write_snapshot(src, io.BytesIO(), base=header)
+
+
+def test_integer_columns_and_bad_input():
+    assets = HerdStore(table="assets", schema=ASSET_SCHEMA, indexes=ASSET_INDEXES)
+    assets.insert({"uid": "AEG-1", "spec": "Dairy", "breed": "Jersey", "wt": 350.0, "day": 45, "date": "2025-01-01"})
+    buf = io.BytesIO()
+    write_snapshot(assets, buf)
+    buf.seek(0)
+    _, blocks = read_snapshot(buf)
+    assert list(next(blocks)["day"]) == [45]
+
+    with pytest.raises(SnapshotError):
+        read_snapshot(io.BytesIO(b"not a snapshot"))
+    buf.seek(0)
+    with pytest.raises(SnapshotError):
+        restore_snapshot(HerdStore(), buf)
+
+    # damaged column blocks: a bad dictionary (JSON) and a short float buffer
+    header = json.dumps({"kind": "full", "table": "assets", "schema": {"uid": "TEXT", "wt": "REAL"}}).encode()
+    prefix = MAGIC + bytes([FORMAT_VERSION]) + _pack(header) + struct.pack("<I", 2)
+    text = bytes([ENC_DICT_TEXT]) + _pack(zlib.compress(_pack(b"[oops") + b"\0" * 8))
+    short = bytes([ENC_FLOAT64]) + _pack(zlib.compress(b"\0" * 8))
+    good_text = _encode_column(pd.Series(["a", "b"]), "TEXT")
+    for body in (text, good_text + short):
+        _, blocks = read_snapshot(io.BytesIO(prefix + body))
+        with pytest.raises(SnapshotError, match="corrupt column block"):
+            next(blocks)
@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import synthetic_herd
+from herd_store import HerdStore
+from table_view import Filter, PagedTable, TableQuery, style_page
+
+
+def _table(n=500):
+    herd = synthetic_herd(n, seed=3)
+    store = HerdStore()
+    store.insert_frames([herd])
+    return PagedTable(store), herd
+
+
+def test_pages_match_pandas_filter_and_sort():
+    table, herd = _table()
+    filters = (Filter("Species", "in", ("Beef", "Goat")), Filter("ADG", ">=", 0.3))
+    expected = herd[herd["Species"].isin(["Beef", "Goat"]) & (herd["ADG"] >= 0.3)]
+    expected = expected.sort_values("ADG", ascending=False, kind="stable")
+
+    seen = []
+    for page in range(-(-len(expected) // 40) + 1):     # one past the end clamps to the last page
+        rows, total = table.page(TableQuery(columns=("ID", "ADG"), filters=filters, sort="ADG",
+                                            descending=True, page=page, per_page=40))
+        assert total == len(expected) and len(rows) <= 40 and list(rows.columns) == ["ID", "ADG"]
+        seen.append(rows)
+    paged = pd.concat(seen[:-1], ignore_index=True)
+    assert paged["ID"].tolist() == expected["ID"].tolist()
+    assert seen[-1]["ID"].tolist() == seen[-2]["ID"].tolist()
+
+    # a caller-supplied total skips the COUNT and drives the page clamp
+    rows, total = table.page(TableQuery(columns=("ID",), filters=filters, sort="ADG", descending=True,
+                                        page=3, per_page=40), total=80)
+    assert total == 80 and rows["ID"].tolist() == seen[1]["ID"].tolist()
+
+
+def test_contains_escapes_like_wildcards_and_rejects_bad_input():
+    store = HerdStore()
+    store.insert_many([{"ID": "A_1", "Species": "Goat"}, {"ID": "AB1", "Species": "Goat"},
+                       {"ID": "x%y", "Species": "Pig"}])
+    table = PagedTable(store)
+    assert table.count((Filter("ID", "contains", "A_"),)) == 1
+    assert table.count((Filter("ID", "contains", "%"),)) == 1
+    assert table.count((Filter("Species", "in", ()),)) == 0
+    store.insert({"ID": "nospecies"})
+    assert table.options("Species") == ["Goat", "Pig"]
+    with pytest.raises(KeyError):
+        table.count((Filter("ID; DROP TABLE records", "=", 1),))
+    with pytest.raises(ValueError):
+        table.count((Filter("ID", "like", "A"),))
+
+
+def _colours(styler, row):
+    ctx = styler._compute().ctx
+    return dict(ctx[(row, 1)])["background-color"]
+
+
+def test_gradient_scale_is_shared_across_pages():
+    table, herd = _table(200)
+    ranges = table.ranges(["ADG", "Weight"])
+    assert ranges["ADG"] == pytest.approx((herd["ADG"].min(), herd["ADG"].max()))
+    lowest, _ = table.page(TableQuery(columns=("ID", "ADG"), sort="ADG", per_page=5))
+    middle, _ = table.page(TableQuery(columns=("ID", "ADG"), sort="ADG", page=20, per_page=5))
+    # a page-local gradient would give the middle page's smallest ADG the herd minimum's shade
+    assert _colours(style_page(middle, ranges), 0) != _colours(style_page(lowest, ranges), 0)
+    assert _colours(middle.style.background_gradient(subset=["ADG"]), 0) == \
+        _colours(lowest.style.background_gradient(subset=["ADG"]), 0)
@@ -0,0 +1,30 @@
+import pandas as pd
+from vax_schedule import VaxSchedule, build_schedule, protocol_table
+
+METRICS = {
+    "Beef": {"vaccines": [("FMD", 0), ("LSD", 30), ("Anthrax", 180)]},
+    "Goat": {"vaccines": [("PPR", 0), ("CCPP", 60)]},
+}
+ANIMALS = pd.DataFrame({
+    "ID": ["B1", "G1", "B2"],
+    "Species": ["Beef", "Goat", "Beef"],
+    "Date": ["2025-01-01", "2025-01-10", "2025-03-01"],
+})
+
+
+def test_build_schedule_matches_per_record_loop():
+    sched = build_schedule(ANIMALS, protocol_table(METRICS))
+    assert len(sched) == 3 + 2 + 3
+    assert sched["Date Due"].is_monotonic_increasing
+    row = sched[(sched["Animal ID"] == "G1") & (sched["Vaccine"] == "CCPP")].iloc[0]
+    assert row["Date Due"] == pd.Timestamp("2025-03-11")
+
+
+def test_window_queries():
+    vs = VaxSchedule.from_animals(ANIMALS, METRICS)
+    due = vs.due_within(30, today="2025-02-15")
+    assert set(zip(due["Animal ID"], due["Vaccine"])) == {("B2", "FMD"), ("G1", "CCPP")}
+    late = vs.overdue(today="2025-02-15", lookback_days=20)
+    assert list(late["Vaccine"]) == ["LSD"]
+    assert len(vs.overdue(today="2025-02-15")) == 3
+    assert vs.between("2030-01-01", "2031-01-01").empty
@@ -0,0 +1,130 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from weather import WeatherClient
+
+
+class StubWeather(ThreadingHTTPServer):
+    """OpenWeatherMap stand-in that counts requests per city and adds latency."""
+    daemon_threads = True
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.fail = False
+        self.requests = {}
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), _Handler)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/weather"
+
+    @property
+    def total(self):
+        with self.lock:
+            return sum(self.requests.values())
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        city = parse_qs(urlparse(self.path).query)["q"][0]
+        with self.server.lock:
+            self.server.requests[city] = self.server.requests.get(city, 0) + 1
+            n = self.server.requests[city]
+        time.sleep(self.server.latency)
+        if self.server.fail:
+            self.send_response(503)
+            self.end_headers()
+            return
+        body = json.dumps({"name": city, "main": {"temp": 20.0 + n, "humidity": 60},
+                           "weather": [{"description": "clear sky"}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = StubWeather()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_ttl_cache_and_stale_while_revalidate(stub):
+    clock = FakeClock()
+    client = WeatherClient("key", base_url=stub.url, ttl=60, stale_ttl=600, clock=clock)
+    first = client.get("Nakuru")
+    assert client.get(" nakuru ") is first
+    assert stub.total == 1
+
+    clock.now = 120                      # stale: served at once, refreshed behind
+    assert client.get("Nakuru") is first
+    _wait_for(lambda: client.get("Nakuru")["main"]["temp"] == 22.0)
+    assert stub.total == 2
+    assert client.stats()["stale_hits"] >= 1
+    client.close()
+
+
+def test_failures_fall_back_to_last_reading(stub):
+    clock = FakeClock()
+    client = WeatherClient("key", base_url=stub.url, ttl=60, stale_ttl=120, clock=clock)
+    good = client.get("Eldoret")
+    stub.fail = True
+    clock.now = 1000                     # past stale_ttl: refetch is synchronous and fails
+    assert client.get("Eldoret") == good
+    assert client.get("Kisumu") is None
+    assert client.stats()["errors"] == 2
+    before = stub.total
+    assert client.get("Kisumu") is None and client.get("Eldoret") == good     # failures are remembered
+    assert stub.total == before
+    stub.fail = False
+    clock.now += client.error_ttl
+    assert client.get("Kisumu", api_key="other")["name"] == "Kisumu"
+    assert client.get("Kisumu")["name"] == "Kisumu"
+    assert stub.total == before + 2                 # the cache is per API key
+    client.close()
+
+
+def test_get_many_fetches_concurrently_over_one_pool(stub):
+    stub.latency = 0.2
+    cities = [f"Farm-{i}" for i in range(16)]
+    client = WeatherClient("key", base_url=stub.url, max_workers=8)
+    start = time.perf_counter()
+    result = client.get_many(cities + cities[:4])
+    elapsed = time.perf_counter() - start
+    assert list(result) == cities
+    assert all(r["name"] == c for c, r in result.items())
+    assert stub.total == 16
+    assert elapsed < 16 * 0.2 / 2        # sequential would be 3.2s; 8 workers take ~0.4s
+
+    client.get_many(cities)
+    assert stub.total == 16
+    client.close()
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from withdrawal import WithdrawalRegistry, withdrawal_table
+
+PHARMA = {
+    "Antibiotics": {"Oxytetracycline 20%": {"milk": 7, "meat": 28}, "Ceftiofur": {"milk": 0, "meat": 3}},
+    "Anthelmintics": {"Ivermectin": {"milk": 28, "meat": 28}},
+}
+
+
+def _registry():
+    log = pd.DataFrame({
+        "Animal ID": ["C1", "C2", "C1", "C3"],
+        "Drug": ["Oxytetracycline 20%", "Ceftiofur", "Ivermectin", "Oxytetracycline 20%"],
+        "Date": ["2026-03-01", "2026-03-05", "2026-02-20", "2026-01-01"],
+    })
+    return WithdrawalRegistry.from_log(log, PHARMA)
+
+
+def test_unsafe_on_date_uses_half_open_withdrawal():
+    reg = _registry()
+    assert withdrawal_table(PHARMA).loc["Ivermectin", "milk"] == 28
+    milk = reg.unsafe_animals("2026-03-07", "milk")
+    assert list(milk["Animal ID"]) == ["C1"]
+    assert milk.loc[0, "Safe From"] == pd.Timestamp("2026-03-20")       # Ivermectin outlasts OTC
+    assert reg.unsafe_animals("2026-03-20", "milk").empty
+    assert list(reg.unsafe_animals("2026-03-06", "meat")["Animal ID"]) == ["C1", "C2"]
+    assert list(reg.active_on("2026-01-28", "meat")["Animal ID"]) == ["C3"]
+    with pytest.raises(ValueError):
+        reg.active_on("2026-03-07", "eggs")
+
+
+def test_manifest_screening_flags_loads():
+    reg = _registry()
+    manifest = pd.DataFrame({
+        "Load": ["T1", "T1", "T2", "T2", "T3"],
+        "Animal ID": ["C1", "C4", "C2", "C3", "C1"],
+        "Date": ["2026-03-07", "2026-03-07", "2026-03-07", "2026-03-07", "2026-03-21"],
+    })
+    screened = reg.screen_manifest(manifest)
+    assert list(screened["Withdrawn"]) == [True, False, False, False, False]
+    loads = WithdrawalRegistry.contaminated_loads(screened)
+    assert list(loads["Load"]) == ["T1"]
+    assert loads.loc[0, "Clear From"] == pd.Timestamp("2026-03-20")
+
+
+def test_batch_screen_matches_brute_force():
+    rng = np.random.default_rng(3)
+    drugs = list(withdrawal_table(PHARMA).index)
+    log = pd.DataFrame({
+        "Animal ID": [f"A{i}" for i in rng.integers(0, 300, 5000)],
+        "Drug": rng.choice(drugs, 5000),
+        "Date": pd.Timestamp("2026-01-01") + pd.to_timedelta(rng.integers(0, 200, 5000), unit="D"),
+    })
+    reg = WithdrawalRegistry.from_log(log, PHARMA)
+    animals = [f"A{i}" for i in rng.integers(0, 320, 2000)]
+    dates = pd.Timestamp("2026-01-01") + pd.to_timedelta(rng.integers(-10, 230, 2000), unit="D")
+    got = reg.screen(animals, dates, "meat")
+
+    meat = withdrawal_table(PHARMA)["meat"]
+    ends = log["Date"] + pd.to_timedelta(log["Drug"].map(meat), unit="D")
+    for animal, day, flag in zip(animals, dates, got["Withdrawn"]):
+        mine = log["Animal ID"] == animal
+        assert flag == bool(((log["Date"] <= day) & (ends > day) & mine).any())
@@ -0,0 +1,77 @@
+"""
+vax_schedule.py
+Vectorized vaccination schedules with a date-sorted index for Vax Sentinel.
+
+The schedule is a species × protocol join with timedelta arithmetic; the
+result is kept sorted by due date so "due in the next N days" and "overdue"
+are binary-search range queries instead of scans over every dose.
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+def protocol_table(species_metrics: dict) -> pd.DataFrame:
+    """Flatten SPECIES_METRICS[...]['vaccines'] into rows of (Species, Vaccine, Offset days)."""
+    rows = [(sp, name, days) for sp, m in species_metrics.items() for name, days in m.get("vaccines", [])]
+    return pd.DataFrame(rows, columns=["Species", "Vaccine", "Offset"])
+
+
+def build_schedule(animals: pd.DataFrame,
+                   protocols: pd.DataFrame,
+                   id_col: str = "ID",
+                   species_col: str = "Species",
+                   date_col: str = "Date",
+                   date_format: Optional[str] = "%Y-%m-%d") -> pd.DataFrame:
+    """
+    One row per (animal, vaccine) with columns ['Animal ID', 'Vaccine',
+    'Date Due', 'Species'], sorted by 'Date Due' (datetime64).
+    """
+    base = pd.DataFrame({
+        "Animal ID": animals[id_col].to_numpy(),
+        "Species": animals[species_col].to_numpy(),
+        "Start": pd.to_datetime(animals[date_col], format=date_format).to_numpy(),
+    })
+    doses = base.merge(protocols, on="Species", how="inner")
+    doses["Date Due"] = doses["Start"] + pd.to_timedelta(doses["Offset"], unit="D")
+    doses = doses[["Animal ID", "Vaccine", "Date Due", "Species"]]
+    return doses.sort_values("Date Due", kind="stable", ignore_index=True)
+
+
+class VaxSchedule:
+    """Date-sorted dose table answering window queries in O(log n + k)."""
+
+    def __init__(self, schedule: pd.DataFrame):
+        self.frame = schedule.sort_values("Date Due", kind="stable", ignore_index=True)
+        self._due = self.frame["Date Due"].to_numpy(dtype="datetime64[ns]")
+
+    @classmethod
+    def from_animals(cls, animals: pd.DataFrame, species_metrics: dict, **kwargs) -> "VaxSchedule":
+        return cls(build_schedule(animals, protocol_table(species_metrics), **kwargs))
+
+    def __len__(self):
+        return len(self.frame)
+
+    def _pos(self, when) -> int:
+        return int(np.searchsorted(self._due, pd.Timestamp(when).as_unit("ns").to_datetime64()))
+
+    def between(self, start, end) -> pd.DataFrame:
+        """Doses due in [start, end); start=None means from the first dose."""
+        lo = 0 if start is None else self._pos(start)
+        return self.frame.iloc[lo:self._pos(end)]
+
+    def due_within(self, days: int, today=None) -> pd.DataFrame:
+        """Doses due from today through the next `days` days."""
+        today = _day(today)
+        return self.between(today, today + pd.Timedelta(days=days + 1))
+
+    def overdue(self, today=None, lookback_days: Optional[int] = None) -> pd.DataFrame:
+        """Doses due before today (optionally only the last lookback_days days)."""
+        today = _day(today)
+        start = today - pd.Timedelta(days=lookback_days) if lookback_days is not None else None
+        return self.between(start, today)
+
+
+def _day(value) -> pd.Timestamp:
+    return (pd.Timestamp.today() if value is None else pd.Timestamp(value)).normalize()
@@ -0,0 +1,156 @@
+"""
+weather.py
+Cached OpenWeatherMap client for the Climate Sentinel.
+
+Responses are kept per city for `ttl` seconds. After that, and until
+`stale_ttl`, the cached reading is still returned at once while a background
+thread refreshes it (stale-while-revalidate), so a Streamlit rerun never
+waits on the API for a city it has seen recently. Failed lookups (a bad
+city or API key) are remembered for `error_ttl` seconds so reruns do not
+block on the timeout again. The API key can be passed per call, so one
+client (one thread pool, one pooled requests.Session) serves every key, and
+get_many() fetches many farm locations concurrently.
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+OWM_URL = "http://api.openweathermap.org/data/2.5/weather"
+
+
+def _key(city: str, api_key: Optional[str]) -> tuple:
+    return api_key, " ".join(city.split()).lower()
+
+
+class WeatherClient:
+    """
+    Thread-safe weather lookups with a TTL cache keyed by (API key, city).
+
+    Concurrent misses for the same city share one request. A failed fetch
+    is not retried for error_ttl seconds: get() falls back to the last good
+    reading if there is one, otherwise returns None.
+    """
+
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 base_url: str = OWM_URL,
+                 ttl: float = 600.0,
+                 stale_ttl: float = 3600.0,
+                 error_ttl: float = 60.0,
+                 timeout: float = 5.0,
+                 max_workers: int = 8,
+                 clock: Callable[[], float] = time.monotonic):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.error_ttl = error_ttl
+        self.timeout = timeout
+        self._clock = clock
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="weather")
+        self._lock = threading.Lock()
+        self._cache: Dict[tuple, tuple] = {}        # key -> (fetched_at, payload)
+        self._failed: Dict[tuple, float] = {}       # key -> time of the last failed fetch
+        self._inflight: Dict[tuple, Future] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.error_hits = 0
+
+    def _fetch(self, city: str, api_key: Optional[str]) -> Optional[dict]:
+        try:
+            r = self._session.get(self.base_url, timeout=self.timeout,
+                                  params={"q": city, "appid": api_key, "units": "metric"})
+            payload = r.json() if r.status_code == 200 else None
+        except (requests.RequestException, ValueError):
+            payload = None
+        key = _key(city, api_key)
+        with self._lock:
+            self._inflight.pop(key, None)
+            if payload is None:
+                self.errors += 1
+                self._failed[key] = self._clock()
+            else:
+                self._cache[key] = (self._clock(), payload)
+                self._failed.pop(key, None)
+        return payload
+
+    def _start_fetch(self, city: str, api_key: Optional[str]) -> Future:
+        """In-flight request for city, starting one if needed. Caller holds the lock."""
+        key = _key(city, api_key)
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = self._pool.submit(self._fetch, city, api_key)
+        return future
+
+    def _lookup(self, city: str, api_key: Optional[str]):
+        """(cached payload or None, Future to wait on or None). Caller holds the lock."""
+        key = _key(city, api_key)
+        cached = self._cache.get(key)
+        now = self._clock()
+        age = now - cached[0] if cached else None
+        if cached and age < self.ttl:
+            self.hits += 1
+            return cached[1], None
+        failed_at = self._failed.get(key)
+        if failed_at is not None and now - failed_at < self.error_ttl:
+            # failed recently: answer from what we have instead of waiting on another timeout
+            self.error_hits += 1
+            return (cached[1] if cached else None), None
+        if cached and age < self.stale_ttl:
+            self.stale_hits += 1
+            self._start_fetch(city, api_key)
+            return cached[1], None
+        self.misses += 1
+        # past stale_ttl the old reading is only a fallback if the refetch fails
+        return (cached[1] if cached else None), self._start_fetch(city, api_key)
+
+    @staticmethod
+    def _resolve(fallback: Optional[dict], future: Optional[Future]) -> Optional[dict]:
+        if future is None:
+            return fallback
+        payload = future.result()
+        return fallback if payload is None else payload
+
+    def get(self, city: str, api_key: Optional[str] = None) -> Optional[dict]:
+        """Current weather payload for city (OpenWeatherMap JSON) or None; api_key defaults to the client's."""
+        with self._lock:
+            pending = self._lookup(city, api_key or self.api_key)
+        return self._resolve(*pending)
+
+    def get_many(self, cities: Iterable[str], api_key: Optional[str] = None) -> Dict[str, Optional[dict]]:
+        """get() for every city, with all misses in flight at once."""
+        cities = list(dict.fromkeys(cities))
+        api_key = api_key or self.api_key
+        with self._lock:
+            pending = {city: self._lookup(city, api_key) for city in cities}
+        return {city: self._resolve(*p) for city, p in pending.items()}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "error_hits": self.error_hits,
+                "cached_cities": len(self._cache),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._failed.clear()
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+        self._session.close()
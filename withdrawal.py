@@ -0,0 +1,185 @@
+"""
+withdrawal.py
+Herd-wide drug withdrawal registry for the Pharmacovigilance Hub.
+
+Every treatment (animal, drug, date) holds milk and meat out of the food
+chain for the drug's PHARMA_DB withdrawal days. Treatments are kept sorted
+by date; since no withdrawal is longer than the longest one on record, the
+treatments still active on a day all started within that window, so
+"unsafe on day X" is two binary searches plus a scan of the k candidates.
+Manifest screening does the same per (animal, day) pair against an
+(animal, date) sorted copy, for the whole manifest in one vectorized call.
+"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+PRODUCTS = ("milk", "meat")
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def withdrawal_table(pharma_db: Dict[str, Dict[str, dict]]) -> pd.DataFrame:
+    """Flatten PHARMA_DB into a frame indexed by drug with 'group', 'milk', 'meat' days."""
+    rows = {drug: {"group": group, "milk": info["milk"], "meat": info["meat"]}
+            for group, drugs in pharma_db.items() for drug, info in drugs.items()}
+    table = pd.DataFrame.from_dict(rows, orient="index")
+    table.index.name = "drug"
+    return table
+
+
+def to_days(dates) -> np.ndarray:
+    """Whole days since the Unix epoch for date-like values."""
+    values = pd.to_datetime(pd.Series(dates)).to_numpy(dtype="datetime64[D]")
+    return (values - _EPOCH).astype(np.int64)
+
+
+def _from_days(days) -> pd.Series:
+    return pd.Series(_EPOCH + np.asarray(days, dtype="timedelta64[D]"))
+
+
+def _check_product(product: str) -> None:
+    if product not in PRODUCTS:
+        raise ValueError(f"product must be one of {PRODUCTS}, not {product!r}")
+
+
+class WithdrawalRegistry:
+    """
+    Treatment log with interval queries over withdrawal periods.
+
+    treatments has columns ['Animal ID', 'Drug', 'Date', 'Milk Days',
+    'Meat Days']; the withdrawal days are those in force when the treatment
+    was recorded, so later edits to PHARMA_DB do not rewrite history. A
+    product is unsafe from the treatment date up to, not including, the
+    safe date (date + withdrawal days).
+    """
+
+    COLUMNS = ["Animal ID", "Drug", "Date", "Milk Days", "Meat Days"]
+
+    def __init__(self, treatments: pd.DataFrame):
+        day = to_days(treatments["Date"]) if len(treatments) else np.empty(0, dtype=np.int64)
+        frame = pd.DataFrame({
+            "Animal ID": treatments["Animal ID"].astype(str).to_numpy(),
+            "Drug": treatments["Drug"].to_numpy(),
+            "Date": _from_days(day).to_numpy(),
+            "Milk Days": pd.to_numeric(treatments["Milk Days"]).fillna(0).astype(np.int64).to_numpy(),
+            "Meat Days": pd.to_numeric(treatments["Meat Days"]).fillna(0).astype(np.int64).to_numpy(),
+        })
+        order = np.argsort(day, kind="stable")
+        self.frame = frame.iloc[order].reset_index(drop=True)
+        self._start = day[order]
+        self._end = {p: self._start + self.frame[f"{p.title()} Days"].to_numpy() for p in PRODUCTS}
+        self._window = {p: int((self._end[p] - self._start).max()) if len(day) else 0 for p in PRODUCTS}
+
+        # (animal, date) order for manifest screening, flattened into one sorted
+        # int64 key so a batch of (animal, day) lookups is a single searchsorted
+        self._animals, codes = np.unique(self.frame["Animal ID"].to_numpy(dtype=str), return_inverse=True)
+        self._day0 = int(day.min()) if len(day) else 0
+        self._span = (int(day.max()) - self._day0 + 2) if len(day) else 2
+        by_animal = np.lexsort((self._start, codes))
+        self._a_key = codes[by_animal] * self._span + (self._start[by_animal] - self._day0)
+        self._a_end = {p: self._end[p][by_animal] for p in PRODUCTS}
+
+    @classmethod
+    def from_log(cls, log: pd.DataFrame, pharma_db: Dict[str, Dict[str, dict]]) -> "WithdrawalRegistry":
+        """Build from (Animal ID, Drug, Date) rows, taking withdrawal days from pharma_db."""
+        table = withdrawal_table(pharma_db)
+        unknown = sorted(set(log["Drug"]) - set(table.index))
+        if unknown:
+            raise KeyError(f"drugs not in the withdrawal table: {unknown}")
+        days = table.loc[log["Drug"]]
+        return cls(pd.DataFrame({
+            "Animal ID": log["Animal ID"].to_numpy(), "Drug": log["Drug"].to_numpy(), "Date": log["Date"].to_numpy(),
+            "Milk Days": days["milk"].to_numpy(), "Meat Days": days["meat"].to_numpy(),
+        }))
+
+    def __len__(self):
+        return len(self.frame)
+
+    def active_on(self, when, product: str = "milk") -> pd.DataFrame:
+        """
+        Treatments whose product withdrawal covers the day `when`, with a
+        'Safe From' date column.
+        """
+        _check_product(product)
+        day = int(to_days([when])[0])
+        lo = np.searchsorted(self._start, day - self._window[product], side="right")
+        hi = np.searchsorted(self._start, day, side="right")
+        rows = lo + np.flatnonzero(self._end[product][lo:hi] > day)
+        out = self.frame.iloc[rows].copy()
+        out["Safe From"] = _from_days(self._end[product][rows]).to_numpy()
+        return out
+
+    def unsafe_animals(self, when, product: str = "milk") -> pd.DataFrame:
+        """
+        One row per animal under withdrawal on `when`: the latest 'Safe From'
+        across its active treatments and the drugs responsible.
+        """
+        active = self.active_on(when, product)
+        return (active.groupby("Animal ID", sort=True)
+                .agg(**{"Safe From": ("Safe From", "max"), "Drugs": ("Drug", lambda d: ", ".join(sorted(set(d))))})
+                .reset_index())
+
+    def screen(self, animals, dates, product: str = "milk") -> pd.DataFrame:
+        """
+        Withdrawal status for many (animal, date) pairs in one call. Returns
+        'Withdrawn' (bool) and 'Safe From' (NaT when clear) aligned with the input.
+        """
+        _check_product(product)
+        animals = np.asarray(pd.Series(animals).astype(str))
+        day = to_days(dates) if np.ndim(dates) else np.full(len(animals), to_days([dates])[0])
+        code = np.searchsorted(self._animals, animals)
+        known = code < len(self._animals)
+        known[known] = self._animals[code[known]] == animals[known]
+        safe = np.full(len(animals), np.iinfo(np.int64).min)
+        if known.any():
+            c, d = code[known], day[known]
+
+            def key(x):
+                # offsets are clipped one step outside the animal's run so keys never cross animals
+                return c * self._span + np.clip(x - self._day0, -1, self._span - 1)
+
+            # only treatments started in (d - window, d] can still be active on d
+            lo = np.searchsorted(self._a_key, key(d - self._window[product]), side="right")
+            hi = np.searchsorted(self._a_key, key(d), side="right")
+            counts = hi - lo
+            has = counts > 0
+            if has.any():
+                starts = np.cumsum(counts[has]) - counts[has]
+                idx = np.repeat(lo[has] - starts, counts[has]) + np.arange(counts[has].sum())
+                best = np.full(len(c), np.iinfo(np.int64).min)
+                best[has] = np.maximum.reduceat(self._a_end[product][idx], starts)
+                safe[known] = best
+        withdrawn = safe > day
+        safe_from = pd.Series(pd.NaT, index=range(len(animals)), dtype="datetime64[s]")
+        safe_from[withdrawn] = _from_days(safe[withdrawn]).to_numpy()
+        return pd.DataFrame({"Withdrawn": withdrawn, "Safe From": safe_from.to_numpy()})
+
+    def screen_manifest(self,
+                        manifest: pd.DataFrame,
+                        product: str = "milk",
+                        animal_col: str = "Animal ID",
+                        date_col: Optional[str] = "Date",
+                        when=None) -> pd.DataFrame:
+        """
+        Flag every manifest row (one animal's contribution to a load) whose
+        animal is under withdrawal on its collection date, or on `when` if
+        the manifest has no date column. Returns the manifest with
+        'Withdrawn' and 'Safe From' columns added.
+        """
+        dates = manifest[date_col] if date_col and date_col in manifest else (when or pd.Timestamp.today())
+        flags = self.screen(manifest[animal_col], dates, product)
+        out = manifest.reset_index(drop=True).copy()
+        out["Withdrawn"] = flags["Withdrawn"].to_numpy()
+        out["Safe From"] = flags["Safe From"].to_numpy()
+        return out
+
+    @staticmethod
+    def contaminated_loads(screened: pd.DataFrame, load_col: str = "Load", animal_col: str = "Animal ID") -> pd.DataFrame:
+        """Per-load summary of a screen_manifest() result, loads with withdrawn animals only."""
+        bad = screened[screened["Withdrawn"]]
+        return (bad.groupby(load_col, sort=True)
+                .agg(**{"Withdrawn Animals": (animal_col, "nunique"),
+                        "Animal IDs": (animal_col, lambda a: ", ".join(sorted(set(map(str, a))))),
+                        "Clear From": ("Safe From", "max")})
+                .reset_index())